@@ -1,4 +1,4 @@
-from flask import Flask, render_template, request, jsonify, send_file, flash, redirect, url_for
+from flask import Flask, render_template, request, jsonify, send_file, flash, redirect, url_for, Response
 from flask_cors import CORS
 import os
 import json
@@ -6,9 +6,25 @@ import tempfile
 import zipfile
 from datetime import datetime
 from werkzeug.utils import secure_filename
-from resume_parser import ResumeParser
+from resume_parser import ResumeParser, preload_models, get_model_status, resolve_fields, parsed_fields, PARSE_MODE_FULL, PARSE_MODE_QUICK
 from excel_export import ExcelExporter
-import pandas as pd
+import result_serializer
+import metrics
+from profiling import ParseProfiler
+from parse_worker import ParseLimits, ParseLimitExceeded
+from results_log import ResultsLog
+from ingest import iter_archive_documents
+from skills_taxonomy import get_skill_matcher, reload_skill_matcher
+from skill_index import SkillIndex
+from search_index import SearchIndex, QuerySyntaxError
+from candidate_frame import CandidateFrame
+from candidate_record import CandidateBatch, CandidateRecord, SkillVocabulary
+from chat_query import answer_question
+from pdf_backends import get_backend_report
+import http_cache
+from workspaces import BatchWorkspaces, BatchNotFound, BatchBusy
+from mailer import Mailer, SmtpSettings, BroadcastJob, TemplateError, MAIL_TEMPLATES, compile_template, build_recipients
+import threading
 
 app = Flask(__name__)  # Fixed: __name_ instead of name
 CORS(app, resources={r"/*": {"origins": ["http://localhost:5173"]}})
@@ -18,18 +34,241 @@ app.secret_key = 'your-secret-key-here'
 UPLOAD_FOLDER = 'uploads'
 RESULTS_FOLDER = 'results'
 ALLOWED_EXTENSIONS = {'pdf', 'docx', 'txt'}
+ARCHIVE_EXTENSIONS = {'zip'}  # expanded into their PDF/DOCX/TXT members on upload
 MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB
+RESULTS_FORMAT = os.environ.get('RESULTS_FORMAT', 'json')  # 'json' or 'ndjson'
+RESULTS_COMPRESS = os.environ.get('RESULTS_COMPRESS', '0') == '1'
+RESULTS_LOG_FOLDER = os.path.join(RESULTS_FOLDER, 'log')
+# Full per-request JSON snapshots are opt-in; the results log is the source of truth
+RESULTS_SNAPSHOTS = os.environ.get('RESULTS_SNAPSHOTS', '0') == '1'
+RESULTS_RETENTION_DAYS = float(os.environ['RESULTS_RETENTION_DAYS']) if os.environ.get('RESULTS_RETENTION_DAYS') else None
+RESULTS_MAX_RECORDS = int(os.environ['RESULTS_MAX_RECORDS']) if os.environ.get('RESULTS_MAX_RECORDS') else None
+COMPACTION_INTERVAL = 300  # seconds
+DIAGNOSTICS_FOLDER = 'diagnostics'
+PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', '0'))  # 0 disables profiling
+PROFILE_MAX_DUMPS = int(os.environ.get('PROFILE_MAX_DUMPS', '50'))
+# Per-file parsing limits; a file over a limit is stopped and reported, the batch continues
+PARSE_TIMEOUT_SECONDS = float(os.environ.get('PARSE_TIMEOUT_SECONDS', '60'))
+PARSE_MEMORY_LIMIT_MB = int(os.environ.get('PARSE_MEMORY_LIMIT_MB', '1024'))
+PARSE_MAX_FILE_MB = float(os.environ.get('PARSE_MAX_FILE_MB', '0'))  # 0 disables the check
+# Load spaCy/NLTK in the background at boot so /health answers immediately
+PRELOAD_MODELS = os.environ.get('PRELOAD_MODELS', '1') == '1'
+# Per-batch upload workspaces; batches idle longer than the TTL are removed
+BATCHES_FOLDER = 'batches'
+BATCH_TTL_HOURS = float(os.environ.get('BATCH_TTL_HOURS', '24'))
+# Text responses at least this large are gzip/deflate compressed when the client accepts it
+COMPRESS_MIN_BYTES = int(os.environ.get('COMPRESS_MIN_BYTES', '1024'))
+COMPRESS_LEVEL = int(os.environ.get('COMPRESS_LEVEL', '6'))
+# Broadcast job status files, readable by every server worker
+MAIL_JOBS_FOLDER = os.path.join(RESULTS_FOLDER, 'mail_jobs')
 
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['RESULTS_FOLDER'] = RESULTS_FOLDER
 app.config['MAX_CONTENT_LENGTH'] = MAX_CONTENT_LENGTH
+app.config['RESULTS_FORMAT'] = RESULTS_FORMAT
+app.config['RESULTS_COMPRESS'] = RESULTS_COMPRESS
+app.config['RESULTS_SNAPSHOTS'] = RESULTS_SNAPSHOTS
+app.config['DIAGNOSTICS_FOLDER'] = DIAGNOSTICS_FOLDER
+app.config['PROFILE_SAMPLE_RATE'] = PROFILE_SAMPLE_RATE
+app.config['PROFILE_MAX_DUMPS'] = PROFILE_MAX_DUMPS
+app.config['PARSE_TIMEOUT_SECONDS'] = PARSE_TIMEOUT_SECONDS
+app.config['PARSE_MEMORY_LIMIT_MB'] = PARSE_MEMORY_LIMIT_MB
+app.config['PARSE_MAX_FILE_MB'] = PARSE_MAX_FILE_MB
+app.config['COMPRESS_MIN_BYTES'] = COMPRESS_MIN_BYTES
+app.config['COMPRESS_LEVEL'] = COMPRESS_LEVEL
 
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 os.makedirs(RESULTS_FOLDER, exist_ok=True)
 
+# Each upload session gets its own batch, so concurrent users never process or clear each other's files
+workspaces = BatchWorkspaces(BATCHES_FOLDER, ttl_hours=BATCH_TTL_HOURS)
+
+results_log = ResultsLog(
+    RESULTS_LOG_FOLDER,
+    retention_days=RESULTS_RETENTION_DAYS,
+    max_records=RESULTS_MAX_RECORDS
+)
+results_log.start_compactor(COMPACTION_INTERVAL)
+
+# Skill frequency/co-occurrence, the query index and the columnar frame for chat
+# aggregates over the talent pool, kept current as resumes are processed
+skill_index = SkillIndex()
+search_index = SearchIndex()
+candidate_frame = CandidateFrame()
+
+# Pooled SMTP delivery for broadcasts (SMTP_* and MAIL_* environment settings)
+mailer = Mailer(SmtpSettings.from_env(), MAIL_JOBS_FOLDER)
+
+# Stored resumes are indexed as compact records whose skills are ids into one shared vocabulary
+candidate_vocab = SkillVocabulary.from_keywords(get_skill_matcher().categories)
+
+def rebuild_indexes():
+    records = CandidateBatch.from_dicts(results_log.iter_records(), candidate_vocab)
+    skill_index.rebuild(records)
+    search_index.rebuild(records)
+    candidate_frame.rebuild(records)
+
+rebuild_indexes()
+
+if PRELOAD_MODELS:
+    threading.Thread(target=preload_models, name='model-preload', daemon=True).start()
+
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+def get_request_option(name, default=None):
+    """Read an option from form data, query string or JSON body"""
+    value = request.values.get(name)
+    if value is None:
+        body = request.get_json(silent=True)
+        if isinstance(body, dict):
+            value = body.get(name)
+    return default if value is None else value
+
+def get_request_list(name):
+    """Read a list option given as repeated form fields, a comma-separated string or a JSON list"""
+    values = request.values.getlist(name)
+    if not values:
+        values = get_request_option(name, [])
+    if isinstance(values, str):
+        values = [values]
+    items = []
+    for value in values:
+        items.extend(part.strip() for part in str(value).split(',') if part.strip())
+    return items
+
+def get_batch():
+    """The batch named by batch_id, or None for the shared uploads folder"""
+    batch_id = get_request_option('batch_id')
+    return workspaces.get(str(batch_id)) if batch_id else None
+
+def batch_not_found(e):
+    return jsonify({'success': False, 'message': str(e.args[0])}), 404
+
+def is_truthy(value):
+    return str(value).lower() in ('1', 'true', 'yes', 'on')
+
+def create_parse_limits():
+    return ParseLimits(
+        app.config['PARSE_TIMEOUT_SECONDS'],
+        app.config['PARSE_MEMORY_LIMIT_MB'],
+        app.config['PARSE_MAX_FILE_MB']
+    )
+
+def create_profiler(force=False):
+    """Build the sampling profiler for a request, or None when profiling is off"""
+    sample_rate = 1.0 if force else app.config['PROFILE_SAMPLE_RATE']
+    if sample_rate <= 0:
+        return None
+    return ParseProfiler(app.config['DIAGNOSTICS_FOLDER'], sample_rate, app.config['PROFILE_MAX_DUMPS'])
+
+def create_parser():
+    return ResumeParser(
+        profiler=create_profiler(is_truthy(get_request_option('profile', False))),
+        limits=create_parse_limits(),
+        keep_text=True
+    )
+
+def sync_indexes():
+    """Fold in resumes other server workers appended to the shared results log"""
+    new_keys = results_log.refresh()
+    if new_keys is None:
+        # Another process cleared or compacted the log
+        rebuild_indexes()
+        return
+    for key in new_keys:
+        record = results_log.get(key)
+        if record is not None:
+            record = CandidateRecord.from_dict(record, candidate_vocab)
+            skill_index.add(key, record.get('skills'))
+            search_index.add(key, record)
+            candidate_frame.add(key, record)
+
+def public_record(record):
+    """A stored record without the extracted text kept for full-text search"""
+    return {field: value for field, value in record.items() if field != 'text'}
+
+def merge_record(record, parse_mode, fields):
+    """The record to store for a parse; partial and quick parses only fill in what they extracted"""
+    if parse_mode == PARSE_MODE_FULL and resolve_fields(parse_mode, fields) == resolve_fields():
+        return record
+    previous = results_log.get(record['file_hash'])
+    if previous is None:
+        return record
+    # Regex-only guesses never replace what the full tier found
+    keep_previous = parse_mode == PARSE_MODE_QUICK and previous.get('parse_mode') == PARSE_MODE_FULL
+    merged = dict(previous)
+    for field, value in record.items():
+        if value is None or (keep_previous and previous.get(field) is not None and field in parsed_fields()):
+            continue
+        merged[field] = value
+    merged['parse_mode'] = previous.get('parse_mode', parse_mode)
+    return merged
+
+def is_archive(filename):
+    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ARCHIVE_EXTENSIONS
+
+def parse_into(parser, source, filename, parse_mode, fields, parsed_resumes, processing_results):
+    """Parse one path, buffer or Document and record the outcome for the response"""
+    try:
+        print(f"Processing: {filename}")  # Debug log
+        # Certifications, languages and urls are stored too, so their query fields can match
+        parsed_data = parser.parse_resume(source, parse_mode, fields, name=filename, additional_info=True)
+        
+        if parsed_data:
+            # Ensure file_name is included in the parsed data
+            parsed_data['file_name'] = filename
+            # The extracted text is stored for full-text search but not sent back
+            text = parsed_data.pop('text', None)
+            # A fields=email pass must not wipe the skills an earlier full parse stored
+            record = CandidateRecord.from_dict(merge_record(dict(parsed_data, text=text), parse_mode, fields),
+                                              candidate_vocab)
+            results_log.append(parsed_data['file_hash'], record.to_dict())
+            skill_index.add(parsed_data['file_hash'], record.get('skills'))
+            search_index.add(parsed_data['file_hash'], record)
+            candidate_frame.add(parsed_data['file_hash'], record)
+            parsed_resumes.append(parsed_data)
+            processing_results.append({
+                'filename': filename,
+                'status': 'success',
+                'message': 'Processed successfully'
+            })
+            print(f"Successfully processed: {filename}")  # Debug log
+        else:
+            processing_results.append({
+                'filename': filename,
+                'status': 'error',
+                'message': 'Failed to extract data'
+            })
+            print(f"Failed to process: {filename}")  # Debug log
+            
+    except ParseLimitExceeded as e:
+        processing_results.append({
+            'filename': filename,
+            'status': e.status,
+            'message': str(e)
+        })
+        print(f"{e.status.title()} processing {filename}: {str(e)}")  # Debug log
+    except Exception as e:
+        processing_results.append({
+            'filename': filename,
+            'status': 'error',
+            'message': str(e)
+        })
+        print(f"Error processing {filename}: {str(e)}")  # Debug log
+
+def summarize_parsed(parsed_resumes):
+    return {
+        'total_processed': len(parsed_resumes),
+        'with_name': sum(1 for r in parsed_resumes if r.get('name')),
+        'with_email': sum(1 for r in parsed_resumes if r.get('email')),
+        'with_phone': sum(1 for r in parsed_resumes if r.get('phone_number')),
+        'with_skills': sum(1 for r in parsed_resumes if r.get('skills')),
+        'with_education': sum(1 for r in parsed_resumes if r.get('education')),
+        'with_location': sum(1 for r in parsed_resumes if r.get('location')),
+        'with_experience': sum(1 for r in parsed_resumes if r.get('total_experience'))
+    }
+
 @app.route('/')
 def index():
     return render_template('index.html')
@@ -42,29 +281,49 @@ def upload_files():
         if 'files' not in request.files:
             return jsonify({'success': False, 'message': 'No files selected'})
         
-        files = request.files.getlist('files')
-        uploaded_files = []
-        
+        files = [file for file in request.files.getlist('files') if file and file.filename != '']
         for file in files:
-            if file.filename == '':
-                continue
-            if file and allowed_file(file.filename):
-                filename = secure_filename(file.filename)
-                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_')
-                filename = timestamp + filename
-                filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-                file.save(filepath)
-                uploaded_files.append({
-                    'original_name': file.filename,
-                    'saved_name': filename,
-                    'filepath': filepath
-                })
-            else:
+            if not (allowed_file(file.filename) or is_archive(file.filename)):
                 return jsonify({
                     'success': False, 
-                    'message': f'Invalid file type: {file.filename}. Only PDF, DOCX, and TXT files are allowed.'
+                    'message': f'Invalid file type: {file.filename}. Only PDF, DOCX, TXT and ZIP files are allowed.'
                 })
         
+        # parse=1 parses straight from the request buffers, nothing is written to uploads/
+        if is_truthy(get_request_option('parse', False)):
+            return parse_uploads(files)
+        
+        # Files join the given batch, or start a new one whose id scopes /process, export and /clear
+        try:
+            batch = get_batch() or workspaces.create()
+        except BatchNotFound as e:
+            return batch_not_found(e)
+        uploaded_files = []
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_')
+        for file in files:
+            if is_archive(file.filename):
+                # Save each supported member so /process can pick them up
+                for document in iter_archive_documents(file.stream, file.filename):
+                    filename = timestamp + secure_filename(document.name)
+                    filepath = os.path.join(batch.uploads_dir, filename)
+                    with open(filepath, 'wb') as f:
+                        f.write(document.data)
+                    uploaded_files.append({
+                        'original_name': f'{file.filename}/{document.name}',
+                        'saved_name': filename,
+                        'filepath': filepath
+                    })
+                continue
+            
+            filename = timestamp + secure_filename(file.filename)
+            filepath = os.path.join(batch.uploads_dir, filename)
+            file.save(filepath)
+            uploaded_files.append({
+                'original_name': file.filename,
+                'saved_name': filename,
+                'filepath': filepath
+            })
+        
         if not uploaded_files:
             return jsonify({'success': False, 'message': 'No valid files uploaded'})
         
@@ -73,6 +332,7 @@ def upload_files():
         return jsonify({
             'success': True, 
             'message': f'{len(uploaded_files)} files uploaded successfully',
+            'batch_id': batch.id,
             'files': uploaded_files
         })
         
@@ -80,119 +340,168 @@ def upload_files():
         print(f"Upload error: {str(e)}")  # Debug log
         return jsonify({'success': False, 'message': f'Upload error: {str(e)}'})
 
+def parse_uploads(files):
+    """Parse uploaded files and ZIP members in memory and return /process-style results"""
+    parse_mode = get_request_option('mode', PARSE_MODE_FULL)
+    fields = get_request_list('fields') or None
+    try:
+        resolve_fields(parse_mode, fields)
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)})
+    
+    parser = create_parser()
+    parsed_resumes = []
+    processing_results = []
+    for file in files:
+        if is_archive(file.filename):
+            for document in iter_archive_documents(file.stream, file.filename):
+                parse_into(parser, document, secure_filename(document.name), parse_mode, fields,
+                           parsed_resumes, processing_results)
+        else:
+            parse_into(parser, file.stream, secure_filename(file.filename), parse_mode, fields,
+                       parsed_resumes, processing_results)
+    
+    if not parsed_resumes:
+        return jsonify({
+            'success': False,
+            'message': 'No resumes were successfully processed',
+            'results': processing_results
+        })
+    
+    return jsonify({
+        'success': True,
+        'message': f'Successfully processed {len(parsed_resumes)} resumes',
+        'mode': parse_mode,
+        'fields': sorted(resolve_fields(parse_mode, fields)),
+        'data': parsed_resumes,
+        'stats': summarize_parsed(parsed_resumes),
+        'processing_results': processing_results,
+        'results_log': results_log.stats()
+    })
+
 @app.route('/process', methods=['POST'])
 def process_resumes():
     try:
         print("Process endpoint hit")  # Debug log
         
-        parser = ResumeParser()
-        upload_files = []
-        
-        # Get all uploaded files
-        for filename in os.listdir(app.config['UPLOAD_FOLDER']):
-            if allowed_file(filename):
-                filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-                upload_files.append(filepath)
-
-        if not upload_files:
-            return jsonify({'success': False, 'message': 'No files to process'})
-        
-        print(f"Processing {len(upload_files)} files")  # Debug log
-        
-        parsed_resumes = []
-        processing_results = []
-        
-        for filepath in upload_files:
-            filename = os.path.basename(filepath)
-            try:
-                print(f"Processing: {filename}")  # Debug log
-                parsed_data = parser.parse_resume(filepath)
-                
-                if parsed_data:
-                    # Ensure file_name is included in the parsed data
-                    parsed_data['file_name'] = filename
-                    parsed_resumes.append(parsed_data)
-                    processing_results.append({
-                        'filename': filename,
-                        'status': 'success',
-                        'message': 'Processed successfully'
-                    })
-                    print(f"Successfully processed: {filename}")  # Debug log
-                else:
-                    processing_results.append({
-                        'filename': filename,
-                        'status': 'error',
-                        'message': 'Failed to extract data'
-                    })
-                    print(f"Failed to process: {filename}")  # Debug log
-                    
-            except Exception as e:
-                processing_results.append({
-                    'filename': filename,
-                    'status': 'error',
-                    'message': str(e)
-                })
-                print(f"Error processing {filename}: {str(e)}")  # Debug log
-        
-        if not parsed_resumes:
-            return jsonify({
-                'success': False, 
-                'message': 'No resumes were successfully processed',
-                'results': processing_results
-            })
-        
-        # Save JSON file
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        json_filename = f'parsed_resumes_{timestamp}.json'
-        json_filepath = os.path.join(app.config['RESULTS_FOLDER'], json_filename)
-        
-        with open(json_filepath, 'w', encoding='utf-8') as f:
-            json.dump(parsed_resumes, f, indent=2, ensure_ascii=False)
-        
-        # Calculate statistics
-        stats = {
-            'total_processed': len(parsed_resumes),
-            'with_name': sum(1 for r in parsed_resumes if r.get('name')),
-            'with_email': sum(1 for r in parsed_resumes if r.get('email')),
-            'with_phone': sum(1 for r in parsed_resumes if r.get('phone_number')),
-            'with_skills': sum(1 for r in parsed_resumes if r.get('skills')),
-            'with_education': sum(1 for r in parsed_resumes if r.get('education')),
-            'with_location': sum(1 for r in parsed_resumes if r.get('location')),
-            'with_experience': sum(1 for r in parsed_resumes if r.get('total_experience'))
-        }
-        
-        print(f"Successfully processed {len(parsed_resumes)} resumes")  # Debug log
-        print(f"Sample data: {parsed_resumes[0] if parsed_resumes else 'No data'}")  # Debug log
-        
-        response_data = {
-            'success': True,
-            'message': f'Successfully processed {len(parsed_resumes)} resumes',
-            'data': parsed_resumes,
-            'stats': stats,
-            'json_file': json_filename,
-            'processing_results': processing_results
-        }
+        parse_mode = get_request_option('mode', PARSE_MODE_FULL)
+        # Only extract what the caller needs, e.g. fields=email for mailing lists
+        fields = get_request_list('fields') or None
+        try:
+            resolve_fields(parse_mode, fields)
+        except ValueError as e:
+            return jsonify({'success': False, 'message': str(e)})
         
-        return jsonify(response_data)
+        try:
+            batch = get_batch()
+        except BatchNotFound as e:
+            return batch_not_found(e)
+        if batch is None:
+            # Files uploaded before batches existed
+            return process_folder(app.config['UPLOAD_FOLDER'], app.config['RESULTS_FOLDER'], parse_mode, fields)
+        
+        # Batches are processed one request at a time; other batches run in parallel
+        try:
+            with batch.processing():
+                response = process_folder(batch.uploads_dir, batch.results_dir, parse_mode, fields, batch)
+        except BatchBusy as e:
+            return jsonify({'success': False, 'message': str(e), 'batch_id': batch.id}), 409
+        return response
         
     except Exception as e:
         print(f"Processing error: {str(e)}")  # Debug log
         return jsonify({'success': False, 'message': f'Processing error: {str(e)}'})
 
+def process_folder(upload_folder, results_folder, parse_mode, fields, batch=None):
+    """Parse the uploaded files in one folder and build the /process response"""
+    # Optional subset of uploaded files, e.g. re-parse a shortlist with the full tier
+    selected_files = set(get_request_list('files'))
+    
+    parser = create_parser()
+    upload_files = []
+    
+    # Get all uploaded files
+    for filename in sorted(os.listdir(upload_folder)):
+        if allowed_file(filename) and (not selected_files or filename in selected_files):
+            filepath = os.path.join(upload_folder, filename)
+            upload_files.append(filepath)
+
+    if not upload_files:
+        return jsonify({'success': False, 'message': 'No files to process'})
+    
+    print(f"Processing {len(upload_files)} files")  # Debug log
+    
+    parsed_resumes = []
+    processing_results = []
+    
+    for filepath in upload_files:
+        parse_into(parser, filepath, os.path.basename(filepath), parse_mode, fields,
+                   parsed_resumes, processing_results)
+    
+    if not parsed_resumes:
+        return jsonify({
+            'success': False, 
+            'message': 'No resumes were successfully processed',
+            'results': processing_results
+        })
+    
+    if batch is not None:
+        batch.save_results(parsed_resumes)
+    
+    # Save JSON snapshot only when explicitly enabled
+    json_filename = None
+    if app.config['RESULTS_SNAPSHOTS']:
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        json_filename = result_serializer.result_filename(
+            f'parsed_resumes_{timestamp}',
+            app.config['RESULTS_FORMAT'],
+            app.config['RESULTS_COMPRESS']
+        )
+        json_filepath = os.path.join(results_folder, json_filename)
+        result_serializer.write_records(parsed_resumes, json_filepath)
+    
+    # Calculate statistics
+    stats = summarize_parsed(parsed_resumes)
+    
+    print(f"Successfully processed {len(parsed_resumes)} resumes")  # Debug log
+    print(f"Sample data: {parsed_resumes[0] if parsed_resumes else 'No data'}")  # Debug log
+    
+    response_data = {
+        'success': True,
+        'message': f'Successfully processed {len(parsed_resumes)} resumes',
+        'batch_id': batch.id if batch else None,
+        'mode': parse_mode,
+        'fields': sorted(resolve_fields(parse_mode, fields)),
+        'data': parsed_resumes,
+        'stats': stats,
+        'json_file': json_filename,
+        'processing_results': processing_results,
+        'results_log': results_log.stats()
+    }
+    
+    return jsonify(response_data)
+
 @app.route('/export-excel', methods=['POST'])
 def export_to_excel():
     try:
         print("Export Excel endpoint hit")  # Debug log
         
-        data = request.json
-        parsed_resumes = data.get('data', [])
+        try:
+            batch = get_batch()
+        except BatchNotFound as e:
+            return batch_not_found(e)
+        
+        # A batch's last /process results are exported when no data is sent
+        data = request.get_json(silent=True) or {}
+        parsed_resumes = data.get('data') or (batch.load_results() if batch else None) or []
         
         if not parsed_resumes:
             return jsonify({'success': False, 'message': 'No data to export'})
         
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         excel_filename = f'parsed_resumes_{timestamp}.xlsx'
-        excel_filepath = os.path.join(app.config['RESULTS_FOLDER'], excel_filename)
+        results_folder = batch.results_dir if batch else app.config['RESULTS_FOLDER']
+        excel_filepath = os.path.join(results_folder, excel_filename)
         
         try:
             # Try using the ExcelExporter class first
@@ -201,6 +510,7 @@ def export_to_excel():
         except (ImportError, AttributeError, Exception) as e:
             print(f"ExcelExporter failed, using pandas: {str(e)}")  # Debug log
             # Fallback to pandas
+            import pandas as pd
             df_data = []
             for resume in parsed_resumes:
                 row = {
@@ -221,6 +531,7 @@ def export_to_excel():
         return jsonify({
             'success': True,
             'message': 'Excel file created successfully',
+            'batch_id': batch.id if batch else None,
             'filename': excel_filename
         })
         
@@ -231,9 +542,16 @@ def export_to_excel():
 @app.route('/download/<filename>')
 def download_file(filename):
     try:
-        filepath = os.path.join(app.config['RESULTS_FOLDER'], filename)
+        try:
+            batch = get_batch()
+        except BatchNotFound as e:
+            return batch_not_found(e)
+        results_folder = batch.results_dir if batch else app.config['RESULTS_FOLDER']
+        filepath = os.path.join(results_folder, secure_filename(filename))
         if os.path.exists(filepath):
-            return send_file(filepath, as_attachment=True)
+            # Strong ETag, 304/Range support and a pre-compressed copy for text exports
+            return http_cache.send_download(request, filepath, os.path.basename(filepath),
+                                            app.config['COMPRESS_MIN_BYTES'], app.config['COMPRESS_LEVEL'])
         else:
             return jsonify({'success': False, 'message': 'File not found'}), 404
     except Exception as e:
@@ -244,13 +562,32 @@ def clear_files():
     try:
         print("Clear files endpoint hit")  # Debug log
         
+        # With a batch_id only that batch's workspace goes; the shared results log stays
+        batch_id = get_request_option('batch_id')
+        if batch_id:
+            try:
+                if not workspaces.remove(str(batch_id)):
+                    return batch_not_found(BatchNotFound(f'Unknown batch: {batch_id}'))
+            except BatchBusy as e:
+                return jsonify({'success': False, 'message': str(e), 'batch_id': batch_id}), 409
+            return jsonify({'success': True, 'message': f'Batch {batch_id} cleared', 'batch_id': batch_id})
+        
         # Clear upload folder
         for filename in os.listdir(app.config['UPLOAD_FOLDER']):
             file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
             if os.path.isfile(file_path):
                 os.remove(file_path)
         
-        # Clear results folder
+        # Other sessions' batches and the shared results only go when asked for explicitly
+        if not is_truthy(get_request_option('all', False)):
+            return jsonify({'success': True, 'message': 'Upload folder cleared'})
+        
+        # Clear every batch, the results log and results folder
+        workspaces.clear()
+        results_log.clear()
+        skill_index.clear()
+        search_index.clear()
+        candidate_frame.clear()
         for filename in os.listdir(app.config['RESULTS_FOLDER']):
             file_path = os.path.join(app.config['RESULTS_FOLDER'], filename)
             if os.path.isfile(file_path):
@@ -261,20 +598,254 @@ def clear_files():
         print(f"Clear error: {str(e)}")  # Debug log
         return jsonify({'success': False, 'message': f'Clear error: {str(e)}'})
 
+@app.route('/batches', methods=['GET'])
+def list_batches():
+    return jsonify({'success': True, 'batches': workspaces.list()})
+
+@app.route('/batches/<batch_id>', methods=['GET'])
+def get_batch_status(batch_id):
+    try:
+        return jsonify({'success': True, 'batch': workspaces.get(batch_id).to_dict()})
+    except BatchNotFound as e:
+        return batch_not_found(e)
+
+@app.route('/results', methods=['GET'])
+def get_results():
+    try:
+        return jsonify({
+            'success': True,
+            'data': [public_record(record) for record in results_log.iter_records()],
+            'results_log': results_log.stats()
+        })
+    except Exception as e:
+        print(f"Results error: {str(e)}")  # Debug log
+        return jsonify({'success': False, 'message': f'Results error: {str(e)}'})
+
+@app.route('/results/compact', methods=['POST'])
+def compact_results():
+    try:
+        summary = results_log.compact()
+        # Compaction may expire records; the log reports a full change, so this rebuilds
+        sync_indexes()
+        return jsonify({'success': True, 'message': 'Results log compacted', 'summary': summary})
+    except Exception as e:
+        print(f"Compaction error: {str(e)}")  # Debug log
+        return jsonify({'success': False, 'message': f'Compaction error: {str(e)}'})
+
+@app.route('/skills', methods=['GET'])
+def get_skills_taxonomy():
+    try:
+        matcher = get_skill_matcher()
+        return jsonify({'success': True, 'taxonomy': matcher.stats(), 'categories': matcher.categories})
+    except Exception as e:
+        print(f"Skills taxonomy error: {str(e)}")  # Debug log
+        return jsonify({'success': False, 'message': f'Skills taxonomy error: {str(e)}'})
+
+@app.route('/skills/reload', methods=['POST'])
+def reload_skills_taxonomy():
+    # Re-reads the taxonomy file if it changed; force=1 reloads regardless
+    try:
+        matcher, changed = reload_skill_matcher(force=is_truthy(get_request_option('force', False)))
+        message = f'Skills taxonomy {matcher.version} loaded' if changed else 'Skills taxonomy unchanged'
+        return jsonify({'success': True, 'message': message, 'changed': changed, 'taxonomy': matcher.stats()})
+    except Exception as e:
+        print(f"Skills reload error: {str(e)}")  # Debug log
+        return jsonify({'success': False, 'message': f'Skills reload error: {str(e)}'})
+
+@app.route('/skills/top', methods=['GET'])
+def top_skills():
+    try:
+        k = int(get_request_option('k', 20))
+        sync_indexes()
+        return jsonify({'success': True, 'skills': skill_index.top(k), 'index': skill_index.stats()})
+    except ValueError:
+        return jsonify({'success': False, 'message': 'k must be an integer'})
+
+@app.route('/skills/cooccurrence', methods=['GET'])
+def cooccurring_skills():
+    skill = get_request_option('skill')
+    if not skill:
+        return jsonify({'success': False, 'message': 'skill is required'})
+    try:
+        k = int(get_request_option('k', 20))
+    except ValueError:
+        return jsonify({'success': False, 'message': 'k must be an integer'})
+    
+    sync_indexes()
+    related = skill_index.cooccurring(skill, k)
+    if related is None:
+        return jsonify({'success': False, 'message': f'No resumes list {skill}'})
+    return jsonify({
+        'success': True,
+        'skill': skill,
+        'resumes_with_skill': skill_index.frequency(skill),
+        'cooccurring': related
+    })
+
+@app.route('/search', methods=['GET', 'POST'])
+def search_resumes():
+    # e.g. q=(python OR go) AND "machine learning" AND experience>=3 AND location:chennai
+    query = get_request_option('q')
+    if not query:
+        return jsonify({'success': False, 'message': 'q is required'})
+    try:
+        limit = int(get_request_option('limit', 50))
+        offset = int(get_request_option('offset', 0))
+    except ValueError:
+        return jsonify({'success': False, 'message': 'limit and offset must be integers'})
+    
+    sync_indexes()
+    start = datetime.now()
+    try:
+        keys = search_index.search(query)
+    except QuerySyntaxError as e:
+        return jsonify({'success': False, 'message': f'Invalid query: {str(e)}'})
+    took_ms = round((datetime.now() - start).total_seconds() * 1000, 3)
+    
+    records = []
+    for key in keys[offset:offset + limit]:
+        record = results_log.get(key)
+        if record is not None:
+            records.append(public_record(record))
+    return jsonify({
+        'success': True,
+        'query': query,
+        'total': len(keys),
+        'offset': offset,
+        'data': records,
+        'took_ms': took_ms
+    })
+
+@app.route('/chat', methods=['POST'])
+def chat_query():
+    # Aggregate questions, e.g. "how many candidates know React with over 2 years"
+    message = get_request_option('message')
+    if not message or not str(message).strip():
+        return jsonify({'success': False, 'message': 'message is required'})
+    
+    try:
+        sync_indexes()
+        start = datetime.now()
+        reply = answer_question(str(message), candidate_frame, get_skill_matcher())
+        reply['took_ms'] = round((datetime.now() - start).total_seconds() * 1000, 3)
+        return jsonify({'success': True, **reply})
+    except Exception as e:
+        print(f"Chat error: {str(e)}")  # Debug log
+        return jsonify({'success': False, 'message': f'Chat error: {str(e)}'})
+
+@app.route('/mail/templates', methods=['GET'])
+def get_mail_templates():
+    return jsonify({'success': True, 'templates': MAIL_TEMPLATES, 'smtp': mailer.settings.to_dict()})
+
+@app.route('/broadcast', methods=['POST'])
+def broadcast():
+    # Recipients are emails, {email, name, ...} objects, {key} results-log references
+    # and/or every resume matching a search query q
+    template_name = get_request_option('template')
+    if template_name and template_name not in MAIL_TEMPLATES:
+        return jsonify({'success': False, 'message': f'Unknown template: {template_name}'})
+    defaults = MAIL_TEMPLATES.get(template_name, {})
+    subject = get_request_option('subject', defaults.get('subject', 'Your application'))
+    body = get_request_option('body', get_request_option('message', defaults.get('body')))
+    if not body or not str(body).strip():
+        return jsonify({'success': False, 'message': 'body or template is required'})
+    try:
+        template = compile_template(str(subject), str(body))
+    except TemplateError as e:
+        return jsonify({'success': False, 'message': str(e)})
+    
+    recipients = get_request_option('recipients', [])
+    if not isinstance(recipients, list):
+        recipients = get_request_list('recipients')
+    recipients = recipients + [{'key': key} for key in get_request_list('keys')]
+    query = get_request_option('q')
+    if query:
+        sync_indexes()
+        try:
+            recipients += [{'key': key} for key in search_index.search(query)]
+        except QuerySyntaxError as e:
+            return jsonify({'success': False, 'message': f'Invalid query: {str(e)}'})
+    candidates = build_recipients(recipients, results_log.get)
+    if not candidates:
+        return jsonify({'success': False, 'message': 'No recipients'})
+    
+    try:
+        job = mailer.submit(BroadcastJob(template, candidates),
+                            background=is_truthy(get_request_option('background', False)))
+        counts = job.counts()
+        return jsonify({
+            'success': job.status != 'failed',
+            'message': f"Broadcast {job.status}: {counts['sent']} sent, {counts['failed']} failed, "
+                       f"{counts['skipped']} skipped",
+            'job': job.to_dict()
+        })
+    except Exception as e:
+        print(f"Broadcast error: {str(e)}")  # Debug log
+        return jsonify({'success': False, 'message': f'Broadcast error: {str(e)}'})
+
+@app.route('/broadcast', methods=['GET'])
+def list_broadcasts():
+    return jsonify({'success': True, 'jobs': mailer.list_jobs()})
+
+@app.route('/broadcast/<job_id>', methods=['GET'])
+def broadcast_status(job_id):
+    job = mailer.get_job(job_id)
+    if job is None:
+        return jsonify({'success': False, 'message': 'Broadcast not found'}), 404
+    return jsonify({'success': True, 'job': job})
+
+@app.route('/broadcast/<job_id>/cancel', methods=['POST'])
+def cancel_broadcast(job_id):
+    if not mailer.cancel(job_id):
+        return jsonify({'success': False, 'message': 'Broadcast is not running in this worker'})
+    return jsonify({'success': True, 'message': 'Broadcast cancelling'})
+
+@app.route('/metrics')
+def metrics_endpoint():
+    # Under serve.py this sums every worker, not just the one handling the scrape
+    return Response(metrics.render(), mimetype=metrics.PROMETHEUS_CONTENT_TYPE)
+
+@app.route('/diagnostics', methods=['GET'])
+def list_diagnostics():
+    profiler = ParseProfiler(app.config['DIAGNOSTICS_FOLDER'], max_dumps=app.config['PROFILE_MAX_DUMPS'])
+    return jsonify({'success': True, 'profiles': profiler.list_dumps()})
+
+@app.route('/pdf-backends', methods=['GET'])
+def pdf_backends_report():
+    # Calibration timings per installed PDF backend and which one is in use
+    return jsonify({'success': True, **get_backend_report()})
+
 @app.route('/health')
 def health_check():
-    return jsonify({'status': 'healthy', 'timestamp': datetime.now().isoformat()})
+    # Liveness is unconditional; readiness reflects whether the NLP models are loaded
+    return jsonify({
+        'status': 'healthy',
+        'ready': get_model_status()['ready'],
+        'models': get_model_status(),
+        'timestamp': datetime.now().isoformat()
+    })
+
+@app.route('/health/ready')
+def readiness_check():
+    status = get_model_status()
+    return jsonify({'ready': status['ready'], 'models': status}), 200 if status['ready'] else 503
 
 # Remove or fix the duplicate export_excel endpoint
 @app.route('/export_excel', methods=['GET'])
 def export_excel_get():
     try:
+        try:
+            batch = get_batch()
+        except BatchNotFound as e:
+            return batch_not_found(e)
+        upload_folder = batch.uploads_dir if batch else app.config['UPLOAD_FOLDER']
+        
         parser = ResumeParser()
         upload_files = []
         
-        for filename in os.listdir(app.config['UPLOAD_FOLDER']):
+        for filename in os.listdir(upload_folder):
             if allowed_file(filename):
-                filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+                filepath = os.path.join(upload_folder, filename)
                 upload_files.append(filepath)
                 
         if not upload_files:
@@ -290,13 +861,14 @@ def export_excel_get():
             return jsonify({'success': False, 'message': 'No data to export'})
             
         excel_filename = f'parsed_resumes_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx'
-        excel_filepath = os.path.join(app.config['RESULTS_FOLDER'], excel_filename)
+        excel_filepath = os.path.join(batch.results_dir if batch else app.config['RESULTS_FOLDER'], excel_filename)
         
         # Use the same export logic as the POST endpoint
         try:
             exporter = ExcelExporter()
             exporter.export_to_excel(parsed_resumes, excel_filepath)
         except:
+            import pandas as pd
             df_data = []
             for resume in parsed_resumes:
                 row = {
@@ -313,11 +885,16 @@ def export_excel_get():
             df = pd.DataFrame(df_data)
             df.to_excel(excel_filepath, index=False, engine='openpyxl')
         
-        return send_file(excel_filepath, as_attachment=True)
+        return send_file(os.path.abspath(excel_filepath), as_attachment=True)
         
     except Exception as e:
         return jsonify({'success': False, 'message': f'Export error: {str(e)}'})
 
+@app.after_request
+def compress_and_validate(response):
+    return http_cache.finalize_response(request, response, app.config['COMPRESS_MIN_BYTES'],
+                                        app.config['COMPRESS_LEVEL'])
+
 # Add error handlers
 @app.errorhandler(413)
 def too_large(e):
@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the Resume Parser
+
+Generates a reproducible synthetic resume corpus (PDF, DOCX and TXT) with
+known ground truth, times every text-extraction backend (including each
+installed PDF library) and field extractor, and compares the results
+against a saved baseline.
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+import zipfile
+from datetime import datetime
+from typing import List, Dict, Optional, Any
+from xml.sax.saxutils import escape
+
+from pdf_backends import PDF_BACKENDS, write_pdf
+
+FIRST_NAMES = ['Arun', 'Priya', 'Karthik', 'Divya', 'Rahul', 'Meena', 'John', 'Sarah', 'Vikram', 'Anita']
+LAST_NAMES = ['Kumar', 'Sharma', 'Raman', 'Iyer', 'Smith', 'Patel', 'Reddy', 'Nair', 'Brown', 'Das']
+CITIES = ['Chennai, Tamil Nadu', 'Bangalore, Karnataka', 'Hyderabad, Telangana', 'Pune, Maharashtra']
+SKILL_POOL = [
+    'python', 'java', 'javascript', 'react', 'django', 'flask', 'docker', 'kubernetes', 'aws',
+    'mysql', 'mongodb', 'git', 'linux', 'machine learning', 'pandas', 'numpy', 'sql', 'agile'
+]
+FILLER = (
+    'Designed and implemented scalable services handling production traffic, '
+    'collaborated with cross-functional teams and improved deployment reliability.'
+)
+
+EXTRACTORS = [
+    'extract_name', 'extract_email', 'extract_phone', 'extract_skills',
+    'extract_education', 'extract_location', 'extract_experience', 'extract_additional_info'
+]
+TEXT_BACKENDS = {
+    'pdf': 'extract_text_from_pdf',
+    'docx': 'extract_text_from_docx',
+    'txt': 'extract_text_from_txt'
+}
+DEFAULT_TOLERANCE = 0.25  # Allowed slowdown before a regression is reported
+
+
+def generate_profile(rng: random.Random, index: int, size: int) -> Dict[str, Any]:
+    """Generate one synthetic candidate with known ground truth"""
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    start_year = rng.randint(2005, 2018)
+    jobs = []
+    year = start_year
+    for _ in range(rng.randint(1, 3)):
+        end = min(year + rng.randint(1, 4), datetime.now().year)
+        jobs.append((year, end))
+        year = end
+    return {
+        'name': f'{first} {last}',
+        'email': f'{first.lower()}.{last.lower()}{index}@mail.com',
+        'phone_number': f'+91{rng.randint(6, 9)}{rng.randint(100000000, 999999999)}',
+        'skills': sorted(rng.sample(SKILL_POOL, rng.randint(4, 10))),
+        'location': rng.choice(CITIES),
+        'jobs': jobs,
+        'filler_paragraphs': size
+    }
+
+
+def render_lines(profile: Dict[str, Any]) -> List[str]:
+    """Render a profile as plain resume lines"""
+    lines = [
+        profile['name'],
+        f"Email: {profile['email']}",
+        f"Phone: {profile['phone_number']}",
+        f"Location: {profile['location']}",
+        '',
+        'Skills:',
+        ', '.join(profile['skills']),
+        '',
+        'Experience:'
+    ]
+    for i, (start, end) in enumerate(profile['jobs'], 1):
+        lines.append(f'Software Engineer {i}, Company {i}  {start} - {end}')
+        lines.append(FILLER)
+    lines.extend(['', 'Education:', 'B.Tech in Computer Science, Anna University', ''])
+    for _ in range(profile['filler_paragraphs']):
+        lines.append(FILLER)
+    return lines
+
+
+def write_txt(path: str, lines: List[str]):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines))
+
+
+def write_docx(path: str, lines: List[str]):
+    """Write a minimal but valid DOCX without python-docx"""
+    body = ''.join(
+        f'<w:p><w:r><w:t xml:space="preserve">{escape(line)}</w:t></w:r></w:p>' for line in lines
+    )
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f'<w:body>{body}</w:body></w:document>'
+    )
+    content_types = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/word/document.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+        '</Types>'
+    )
+    rels = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="word/document.xml"/></Relationships>'
+    )
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('[Content_Types].xml', content_types)
+        archive.writestr('_rels/.rels', rels)
+        archive.writestr('word/document.xml', document)
+
+
+WRITERS = {'pdf': write_pdf, 'docx': write_docx, 'txt': write_txt}
+
+
+def generate_corpus(output_dir: str, count: int = 20, size: int = 10, seed: int = 42,
+                    file_types: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """Generate a reproducible corpus and return its manifest"""
+    rng = random.Random(seed)
+    file_types = file_types or list(WRITERS)
+    os.makedirs(output_dir, exist_ok=True)
+
+    manifest = []
+    for i in range(count):
+        profile = generate_profile(rng, i, size)
+        lines = render_lines(profile)
+        for file_type in file_types:
+            path = os.path.join(output_dir, f'synthetic_{i:04d}.{file_type}')
+            WRITERS[file_type](path, lines)
+            manifest.append({'path': path, 'file_type': file_type, 'expected': profile})
+
+    with open(os.path.join(output_dir, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def _summarize(latencies: List[float]) -> Dict[str, float]:
+    total = sum(latencies)
+    return {
+        'count': len(latencies),
+        'files_per_sec': round(len(latencies) / total, 2) if total else 0.0,
+        'mean_ms': round(statistics.mean(latencies) * 1000, 3) if latencies else 0.0,
+        'p50_ms': round(_percentile(latencies, 50) * 1000, 3),
+        'p95_ms': round(_percentile(latencies, 95) * 1000, 3)
+    }
+
+
+def _timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def _timed_safely(func, *args):
+    """Like _timed, with a failed call returning None so it is counted instead of timed"""
+    try:
+        return _timed(func, *args)
+    except Exception:
+        return None, 0.0
+
+
+def _with_failures(summary: Dict[str, Any], failed: int) -> Dict[str, Any]:
+    summary['failed'] = failed
+    return summary
+
+
+def run_benchmark(parser, manifest: List[Dict[str, Any]], repeat: int = 1) -> Dict[str, Any]:
+    """Time text backends, extractors and end-to-end parsing per file type.
+
+    Failed calls (an exception, no text or no parse result) are counted per
+    backend and file type and left out of the throughput and percentiles.
+    """
+    backends = {}
+    backend_failures = {}
+    extractors = {name: [] for name in EXTRACTORS}
+    end_to_end = {}
+    failures = {}
+    peak_memory = {}
+    accuracy = {}
+
+    for entry in manifest:
+        file_type, path, expected = entry['file_type'], entry['path'], entry['expected']
+        backend = TEXT_BACKENDS[file_type]
+        end_to_end.setdefault(file_type, [])
+        failures.setdefault(file_type, 0)
+
+        for _ in range(repeat):
+            text, elapsed = _timed_safely(getattr(parser, backend), path)
+            backends.setdefault(backend, [])
+            if text:
+                backends[backend].append(elapsed)
+            else:
+                backend_failures[backend] = backend_failures.get(backend, 0) + 1
+
+            if file_type == 'pdf':
+                # Time every installed PDF backend, not just the one the parser selected
+                for pdf_backend in PDF_BACKENDS.values():
+                    if pdf_backend.available():
+                        name = f'pdf:{pdf_backend.name}'
+                        pdf_text, elapsed = _timed_safely(pdf_backend.extract, path)
+                        backends.setdefault(name, [])
+                        if pdf_text and pdf_text.strip():
+                            backends[name].append(elapsed)
+                        else:
+                            backend_failures[name] = backend_failures.get(name, 0) + 1
+
+            # Extractors timed on empty text would only measure how fast they give up
+            for name in EXTRACTORS if text else ():
+                # Extractors share per-document scans; start each one cold so it pays its own
+                parser.clear_document_cache()
+                _, elapsed = _timed(getattr(parser, name), text)
+                extractors[name].append(elapsed)
+
+            parser.clear_document_cache()
+            parsed, elapsed = _timed_safely(parser.parse_resume, path)
+            if parsed:
+                end_to_end[file_type].append(elapsed)
+            else:
+                failures[file_type] += 1
+
+        # Peak memory in a separate pass, as tracemalloc slows the timed calls down
+        parser.clear_document_cache()
+        tracemalloc.start()
+        _timed_safely(parser.parse_resume, path)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peak_memory[file_type] = max(peak_memory.get(file_type, 0), peak)
+
+        hits = accuracy.setdefault(file_type, {'files': 0, 'name': 0, 'email': 0, 'skills': 0})
+        hits['files'] += 1
+        parsed = parsed or {}
+        if (parsed.get('name') or '').lower() == expected['name'].lower():
+            hits['name'] += 1
+        if parsed.get('email') == expected['email']:
+            hits['email'] += 1
+        found = {skill.lower() for skill in parsed.get('skills') or []}
+        if set(expected['skills']) <= found:
+            hits['skills'] += 1
+
+    return {
+        'generated_at': datetime.now().isoformat(),
+        'python': sys.version.split()[0],
+        'backends': {
+            name: _with_failures(_summarize(values), backend_failures.get(name, 0))
+            for name, values in backends.items()
+        },
+        'extractors': {name: _summarize(values) for name, values in extractors.items()},
+        'file_types': {
+            file_type: dict(_with_failures(_summarize(values), failures[file_type]),
+                            peak_memory_kb=round(peak_memory[file_type] / 1024, 1))
+            for file_type, values in end_to_end.items()
+        },
+        'accuracy': accuracy
+    }
+
+
+def compare_to_baseline(results: Dict[str, Any], baseline: Dict[str, Any],
+                        tolerance: float = DEFAULT_TOLERANCE) -> List[str]:
+    """Return a list of regressions where p50 latency grew beyond tolerance"""
+    regressions = []
+    for section in ('backends', 'extractors', 'file_types'):
+        for name, current in results.get(section, {}).items():
+            previous = baseline.get(section, {}).get(name)
+            if previous and current.get('failed', 0) > previous.get('failed', 0):
+                regressions.append(f"{section}/{name}: failed {previous.get('failed', 0)} -> {current['failed']}")
+            if not previous or not previous.get('p50_ms'):
+                continue
+            ratio = current['p50_ms'] / previous['p50_ms']
+            if ratio > 1 + tolerance:
+                regressions.append(
+                    f"{section}/{name}: p50 {previous['p50_ms']}ms -> {current['p50_ms']}ms ({ratio:.2f}x)"
+                )
+    for file_type, current in results.get('accuracy', {}).items():
+        previous = baseline.get('accuracy', {}).get(file_type, {})
+        for field in ('name', 'email', 'skills'):
+            if field in previous and current[field] < previous[field]:
+                regressions.append(f"accuracy/{file_type}/{field}: {previous[field]} -> {current[field]}")
+    return regressions
+
+
+def print_report(results: Dict[str, Any]):
+    print(f"\n{'='*70}")
+    print("RESUME PARSER BENCHMARK")
+    print(f"{'='*70}")
+    for section in ('file_types', 'backends', 'extractors'):
+        print(f"\n{section.replace('_', ' ').title()}:")
+        for name, row in results[section].items():
+            memory = f"  peak {row['peak_memory_kb']:>9.1f} KB" if 'peak_memory_kb' in row else ''
+            failed = f"  failed {row['failed']}" if row.get('failed') else ''
+            print(f"  {name:28}: {row['files_per_sec']:>9.2f}/s  p50 {row['p50_ms']:>9.3f} ms  "
+                  f"p95 {row['p95_ms']:>9.3f} ms{memory}{failed}")
+    print("\nAccuracy:")
+    for file_type, hits in results['accuracy'].items():
+        print(f"  {file_type:28}: name {hits['name']}/{hits['files']}  email {hits['email']}/{hits['files']}  "
+              f"skills {hits['skills']}/{hits['files']}")
+
+
+def main(argv=None):
+    cli = argparse.ArgumentParser(description='Resume Parser benchmark suite')
+    cli.add_argument('--corpus', default='benchmark_corpus', help='Directory for the synthetic corpus')
+    cli.add_argument('--count', type=int, default=20, help='Resumes per file type')
+    cli.add_argument('--size', type=int, default=10, help='Filler paragraphs per resume')
+    cli.add_argument('--seed', type=int, default=42, help='Random seed for the corpus')
+    cli.add_argument('--types', nargs='+', default=list(WRITERS), choices=list(WRITERS))
+    cli.add_argument('--repeat', type=int, default=1, help='Timing repetitions per file')
+    cli.add_argument('--output', '-o', help='Write results JSON to this file')
+    cli.add_argument('--baseline', '-b', help='Baseline JSON to compare against')
+    cli.add_argument('--save-baseline', action='store_true', help='Write results to --baseline')
+    cli.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE, help='Allowed p50 slowdown ratio')
+    args = cli.parse_args(argv)
+
+    from resume_parser import ResumeParser
+
+    manifest = generate_corpus(args.corpus, args.count, args.size, args.seed, args.types)
+    parser = ResumeParser()
+    results = run_benchmark(parser, manifest, args.repeat)
+    print_report(results)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline and args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n✓ Baseline saved to {args.baseline}")
+    elif args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n❌ {len(regressions)} REGRESSION(S) against {args.baseline}:")
+            for regression in regressions:
+                print(f"  - {regression}")
+            return 1
+        print(f"\n✓ No regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
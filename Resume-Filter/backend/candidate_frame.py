@@ -0,0 +1,252 @@
+import threading
+from typing import List, Dict, Optional, Any, Iterable, Sequence, Tuple
+
+import numpy as np
+
+from candidate_record import SkillVocabulary
+
+EXPERIENCE_COMPARISONS = {
+    '>': np.greater,
+    '>=': np.greater_equal,
+    '<': np.less,
+    '<=': np.less_equal,
+    '=': np.equal
+}
+INITIAL_ROWS = 1024
+INITIAL_SKILLS = 64
+
+
+def normalize_location(location: Optional[str]) -> Optional[str]:
+    """Group locations by their first component: "Chennai, Tamil Nadu" -> "chennai" """
+    if not location or not isinstance(location, str):
+        return None
+    city = location.split(',')[0].strip().lower()
+    return city or None
+
+
+def _capacity(needed: int, current: int) -> int:
+    while current < needed:
+        current *= 2
+    return current
+
+
+class CandidateFrame:
+    """Columnar view of the talent pool for vectorised aggregate questions.
+
+    Row i holds one resume: experience is a float column (NaN when missing),
+    location a code column (-1 when missing) and skills a boolean membership
+    matrix with one column per distinct skill, used for filtering. The same
+    memberships are also kept as sparse (row, skill) pairs, so grouping by
+    skill costs O(memberships) instead of a scan of the whole matrix.
+    Storage grows by doubling, so adding a resume is amortised O(skills); a
+    superseded row is only marked dead until the next rebuild().
+    """
+
+    def __init__(self):
+        # Skills and locations are lowercased; the vocabularies map them to column/code ids
+        self.skill_vocab = SkillVocabulary()
+        self.location_vocab = SkillVocabulary()
+        self._rows: Dict[str, int] = {}
+        self._size = 0
+        self._live = np.zeros(INITIAL_ROWS, dtype=bool)
+        self._experience = np.full(INITIAL_ROWS, np.nan)
+        self._location = np.full(INITIAL_ROWS, -1, dtype=np.int32)
+        self._skills = np.zeros((INITIAL_ROWS, INITIAL_SKILLS), dtype=bool)
+        self._members = 0
+        self._member_rows = np.zeros(INITIAL_ROWS, dtype=np.int32)
+        self._member_skills = np.zeros(INITIAL_ROWS, dtype=np.int32)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]]) -> 'CandidateFrame':
+        frame = cls()
+        frame.rebuild(records)
+        return frame
+
+    def _reserve(self, rows: int, skills: int, members: int):
+        if rows > len(self._live):
+            capacity = _capacity(rows, len(self._live))
+            extra = capacity - len(self._live)
+            self._live = np.concatenate([self._live, np.zeros(extra, dtype=bool)])
+            self._experience = np.concatenate([self._experience, np.full(extra, np.nan)])
+            self._location = np.concatenate([self._location, np.full(extra, -1, dtype=np.int32)])
+        rows_capacity, skills_capacity = self._skills.shape
+        if rows > rows_capacity or skills > skills_capacity:
+            grown = np.zeros((len(self._live), _capacity(skills, skills_capacity)), dtype=bool)
+            grown[:rows_capacity, :skills_capacity] = self._skills
+            self._skills = grown
+        if members > len(self._member_rows):
+            capacity = _capacity(members, len(self._member_rows))
+            for name in ('_member_rows', '_member_skills'):
+                grown = np.zeros(capacity, dtype=np.int32)
+                grown[:self._members] = getattr(self, name)[:self._members]
+                setattr(self, name, grown)
+
+    def add(self, key: str, record: Dict[str, Any]):
+        """Append one parsed resume, superseding any earlier row with the same key"""
+        with self._lock:
+            previous = self._rows.get(key)
+            if previous is not None:
+                self._live[previous] = False
+
+            skill_ids = sorted({self.skill_vocab.intern(skill.strip().lower())
+                                for skill in record.get('skills') or () if skill and skill.strip()})
+            row = self._size
+            self._reserve(row + 1, len(self.skill_vocab), self._members + len(skill_ids))
+
+            experience = record.get('total_experience')
+            self._experience[row] = experience if isinstance(experience, (int, float)) else np.nan
+            city = normalize_location(record.get('location'))
+            self._location[row] = self.location_vocab.intern(city) if city else -1
+            if skill_ids:
+                self._skills[row, skill_ids] = True
+                end = self._members + len(skill_ids)
+                self._member_rows[self._members:end] = row
+                self._member_skills[self._members:end] = skill_ids
+                self._members = end
+            self._live[row] = True
+            self._rows[key] = row
+            self._size += 1
+
+    def remove(self, key: str) -> bool:
+        with self._lock:
+            row = self._rows.pop(key, None)
+            if row is None:
+                return False
+            self._live[row] = False
+            return True
+
+    def clear(self):
+        with self._lock:
+            self.skill_vocab = SkillVocabulary()
+            self.location_vocab = SkillVocabulary()
+            self._rows.clear()
+            self._size = 0
+            self._live = np.zeros(INITIAL_ROWS, dtype=bool)
+            self._experience = np.full(INITIAL_ROWS, np.nan)
+            self._location = np.full(INITIAL_ROWS, -1, dtype=np.int32)
+            self._skills = np.zeros((INITIAL_ROWS, INITIAL_SKILLS), dtype=bool)
+            self._members = 0
+            self._member_rows = np.zeros(INITIAL_ROWS, dtype=np.int32)
+            self._member_skills = np.zeros(INITIAL_ROWS, dtype=np.int32)
+
+    def rebuild(self, records: Iterable[Dict[str, Any]]):
+        """Reset the frame from stored records, keyed like the results log"""
+        self.clear()
+        for position, record in enumerate(records):
+            self.add(record.get('file_hash') or str(position), record)
+
+    def __len__(self):
+        return len(self._rows)
+
+    @property
+    def locations(self) -> List[str]:
+        return [self.location_vocab.term(code) for code in range(len(self.location_vocab))]
+
+    @property
+    def skills(self) -> List[str]:
+        return [self.skill_vocab.term(skill_id) for skill_id in range(len(self.skill_vocab))]
+
+    def _mask(self, skills: Sequence[str], match_all: bool, locations: Sequence[str],
+              experience: Sequence[Tuple[str, float]]) -> np.ndarray:
+        size = self._size
+        mask = self._live[:size].copy()
+        if skills:
+            ids = [self.skill_vocab.lookup(skill.strip().lower()) for skill in skills]
+            known = [skill_id for skill_id in ids if skill_id is not None]
+            if not known or (match_all and len(known) < len(ids)):
+                return np.zeros(size, dtype=bool)
+            members = self._skills[:size, known]
+            mask &= members.all(axis=1) if match_all else members.any(axis=1)
+        if locations:
+            codes = [self.location_vocab.lookup(normalize_location(location)) for location in locations]
+            mask &= np.isin(self._location[:size], [code for code in codes if code is not None])
+        for op, value in experience:
+            # NaN compares false, so candidates without a stated experience drop out
+            mask &= EXPERIENCE_COMPARISONS[op](self._experience[:size], value)
+        return mask
+
+    def aggregate(self, skills: Sequence[str] = (), match_all: bool = True, locations: Sequence[str] = (),
+                  experience: Sequence[Tuple[str, float]] = (), group_by: Optional[str] = None,
+                  top: int = 10) -> Dict[str, Any]:
+        """Count and summarise experience for candidates matching every filter.
+
+        skills are required together (or any one with match_all=False),
+        locations are alternatives and experience is a list of (op, years)
+        comparisons. group_by 'location' or 'skill' adds per-group counts and
+        average experience for the top groups.
+        """
+        with self._lock:
+            size = self._size
+            mask = self._mask(skills, match_all, locations, experience)
+            values = self._experience[:size][mask]
+            stated = values[~np.isnan(values)]
+            result = {
+                'count': int(mask.sum()),
+                'with_experience': int(stated.size),
+                'experience': {
+                    'mean': round(float(stated.mean()), 2),
+                    'median': round(float(np.median(stated)), 2),
+                    'min': float(stated.min()),
+                    'max': float(stated.max())
+                } if stated.size else None
+            }
+            if group_by == 'location':
+                result['groups'] = self._group_by_location(mask, top)
+            elif group_by == 'skill':
+                result['groups'] = self._group_by_skill(mask, top)
+            elif group_by is not None:
+                raise ValueError(f"Unknown group_by: {group_by}. Expected location or skill")
+            return result
+
+    def _groups(self, names, counts: np.ndarray, experience_sums: np.ndarray,
+                experience_counts: np.ndarray, top: int) -> List[Dict[str, Any]]:
+        order = np.lexsort((np.arange(len(counts)), -counts))
+        groups = []
+        for index in order[:top]:
+            if not counts[index]:
+                break
+            groups.append({
+                'name': names(int(index)).title(),
+                'count': int(counts[index]),
+                'mean_experience': (round(float(experience_sums[index] / experience_counts[index]), 2)
+                                    if experience_counts[index] else None)
+            })
+        return groups
+
+    def _group_by_location(self, mask: np.ndarray, top: int) -> List[Dict[str, Any]]:
+        size = self._size
+        codes = self._location[:size]
+        experience = self._experience[:size]
+        located = mask & (codes >= 0)
+        stated = located & ~np.isnan(experience)
+        groups = len(self.location_vocab)
+        counts = np.bincount(codes[located], minlength=groups)
+        experience_counts = np.bincount(codes[stated], minlength=groups)
+        experience_sums = np.bincount(codes[stated], weights=experience[stated], minlength=groups)
+        return self._groups(self.location_vocab.term, counts, experience_sums, experience_counts, top)
+
+    def _group_by_skill(self, mask: np.ndarray, top: int) -> List[Dict[str, Any]]:
+        width = len(self.skill_vocab)
+        rows = self._member_rows[:self._members]
+        selected = mask[rows]
+        skills = self._member_skills[:self._members][selected]
+        experience = self._experience[rows[selected]]
+        stated = ~np.isnan(experience)
+        counts = np.bincount(skills, minlength=width)
+        experience_counts = np.bincount(skills[stated], minlength=width)
+        experience_sums = np.bincount(skills[stated], weights=experience[stated], minlength=width)
+        return self._groups(self.skill_vocab.term, counts, experience_sums, experience_counts, top)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'rows': len(self._rows),
+                'dead_rows': self._size - len(self._rows),
+                'skills': len(self.skill_vocab),
+                'locations': len(self.location_vocab),
+                'bytes': int(sum(column.nbytes for column in (
+                    self._live, self._experience, self._location, self._skills,
+                    self._member_rows, self._member_skills
+                )))
+            }
@@ -0,0 +1,203 @@
+import sys
+from array import array
+from typing import List, Dict, Optional, Any, Iterable, Iterator
+
+# Fields produced by ResumeParser.parse_resume, in output order
+CORE_FIELDS = (
+    'file_name', 'file_path', 'file_hash', 'name', 'email', 'phone_number', 'skills',
+    'education', 'location', 'total_experience', 'parse_mode', 'processed_at', 'processing_time'
+)
+
+
+_MISSING = object()
+
+
+def _intern(value):
+    """Intern strings so repeated values share a single object"""
+    if isinstance(value, str):
+        return sys.intern(value)
+    return value
+
+
+class SkillVocabulary:
+    """Shared skill vocabulary mapping display names to integer ids"""
+
+    __slots__ = ('_terms', '_ids')
+
+    def __init__(self, terms: Optional[Iterable[str]] = None):
+        self._terms: List[str] = []
+        self._ids: Dict[str, int] = {}
+        for term in terms or ():
+            self.intern(term)
+
+    @classmethod
+    def from_keywords(cls, skills_keywords: Dict[str, List[str]]) -> 'SkillVocabulary':
+        """Build a vocabulary from ResumeParser.skills_keywords"""
+        vocab = cls()
+        for category in skills_keywords.values():
+            for skill in category:
+                # Parsed skills are stored title-cased, so index them that way
+                vocab.intern(skill.title())
+        return vocab
+
+    def intern(self, term: str) -> int:
+        """Return the id for a term, adding it to the vocabulary if unseen"""
+        skill_id = self._ids.get(term)
+        if skill_id is None:
+            skill_id = len(self._terms)
+            term = sys.intern(term)
+            self._terms.append(term)
+            self._ids[term] = skill_id
+        return skill_id
+
+    def lookup(self, term: str) -> Optional[int]:
+        """Return the id for a term without adding it"""
+        return self._ids.get(term)
+
+    def term(self, skill_id: int) -> str:
+        """Return the display name for an id"""
+        return self._terms[skill_id]
+
+    def encode(self, skills: Optional[Iterable[str]]) -> Optional[array]:
+        """Encode a list of skill names as a compact id array"""
+        if skills is None:
+            return None
+        return array('I', (self.intern(skill) for skill in skills))
+
+    def decode(self, skill_ids: Optional[array]) -> Optional[List[str]]:
+        """Decode an id array back into skill names"""
+        if skill_ids is None:
+            return None
+        return [self._terms[skill_id] for skill_id in skill_ids]
+
+    def __len__(self):
+        return len(self._terms)
+
+    def __contains__(self, term):
+        return term in self._ids
+
+
+
+class CandidateRecord:
+    """Compact in-memory representation of one parsed resume.
+
+    Fields missing from the source dict stay unset rather than None, so
+    to_dict() gives back exactly the keys it was built from.
+    """
+
+    __slots__ = (
+        'file_name', 'file_path', 'file_hash', 'name', 'email', 'phone_number', 'skill_ids',
+        'education', 'location', 'total_experience', 'parse_mode', 'processed_at',
+        'processing_time', 'extra', 'vocab'
+    )
+
+    def __init__(self, vocab: SkillVocabulary):
+        self.vocab = vocab
+        # Keys outside CORE_FIELDS (text, certifications, languages, urls, ...)
+        self.extra = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], vocab: SkillVocabulary) -> 'CandidateRecord':
+        """Build a record from the dict shape returned by parse_resume"""
+        record = cls(vocab)
+        for field in CORE_FIELDS:
+            if field not in data:
+                continue
+            value = data[field]
+            if field == 'skills':
+                record.skill_ids = vocab.encode(value)
+            elif field == 'education':
+                record.education = tuple(_intern(edu) for edu in value) if value is not None else None
+            else:
+                setattr(record, field, _intern(value))
+
+        extra = {key: value for key, value in data.items() if key not in CORE_FIELDS}
+        record.extra = extra or None
+        return record
+
+    @property
+    def skills(self) -> Optional[List[str]]:
+        return self.vocab.decode(getattr(self, 'skill_ids', None))
+
+    def has_skill(self, skill: str) -> bool:
+        """Check skill membership by id without decoding the whole list"""
+        skill_id = self.vocab.lookup(skill)
+        skill_ids = getattr(self, 'skill_ids', None)
+        return skill_id is not None and skill_ids is not None and skill_id in skill_ids
+
+    def get(self, field: str, default: Any = None) -> Any:
+        """dict.get() over the API shape, so indexes can take records directly"""
+        if field == 'skills':
+            return self.skills if hasattr(self, 'skill_ids') else default
+        if field == 'education':
+            education = getattr(self, 'education', default)
+            return list(education) if isinstance(education, tuple) else education
+        if field in CORE_FIELDS:
+            return getattr(self, field, default)
+        return self.extra.get(field, default) if self.extra else default
+
+    def __getitem__(self, field: str) -> Any:
+        value = self.get(field, _MISSING)
+        if value is _MISSING:
+            raise KeyError(field)
+        return value
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert back to the dict/JSON shape used by the API"""
+        data = {}
+        for field in CORE_FIELDS:
+            value = self.get(field, _MISSING)
+            if value is not _MISSING:
+                data[field] = value
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def __repr__(self):
+        return f"CandidateRecord(file_name={self.get('file_name')!r}, name={self.get('name')!r})"
+
+
+class CandidateBatch:
+    """A collection of candidate records sharing one skill vocabulary"""
+
+    def __init__(self, vocab: Optional[SkillVocabulary] = None):
+        self.vocab = vocab if vocab is not None else SkillVocabulary()
+        self.records: List[CandidateRecord] = []
+
+    @classmethod
+    def from_dicts(cls, parsed_resumes: Iterable[Dict[str, Any]],
+                   vocab: Optional[SkillVocabulary] = None) -> 'CandidateBatch':
+        """Build a batch from a list of parsed resume dicts"""
+        batch = cls(vocab)
+        batch.extend(parsed_resumes)
+        return batch
+
+    def append(self, parsed_data: Dict[str, Any]) -> CandidateRecord:
+        record = CandidateRecord.from_dict(parsed_data, self.vocab)
+        self.records.append(record)
+        return record
+
+    def extend(self, parsed_resumes: Iterable[Dict[str, Any]]):
+        for parsed_data in parsed_resumes:
+            self.append(parsed_data)
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Convert all records back to the API dict shape"""
+        return [record.to_dict() for record in self.records]
+
+    def with_skill(self, skill: str) -> List[CandidateRecord]:
+        """Return records that list the given (title-cased) skill"""
+        skill_id = self.vocab.lookup(skill)
+        if skill_id is None:
+            return []
+        return [record for record in self.records
+                if getattr(record, 'skill_ids', None) is not None and skill_id in record.skill_ids]
+
+    def __len__(self):
+        return len(self.records)
+
+    def __iter__(self) -> Iterator[CandidateRecord]:
+        return iter(self.records)
+
+    def __getitem__(self, index):
+        return self.records[index]
@@ -0,0 +1,235 @@
+import re
+from typing import List, Dict, Optional, Any, Tuple
+
+from candidate_frame import CandidateFrame
+from location_resolver import get_location_resolver, CITY
+
+NUMBER = r'(\d+(?:\.\d+)?)'
+YEARS = r'\s*\+?\s*(?:years?|yrs?)\b'
+# (pattern, comparisons built from the captured numbers); first matching pattern wins
+EXPERIENCE_PATTERNS = [
+    (re.compile(r'\bbetween\s+' + NUMBER + r'\s*(?:and|-|to)\s*' + NUMBER + YEARS),
+     lambda low, high: [('>=', low), ('<=', high)]),
+    (re.compile(NUMBER + r'\s*(?:-|to)\s*' + NUMBER + YEARS),
+     lambda low, high: [('>=', low), ('<=', high)]),
+    (re.compile(r'\b(?:over|more than|above|greater than|>)\s*' + NUMBER + YEARS), lambda value: [('>', value)]),
+    (re.compile(r'\b(?:at least|minimum(?: of)?|min\.?|>=)\s*' + NUMBER + YEARS), lambda value: [('>=', value)]),
+    (re.compile(r'\b(?:under|less than|below|fewer than|<)\s*' + NUMBER + YEARS), lambda value: [('<', value)]),
+    (re.compile(r'\b(?:at most|up to|maximum(?: of)?|max\.?|<=)\s*' + NUMBER + YEARS), lambda value: [('<=', value)]),
+    (re.compile(NUMBER + r'\s*\+\s*(?:years?|yrs?)\b'), lambda value: [('>=', value)]),
+    (re.compile(r'\b(?:exactly|with)\s+' + NUMBER + YEARS), lambda value: [('=', value)])
+]
+GROUP_BY_LOCATION = re.compile(r'\b(?:by|per|each|every|across)\s+(?:location|city|cities|place)s?\b'
+                               r'|\bwhich\s+(?:locations?|cit(?:y|ies))\b|\bwhere\b')
+GROUP_BY_SKILL = re.compile(r'\b(?:by|per|each|every)\s+skills?\b|\b(?:top|common|popular|frequent)\s+skills?\b'
+                            r'|\bwhich\s+skills?\b|\bwhat\s+skills?\b')
+AVERAGE = re.compile(r'\b(?:average|avg|mean)\b')
+MEDIAN = re.compile(r'\bmedian\b')
+MAXIMUM = re.compile(r'\b(?:max(?:imum)?|most experienced|longest|highest)\b')
+MINIMUM = re.compile(r'\b(?:min(?:imum)?|least experienced|shortest|lowest)\b')
+COUNT = re.compile(r'\b(?:how many|count|number of|total)\b')
+ANY_OF = re.compile(r'\b(?:or|either|any of)\b')
+# "in X", "from X", "based in X" up to the next clause; X may still turn out to be a skill
+LOCATION_PHRASE = re.compile(
+    r'\b(?:in|from|at|near|around|based in|located in|living in)\s+([a-z][a-z .\'-]*?)'
+    r'(?=\s+(?:with|who|whose|and|or|having|that|knowing|for|under|over|between|by|per|than)\b|[?.,!;]|$)'
+)
+# Words that make a prepositional phrase something other than a place ("in total", "in each city")
+NOT_PLACE_WORDS = frozenset({
+    'all', 'any', 'each', 'every', 'the', 'our', 'my', 'total', 'pool', 'database', 'list', 'general',
+    'experience', 'year', 'years', 'city', 'cities', 'location', 'locations', 'place', 'places'
+})
+COMPARISON_WORDS = {'>': 'more than', '>=': 'at least', '<': 'less than', '<=': 'at most', '=': 'exactly'}
+
+
+class ChatQuery:
+    """An aggregate question reduced to an intent and CandidateFrame filters"""
+
+    def __init__(self, intent: str, skills: List[str], match_all: bool, locations: List[str],
+                 experience: List[Tuple[str, float]], group_by: Optional[str], understood: bool = True):
+        self.intent = intent
+        self.skills = skills
+        self.match_all = match_all
+        self.locations = locations
+        self.experience = experience
+        self.group_by = group_by
+        # False when nothing in the question looked like a filter or an aggregate
+        self.understood = understood
+
+    def filters(self) -> Dict[str, Any]:
+        return {
+            'skills': [skill.title() for skill in self.skills],
+            'match': 'all' if self.match_all else 'any',
+            'locations': [location.title() for location in self.locations],
+            'experience': [{'op': op, 'years': years} for op, years in self.experience]
+        }
+
+    def describe(self, count: int = 2) -> str:
+        """Plain-English restatement, e.g. "candidates who know React in Chennai" """
+        parts = ['candidate' if count == 1 else 'candidates']
+        if self.skills:
+            joiner = ' and ' if self.match_all else ' or '
+            verb = 'knows' if count == 1 else 'know'
+            parts.append(f'who {verb} ' + joiner.join(skill.title() for skill in self.skills))
+        if self.locations:
+            parts.append('in ' + ' or '.join(location.title() for location in self.locations))
+        if self.experience:
+            parts.append('with ' + ' and '.join(
+                f"{COMPARISON_WORDS[op]} {years:g} years" for op, years in self.experience
+            ) + ' of experience')
+        return ' '.join(parts)
+
+
+def _place_names(resolver, place_ids) -> set:
+    """Lowercase names of the places, with the cities inside a state or country"""
+    names = set()
+    for place_id in place_ids:
+        place = resolver.places[place_id]
+        names.add(place.name.lower())
+        if place.kind != CITY:
+            names.update(other.name.lower() for other in resolver.places
+                         if other.kind == CITY and place.name in (other.state, other.country))
+    return names
+
+
+def _place_phrases(question: str, matcher, resolver) -> List[Tuple[str, set]]:
+    """(phrase, names it may stand for) for every place the question names.
+
+    Gazetteer places are found anywhere and bring their canonical names
+    ("bangalore" -> "bengaluru"); other "in X" phrases count too unless X is
+    a skill or a word like "total".
+    """
+    phrases = []
+    # The gazetteer only matches capitalised names
+    for _, _, mentions in resolver.find(question.title()):
+        for place_ids, qualifier in mentions:
+            if not qualifier:
+                shown = resolver.places[place_ids[0]].name.lower()
+                phrases.append((shown, _place_names(resolver, place_ids) | {shown}))
+    for match in LOCATION_PHRASE.finditer(question):
+        phrase = match.group(1).strip(" .'-")
+        if (not phrase or NOT_PLACE_WORDS & set(phrase.split()) or matcher.match(phrase)
+                or any(phrase == shown or phrase in names for shown, names in phrases)):
+            continue
+        phrases.append((phrase, {phrase}))
+    return phrases
+
+
+def _find_locations(question: str, frame: CandidateFrame, matcher) -> List[str]:
+    """Frame locations the question asks about.
+
+    A named place with no candidates is kept as is, so the frame filter
+    matches nothing and the answer is 0 rather than the whole pool.
+    """
+    found = []
+    for location in frame.locations:
+        if re.search(r'\b' + re.escape(location) + r'\b', question):
+            found.append(location)
+    # "new delhi" also contains "delhi"; keep the longer name only
+    found = [location for location in found
+             if not any(location != other and location in other for other in found)]
+
+    resolver = get_location_resolver()
+    # Stored locations under their canonical names too, e.g. "bangalore" as "bengaluru"
+    known = {}
+    for location in frame.locations:
+        place = resolver.resolve_place(location.title())
+        known[location] = {location, place.name.lower()} if place else {location}
+
+    for phrase, names in _place_phrases(question, matcher, resolver):
+        # "delhi" also finds candidates stored under "new delhi"
+        matched = [location for location, aliases in known.items()
+                   if aliases & names or re.search(r'\b' + re.escape(phrase) + r'\b', location)]
+        if not matched:
+            matched = [phrase]
+        found.extend(location for location in matched if location not in found)
+    return found
+
+
+def _find_experience(question: str) -> List[Tuple[str, float]]:
+    for pattern, build in EXPERIENCE_PATTERNS:
+        match = pattern.search(question)
+        if match:
+            return build(*(float(number) for number in match.groups()))
+    return []
+
+
+def parse_question(question: str, frame: CandidateFrame, matcher) -> ChatQuery:
+    """Read the intent, skills, locations and experience bounds from a question.
+
+    Skills come from the skills taxonomy matcher, locations from the
+    locations gazetteer and the locations already present in the frame.
+    """
+    text = question.lower()
+    skills = sorted(matcher.match(text))
+    experience = _find_experience(text)
+
+    if GROUP_BY_SKILL.search(text):
+        group_by = 'skill'
+    elif GROUP_BY_LOCATION.search(text):
+        group_by = 'location'
+    else:
+        group_by = None
+
+    if MEDIAN.search(text):
+        intent = 'median_experience'
+    elif AVERAGE.search(text):
+        intent = 'average_experience'
+    elif MAXIMUM.search(text) and not experience:
+        intent = 'max_experience'
+    elif MINIMUM.search(text) and not experience:
+        intent = 'min_experience'
+    else:
+        intent = 'count'
+
+    locations = _find_locations(text, frame, matcher)
+    return ChatQuery(
+        intent, skills,
+        match_all=not (len(skills) > 1 and ANY_OF.search(text)),
+        locations=locations,
+        experience=experience,
+        group_by=group_by,
+        understood=bool(skills or locations or experience or group_by
+                        or intent != 'count' or COUNT.search(text))
+    )
+
+
+def _format_groups(groups: List[Dict[str, Any]], with_experience: bool) -> str:
+    if with_experience:
+        return ', '.join(
+            f"{group['name']} ({group['mean_experience']:g} yrs avg, {group['count']})"
+            if group['mean_experience'] is not None else f"{group['name']} (no experience stated, {group['count']})"
+            for group in groups
+        )
+    return ', '.join(f"{group['name']} ({group['count']})" for group in groups)
+
+
+def answer_question(question: str, frame: CandidateFrame, matcher, top: int = 10) -> Dict[str, Any]:
+    """Answer an aggregate question about the pool with one vectorised frame query"""
+    query = parse_question(question, frame, matcher)
+    result = frame.aggregate(query.skills, query.match_all, query.locations, query.experience,
+                             query.group_by, top)
+    count = result['count']
+    stats = result['experience']
+    who = query.describe()
+
+    if query.intent == 'count' or (stats is None and count == 0):
+        answer = f"{count} {query.describe(count)}."
+    elif stats is None:
+        answer = f"None of the {count} {who} state their experience."
+    else:
+        label, key = {
+            'average_experience': ('Average', 'mean'),
+            'median_experience': ('Median', 'median'),
+            'max_experience': ('Maximum', 'max'),
+            'min_experience': ('Minimum', 'min')
+        }[query.intent]
+        answer = (f"{label} experience of {who} is {stats[key]:g} years "
+                  f"({result['with_experience']} of {count} state their experience).")
+
+    if result.get('groups'):
+        heading = 'By location' if query.group_by == 'location' else 'Top skills'
+        answer += f" {heading}: {_format_groups(result['groups'], query.intent != 'count')}."
+
+    return {'answer': answer, 'understood': query.understood, 'intent': query.intent,
+            'filters': query.filters(), 'group_by': query.group_by, 'result': result}
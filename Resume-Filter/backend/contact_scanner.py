@@ -0,0 +1,142 @@
+import os
+import re
+import logging
+from typing import List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Region used to interpret numbers written without a country code
+DEFAULT_PHONE_REGION = os.environ.get('RESUME_PHONE_REGION', 'IN')
+
+FAKE_EMAIL_MARKERS = ('example', 'test', 'sample', 'dummy', 'placeholder')
+
+# Emails are tried first so their domains are never mistaken for URLs or phones
+CONTACT_PATTERN = re.compile(
+    r'(?P<email>\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b)'
+    r'|(?P<url>'
+    r'(?:https?://)?(?:www\.)?linkedin\.com/in/[\w\-]+'
+    r'|(?:https?://)?(?:www\.)?github\.com/[\w\-]+'
+    r'|(?:https?://)?(?:www\.)?[\w\-]+\.(?:com|org|net|io|dev|me|in)/[\w\-/.]*'
+    r'|https?://[^\s,;()<>]+'
+    r')'
+    # Separators stay on one line, so a PIN code above a number is not glued onto it
+    r'|(?P<phone>(?<![\w+])\+?\(?\d[\d \t().-]{7,18}\d(?![\w]))',
+    re.IGNORECASE
+)
+NON_PHONE_CHARS = re.compile(r'[^\d+]')
+PHONE_GROUP = re.compile(r'\S+')
+# Runs of years such as "2015 - 2016 2017" look like digits but are date ranges
+YEAR_RUN = re.compile(r'^(?:(?:19|20)\d{2}[\s.\-–—]*)+$')
+
+
+class ContactInfo:
+    """Contact details found in one document"""
+
+    __slots__ = ('emails', 'phones', 'linkedin', 'github', 'urls')
+
+    def __init__(self):
+        self.emails: List[str] = []
+        self.phones: List[str] = []
+        self.linkedin: Optional[str] = None
+        self.github: Optional[str] = None
+        self.urls: List[str] = []
+
+    @property
+    def email(self) -> Optional[str]:
+        """First plausible email, skipping obvious template addresses"""
+        for email in self.emails:
+            if not any(fake in email.lower() for fake in FAKE_EMAIL_MARKERS):
+                return email
+        return self.emails[0] if self.emails else None
+
+    @property
+    def phone(self) -> Optional[str]:
+        return self.phones[0] if self.phones else None
+
+    def to_dict(self):
+        return {
+            'emails': self.emails,
+            'phones': self.phones,
+            'linkedin': self.linkedin,
+            'github': self.github,
+            'urls': self.urls
+        }
+
+
+class ContactScanner:
+    """Find emails, phones and profile URLs in a single pass over the text"""
+
+    def __init__(self, default_region: str = DEFAULT_PHONE_REGION):
+        self.default_region = default_region
+        try:
+            import phonenumbers
+            self._phonenumbers = phonenumbers
+        except ImportError:
+            logger.warning("⚠️  phonenumbers is not installed; phone numbers will not be normalised to E.164")
+            self._phonenumbers = None
+
+    def normalize_phone(self, candidate: str) -> Optional[str]:
+        """Return the number in E.164 form, or None if it is not a valid phone"""
+        digits = NON_PHONE_CHARS.sub('', candidate)
+        digit_count = len(digits.replace('+', ''))
+        if not 10 <= digit_count <= 15 or YEAR_RUN.match(candidate):
+            return None
+
+        if self._phonenumbers is None:
+            return digits
+
+        phonenumbers = self._phonenumbers
+        try:
+            number = phonenumbers.parse(candidate, None if digits.startswith('+') else self.default_region)
+        except phonenumbers.NumberParseException:
+            return None
+        if not phonenumbers.is_valid_number(number):
+            return None
+        return phonenumbers.format_number(number, phonenumbers.PhoneNumberFormat.E164)
+
+    def _match_phone(self, text: str, start: int, end: int) -> Tuple[Optional[str], int]:
+        """The first valid number among the space-separated groups of a candidate span,
+        e.g. the mobile in "600041 9876543210", and the offset to scan on from"""
+        groups = [(group.start(), group.end()) for group in PHONE_GROUP.finditer(text, start, end)]
+        for first in range(len(groups)):
+            for last in range(len(groups), first, -1):
+                phone = self.normalize_phone(text[groups[first][0]:groups[last - 1][1]])
+                if phone:
+                    return phone, groups[last - 1][1]
+        return None, end
+
+    def scan(self, text: str) -> ContactInfo:
+        info = ContactInfo()
+        seen = set()
+
+        position = 0
+        while True:
+            match = CONTACT_PATTERN.search(text, position)
+            if match is None:
+                break
+            position = match.end()
+            kind = match.lastgroup
+            value = match.group(kind).strip()
+
+            if kind == 'email':
+                if value.lower() not in seen:
+                    seen.add(value.lower())
+                    info.emails.append(value)
+            elif kind == 'url':
+                value = value.rstrip('.')
+                if value.lower() in seen:
+                    continue
+                seen.add(value.lower())
+                info.urls.append(value)
+                lower = value.lower()
+                if info.linkedin is None and 'linkedin.com/in/' in lower:
+                    info.linkedin = value
+                elif info.github is None and 'github.com/' in lower:
+                    info.github = value
+            else:
+                phone, position = self._match_phone(text, match.start(kind), match.end(kind))
+                if phone and phone not in seen:
+                    seen.add(phone)
+                    info.phones.append(phone)
+
+        return info
@@ -0,0 +1,87 @@
+import zipfile
+import xml.etree.ElementTree as ET
+from typing import Iterator, List
+
+DOCUMENT_PART = 'word/document.xml'
+
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+BODY = _W + 'body'
+PARAGRAPH = _W + 'p'
+TABLE = _W + 'tbl'
+ROW = _W + 'tr'
+CELL = _W + 'tc'
+TEXT = _W + 't'
+# Run-level elements that stand for whitespace
+RUN_BREAKS = {_W + 'tab': '\t', _W + 'br': '\n', _W + 'cr': '\n'}
+
+
+def _paragraph_text(paragraph) -> str:
+    parts = []
+    for element in paragraph.iter():
+        if element.tag == TEXT:
+            if element.text:
+                parts.append(element.text)
+        else:
+            brk = RUN_BREAKS.get(element.tag)
+            if brk:
+                parts.append(brk)
+    return ''.join(parts)
+
+
+def iter_docx_lines(file_path) -> Iterator[str]:
+    """Yield paragraph and table-row text in document order.
+
+    word/document.xml is streamed with iterparse and every finished block is
+    cleared, so memory stays flat however long the document is. A table row
+    becomes one line of its non-empty cells; vertically merged continuation
+    cells are empty in the XML and therefore never repeated.
+    """
+    body = None
+    open_rows: List[List[str]] = []
+    open_cells: List[List[str]] = []
+
+    with zipfile.ZipFile(file_path) as archive, archive.open(DOCUMENT_PART) as document:
+        for event, element in ET.iterparse(document, events=('start', 'end')):
+            tag = element.tag
+            if event == 'start':
+                if tag == CELL:
+                    open_cells.append([])
+                elif tag == ROW:
+                    open_rows.append([])
+                elif tag == BODY:
+                    body = element
+                continue
+
+            if tag == PARAGRAPH:
+                text = _paragraph_text(element)
+                element.clear()
+                if not text.strip():
+                    continue
+                if open_cells:
+                    open_cells[-1].append(text)
+                else:
+                    yield text
+            elif tag == CELL:
+                cell_text = '\n'.join(open_cells.pop()).strip()
+                if cell_text and open_rows:
+                    open_rows[-1].append(cell_text)
+            elif tag == ROW:
+                row_text = ' '.join(open_rows.pop())
+                if not row_text:
+                    continue
+                if open_cells:
+                    # Row of a table nested inside a cell
+                    open_cells[-1].append(row_text)
+                else:
+                    yield row_text
+            else:
+                continue
+
+            # Drop finished top-level blocks so the tree never holds the whole document
+            if body is not None and not open_cells:
+                body.clear()
+
+
+def extract_docx_text(file_path) -> str:
+    """Full DOCX text, one paragraph or table row per line"""
+    return '\n'.join(iter_docx_lines(file_path))
@@ -0,0 +1,199 @@
+import re
+from datetime import datetime
+from typing import List, Dict, Optional, Any, Iterable, Tuple
+
+MIN_YEAR = 1990
+MAX_STATED_YEARS = 50
+
+_MONTHS = (
+    r'jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?|'
+    r'sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?'
+)
+MONTH_NUMBERS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
+}
+
+# One pass finds every dated range: "Jan 2019 - Present", "2016 – 2018", "03/2020 to 06/2022"
+DATE_RANGE_PATTERN = re.compile(
+    rf'\b(?:(?P<m1>{_MONTHS})\.?,?\s+|(?P<n1>\d{{1,2}})[/.-])?(?P<y1>(?:19|20)\d{{2}})'
+    r'\s*(?:[-–—]+|to|till|until)\s*'
+    rf'(?:(?:(?P<m2>{_MONTHS})\.?,?\s+|(?P<n2>\d{{1,2}})[/.-])?(?P<y2>(?:19|20)\d{{2}})'
+    r'|(?P<present>present|current|now|till\s+date|to\s+date|date))',
+    re.IGNORECASE
+)
+
+# One pass finds every "N years" mention; context decides whether it states experience
+STATED_YEARS_PATTERN = re.compile(r'(\d+(?:\.\d+)?)\s*(\+)?\s*(?:years?|yrs?)\b', re.IGNORECASE)
+STATED_SUFFIX = re.compile(r'\s+(?:(?:of\s+)?(?:work\s+)?experience|in|of|with)\b', re.IGNORECASE)
+STATED_PREFIX = re.compile(r'(?:over|more\s+than)\s*$', re.IGNORECASE)
+
+# Sections whose date ranges are not employment
+EXCLUDED_SECTIONS = frozenset({'education', 'certifications'})
+
+
+def _month_index(year: int, month: int) -> int:
+    return year * 12 + (month - 1)
+
+
+def _format_month(index: int) -> str:
+    return f'{index // 12:04d}-{index % 12 + 1:02d}'
+
+
+def _parse_month(name: Optional[str], number: Optional[str]) -> Optional[int]:
+    if name:
+        return MONTH_NUMBERS[name[:3].lower()]
+    if number:
+        month = int(number)
+        return month if 1 <= month <= 12 else None
+    return None
+
+
+def _line_bounds(text: str, start: int, end: int) -> Tuple[int, int]:
+    line_start = text.rfind('\n', 0, start) + 1
+    line_end = text.find('\n', end)
+    return line_start, len(text) if line_end == -1 else line_end
+
+
+class EmploymentInterval:
+    """One dated range, stored as [start, end) month indexes.
+
+    A range ending in a named month includes that month, so "Jan 2019 - Dec 2019"
+    is 12 months and ends where a role starting "Jan 2020" begins. A year-only
+    end ("2016 - 2018") stops at the start of that year, and "present" at the
+    start of the current month.
+    """
+
+    __slots__ = ('start', 'end', 'is_current', 'context')
+
+    def __init__(self, start: int, end: int, is_current: bool = False, context: str = ''):
+        self.start = start
+        self.end = end
+        self.is_current = is_current
+        self.context = context
+
+    @property
+    def months(self) -> int:
+        return self.end - self.start
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'start': _format_month(self.start),
+            'end': 'present' if self.is_current else _format_month(self.end - 1),
+            'months': self.months,
+            'role': self.context
+        }
+
+    def __repr__(self):
+        return f"EmploymentInterval({_format_month(self.start)}..{_format_month(self.end)}, {self.context!r})"
+
+
+class EmploymentTimeline:
+    """Dated ranges from a resume merged into a non-overlapping timeline"""
+
+    def __init__(self, intervals: List[EmploymentInterval]):
+        self.intervals = sorted(intervals, key=lambda interval: (interval.start, interval.end))
+        self.merged = self._merge(self.intervals)
+
+    @staticmethod
+    def _merge(intervals: List[EmploymentInterval]) -> List[Tuple[int, int]]:
+        """Sorted interval union, O(n log n) including the sort"""
+        merged = []
+        for interval in intervals:
+            if merged and interval.start <= merged[-1][1]:
+                if interval.end > merged[-1][1]:
+                    merged[-1] = (merged[-1][0], interval.end)
+            else:
+                merged.append((interval.start, interval.end))
+        return merged
+
+    @property
+    def total_months(self) -> int:
+        return sum(end - start for start, end in self.merged)
+
+    @property
+    def total_years(self) -> float:
+        return round(self.total_months / 12, 1)
+
+    def roles(self) -> List[Dict[str, Any]]:
+        return [interval.to_dict() for interval in self.intervals]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'total_months': self.total_months,
+            'total_years': self.total_years,
+            'roles': self.roles(),
+            # Ends are shown as the last month counted
+            'periods': [{'start': _format_month(start), 'end': _format_month(end - 1)} for start, end in self.merged]
+        }
+
+    def __len__(self):
+        return len(self.intervals)
+
+
+def find_intervals(text: str, now: Optional[datetime] = None) -> List[EmploymentInterval]:
+    """Collect dated ranges from text in a single regex pass"""
+    now = now or datetime.now()
+    current_index = _month_index(now.year, now.month)
+    intervals = []
+
+    for match in DATE_RANGE_PATTERN.finditer(text):
+        start_year = int(match.group('y1'))
+        start_month = _parse_month(match.group('m1'), match.group('n1')) or 1
+        start = _month_index(start_year, start_month)
+
+        is_current = bool(match.group('present'))
+        if is_current:
+            end = current_index
+        else:
+            end_year = int(match.group('y2'))
+            end_month = _parse_month(match.group('m2'), match.group('n2'))
+            # A named end month is worked in full
+            end = _month_index(end_year, end_month) + 1 if end_month else _month_index(end_year, 1)
+
+        if not (MIN_YEAR <= start_year <= now.year) or start > end or end > current_index + 1:
+            continue
+
+        line_start, line_end = _line_bounds(text, match.start(), match.end())
+        context = (text[line_start:match.start()] + ' ' + text[match.end():line_end]).strip(' \t|,-–—()')
+        if not context and line_start > 0:
+            # Dates on their own line usually follow the role line
+            previous_start, _ = _line_bounds(text, line_start - 1, line_start - 1)
+            context = text[previous_start:line_start - 1].strip()
+        intervals.append(EmploymentInterval(start, end, is_current, ' '.join(context.split())))
+
+    return intervals
+
+
+def build_timeline(text: str, sections: Optional[Iterable] = None,
+                   now: Optional[datetime] = None) -> EmploymentTimeline:
+    """Build a timeline, skipping education-like sections when sections are given"""
+    if sections is None:
+        return EmploymentTimeline(find_intervals(text, now))
+
+    intervals = []
+    for section in sections:
+        if section.name not in EXCLUDED_SECTIONS:
+            intervals.extend(find_intervals(section.text, now))
+    return EmploymentTimeline(intervals)
+
+
+def stated_years(text: str) -> Optional[float]:
+    """Largest explicitly stated experience, e.g. '5+ years of experience'"""
+    best = None
+    for match in STATED_YEARS_PATTERN.finditer(text):
+        value = float(match.group(1))
+        if not 0 <= value <= MAX_STATED_YEARS:
+            continue
+
+        line_start = text.rfind('\n', 0, match.start()) + 1
+        before = text[line_start:match.start()]
+        accepted = (
+            match.group(2) is not None
+            or STATED_SUFFIX.match(text, match.end()) is not None
+            or 'experience' in before.lower()
+            or STATED_PREFIX.search(before) is not None
+        )
+        if accepted and (best is None or value > best):
+            best = value
+    return best
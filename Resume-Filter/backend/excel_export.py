@@ -1,11 +1,11 @@
-import pandas as pd
-import openpyxl
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-from openpyxl.utils.dataframe import dataframe_to_rows
 from datetime import datetime
+from skill_index import SkillIndex
 
 class ExcelExporter:
     def __init__(self):
+        # pandas/openpyxl are imported here so importing this module stays cheap
+        from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+
         self.header_style = {
             'font': Font(bold=True, color='FFFFFF'),
             'fill': PatternFill(start_color='366092', end_color='366092', fill_type='solid'),
@@ -31,6 +31,8 @@ class ExcelExporter:
     def export_to_excel(self, parsed_resumes, output_file):
         """Export parsed resume data to Excel with formatting"""
         try:
+            import pandas as pd
+
             # Prepare data for DataFrame
             df_data = []
             
@@ -169,17 +171,8 @@ class ExcelExporter:
         """Create a skills analysis sheet"""
         skills_sheet = workbook.create_sheet('Skills Analysis')
         
-        # Collect all skills
-        skills_count = {}
-        for resume in parsed_resumes:
-            skills = resume.get('skills', [])
-            if skills:
-                for skill in skills:
-                    skill_lower = skill.lower()
-                    skills_count[skill_lower] = skills_count.get(skill_lower, 0) + 1
-        
-        # Sort skills by frequency
-        sorted_skills = sorted(skills_count.items(), key=lambda x: x[1], reverse=True)
+        # Count skills with the same index that serves /skills/top, one count per exported row
+        sorted_skills = SkillIndex.from_records(parsed_resumes, by_position=True).top(50)
         
         # Add headers
         skills_sheet['A1'] = 'Skill'
@@ -187,12 +180,10 @@ class ExcelExporter:
         skills_sheet['C1'] = 'Percentage'
         
         # Add top skills (limit to top 50)
-        total_resumes = len(parsed_resumes)
-        for i, (skill, count) in enumerate(sorted_skills[:50], 2):
-            skills_sheet[f'A{i}'] = skill.title()
-            skills_sheet[f'B{i}'] = count
-            percentage = (count / total_resumes * 100) if total_resumes > 0 else 0
-            skills_sheet[f'C{i}'] = f"{percentage:.1f}%"
+        for i, entry in enumerate(sorted_skills, 2):
+            skills_sheet[f'A{i}'] = entry['skill']
+            skills_sheet[f'B{i}'] = entry['count']
+            skills_sheet[f'C{i}'] = f"{entry['percentage']:.1f}%"
         
         # Format skills sheet
         for cell in skills_sheet[1]:
@@ -0,0 +1,170 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+import threading
+import zlib
+import logging
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from flask import send_file
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MIN_BYTES = 1024
+DEFAULT_LEVEL = 6
+# Preference order when the client accepts both equally
+ENCODINGS = ('gzip', 'deflate')
+COMPRESSIBLE_MIMETYPES = frozenset({
+    'application/json', 'application/x-ndjson', 'text/plain', 'text/csv', 'text/html'
+})
+# Download types worth keeping a .gz copy of; xlsx and zip are compressed already
+PRECOMPRESSIBLE_EXTENSIONS = frozenset({'.json', '.ndjson', '.csv', '.txt'})
+GZIP_SUFFIX = '.gz'
+READ_CHUNK_SIZE = 64 * 1024
+# Compressed JSON bodies kept so a repeated fetch of unchanged results is not recompressed
+BODY_CACHE_SIZE = 32
+
+
+def compress(body: bytes, encoding: str, level: int = DEFAULT_LEVEL) -> bytes:
+    """Deterministic gzip or zlib-wrapped deflate, so a strong ETag stays valid for Range requests"""
+    if encoding == 'gzip':
+        return gzip.compress(body, compresslevel=level, mtime=0)
+    return zlib.compress(body, level)
+
+
+def choose_encoding(request) -> Optional[str]:
+    """Best content coding the client accepts, or None for identity"""
+    return request.accept_encodings.best_match(ENCODINGS)
+
+
+def content_etag(body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest()[:32]
+
+
+class _FileDigests:
+    """Content hashes of files, recomputed only when size or mtime change"""
+
+    def __init__(self):
+        self._digests: Dict[str, Tuple[int, int, str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, path: str) -> str:
+        stat = os.stat(path)
+        with self._lock:
+            cached = self._digests.get(path)
+        if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            return cached[2]
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(READ_CHUNK_SIZE), b''):
+                digest.update(chunk)
+        etag = digest.hexdigest()[:32]
+        with self._lock:
+            self._digests[path] = (stat.st_mtime_ns, stat.st_size, etag)
+        return etag
+
+
+_file_digests = _FileDigests()
+_body_cache: 'OrderedDict[Tuple[str, str], bytes]' = OrderedDict()
+_body_cache_lock = threading.Lock()
+
+
+def _compressed_body(etag: str, body: bytes, encoding: str, level: int) -> bytes:
+    key = (etag, encoding)
+    with _body_cache_lock:
+        cached = _body_cache.get(key)
+        if cached is not None:
+            _body_cache.move_to_end(key)
+            return cached
+    compressed = compress(body, encoding, level)
+    with _body_cache_lock:
+        _body_cache[key] = compressed
+        while len(_body_cache) > BODY_CACHE_SIZE:
+            _body_cache.popitem(last=False)
+    return compressed
+
+
+def precompressed_path(path: str, level: int = DEFAULT_LEVEL) -> Optional[str]:
+    """A current <path>.gz next to the file, written on first use; None if it cannot be made"""
+    gz_path = path + GZIP_SUFFIX
+    try:
+        if os.path.getmtime(gz_path) >= os.path.getmtime(path):
+            return gz_path
+    except FileNotFoundError:
+        pass
+    temp_path = f'{gz_path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    try:
+        with open(path, 'rb') as source, open(temp_path, 'wb') as raw:
+            with gzip.GzipFile(filename='', mode='wb', fileobj=raw, compresslevel=level, mtime=0) as target:
+                for chunk in iter(lambda: source.read(READ_CHUNK_SIZE), b''):
+                    target.write(chunk)
+        os.replace(temp_path, gz_path)
+        return gz_path
+    except OSError as e:
+        logger.warning(f"Could not pre-compress {path}: {str(e)}")
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        return None
+
+
+def send_download(request, path: str, download_name: str, min_bytes: int = DEFAULT_MIN_BYTES,
+                  level: int = DEFAULT_LEVEL):
+    """send_file with a content-hash ETag, 304/206 handling and a gzip copy when accepted.
+
+    The ETag of the gzip copy differs from the original's, as a strong
+    validator must for a different representation; Range requests then
+    address bytes of whichever representation is served.
+    """
+    mimetype = mimetypes.guess_type(download_name)[0] or 'application/octet-stream'
+    compressible = (os.path.splitext(download_name)[1].lower() in PRECOMPRESSIBLE_EXTENSIONS
+                    and os.path.getsize(path) >= min_bytes)
+    served_path, etag, encoding = path, _file_digests.get(path), None
+    if compressible and request.accept_encodings.best_match(('gzip',)) == 'gzip':
+        gz_path = precompressed_path(path, level)
+        if gz_path:
+            served_path, etag, encoding = gz_path, f'{etag}-gzip', 'gzip'
+
+    response = send_file(os.path.abspath(served_path), mimetype=mimetype, as_attachment=True,
+                         download_name=download_name, etag=etag, conditional=True)
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    if compressible:
+        response.vary.add('Accept-Encoding')
+    # Cache, but revalidate with the ETag before reuse
+    response.cache_control.no_cache = True
+    return response
+
+
+def finalize_response(request, response, min_bytes: int = DEFAULT_MIN_BYTES, level: int = DEFAULT_LEVEL):
+    """Compress large text responses and make GET responses conditional.
+
+    GET responses get a strong ETag over their content, so an unchanged
+    /results answers If-None-Match with 304, and Range with 206.
+    Streamed and already-encoded responses (send_file) pass through.
+    """
+    if (response.direct_passthrough or response.is_streamed or response.status_code != 200
+            or 'Content-Encoding' in response.headers):
+        return response
+    cacheable = request.method in ('GET', 'HEAD')
+    compressible = (response.mimetype in COMPRESSIBLE_MIMETYPES and response.content_length is not None
+                    and response.content_length >= min_bytes)
+    if not (cacheable or compressible):
+        return response
+
+    body = response.get_data()
+    etag = content_etag(body) if cacheable else None
+    if compressible:
+        response.vary.add('Accept-Encoding')
+        encoding = choose_encoding(request)
+        if encoding:
+            response.set_data(_compressed_body(etag, body, encoding, level) if etag
+                              else compress(body, encoding, level))
+            response.headers['Content-Encoding'] = encoding
+            etag = f'{etag}-{encoding}' if etag else None
+    if etag:
+        response.set_etag(etag)
+        response.cache_control.no_cache = True
+        response.make_conditional(request, accept_ranges=True, complete_length=response.content_length)
+    return response
@@ -0,0 +1,247 @@
+import codecs
+import hashlib
+import io
+import mmap
+import os
+import zipfile
+import logging
+from contextlib import contextmanager
+from typing import Optional, Iterator, Union
+
+logger = logging.getLogger(__name__)
+
+# Files at least this large are memory-mapped instead of read into a bytes object
+MMAP_THRESHOLD = 1024 * 1024  # 1MB
+# ZIP members larger than this (uncompressed) are skipped rather than inflated
+MAX_ARCHIVE_MEMBER_BYTES = 16 * 1024 * 1024  # 16MB
+
+SUPPORTED_FORMATS = ('pdf', 'docx', 'txt')
+PDF_MAGIC = b'%PDF-'
+ZIP_MAGIC = b'PK\x03\x04'
+OLE_MAGIC = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'  # legacy .doc/.xls
+DOCX_PART = 'word/document.xml'
+# Some generators emit junk before the header; readers accept it within the first 1KB
+PDF_HEADER_WINDOW = 1024
+TEXT_SNIFF_BYTES = 4096
+BOMS = (
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16')
+)
+
+
+def _bom_encoding(head: bytes) -> Optional[str]:
+    for bom, encoding in BOMS:
+        if head.startswith(bom):
+            return encoding
+    return None
+
+
+def _looks_like_text(head: bytes) -> bool:
+    if _bom_encoding(head):
+        return True
+    if b'\x00' in head:
+        return False
+    # Allow tabs/newlines/form feeds; many other control bytes mean binary data
+    control = sum(1 for byte in head if byte < 32 and byte not in (9, 10, 12, 13))
+    return control <= len(head) // 100
+
+
+def sniff_format(data) -> str:
+    """Detect the document format from its leading bytes, not its file name.
+
+    Returns 'pdf', 'docx', 'zip' (any other archive), 'txt', 'doc' or 'unknown'.
+    """
+    head = bytes(data[:PDF_HEADER_WINDOW])
+    if head.startswith(ZIP_MAGIC):
+        try:
+            with _BufferReader(data) as reader, zipfile.ZipFile(reader) as archive:
+                return 'docx' if DOCX_PART in archive.NameToInfo else 'zip'
+        except zipfile.BadZipFile:
+            return 'unknown'
+    if PDF_MAGIC in head:
+        return 'pdf'
+    if head.startswith(OLE_MAGIC):
+        return 'doc'
+    if _looks_like_text(head[:TEXT_SNIFF_BYTES]):
+        return 'txt'
+    return 'unknown'
+
+
+def decode_text(data) -> str:
+    """Decode text once: BOM, then strict UTF-8, then cp1252, then latin-1"""
+    encoding = _bom_encoding(bytes(data[:4]))
+    if encoding:
+        return str(data, encoding, 'replace')
+    try:
+        return str(data, 'utf-8')
+    except UnicodeDecodeError:
+        pass
+    try:
+        # Windows-authored resumes are the common non-UTF-8 case
+        return str(data, 'cp1252')
+    except UnicodeDecodeError:
+        # latin-1 maps every byte, so this never fails
+        return str(data, 'latin-1')
+
+
+class _BufferReader(io.RawIOBase):
+    """Seekable read-only stream over a buffer without copying it"""
+
+    def __init__(self, data):
+        self._view = memoryview(data)
+        self._position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, buffer):
+        chunk = self._view[self._position:self._position + len(buffer)]
+        size = len(chunk)
+        buffer[:size] = chunk
+        self._position += size
+        return size
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        self._position = max(0, offset)
+        return self._position
+
+    def tell(self):
+        return self._position
+
+    def close(self):
+        # Release the view so a backing mmap can be closed
+        self._view.release()
+        super().close()
+
+
+class Document:
+    """One input held in a single buffer (bytes or mmap) with its sniffed format"""
+
+    def __init__(self, data, name: str, path: Optional[str] = None, mapping: Optional[mmap.mmap] = None):
+        self.data = data
+        self.name = name
+        self.path = path
+        self._mapping = mapping
+        self._text = None
+        self._digest = None
+        self.file_type = sniff_format(data)
+
+    @property
+    def size(self) -> int:
+        return len(self.data)
+
+    @property
+    def extension(self) -> str:
+        return os.path.splitext(self.name)[1].lower().lstrip('.')
+
+    def stream(self) -> io.BufferedReader:
+        """A fresh binary stream over the buffer, for readers that want a file object"""
+        return io.BufferedReader(_BufferReader(self.data))
+
+    def text(self) -> str:
+        """The buffer decoded as text, decoded at most once"""
+        if self._text is None:
+            self._text = decode_text(self.data)
+        return self._text
+
+    def digest(self) -> str:
+        """SHA-256 of the contents, as results_log.file_digest computes for files"""
+        if self._digest is None:
+            self._digest = hashlib.sha256(self.data).hexdigest()
+        return self._digest
+
+    def close(self):
+        if self._mapping is not None:
+            try:
+                self._mapping.close()
+            except BufferError:
+                # A stream still references the mapping; it is released with that stream
+                pass
+            self._mapping = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __repr__(self):
+        return f"Document(name={self.name!r}, file_type={self.file_type!r}, size={self.size})"
+
+
+Source = Union[str, os.PathLike, bytes, bytearray, memoryview, io.IOBase, Document]
+
+
+def open_document(source: Source, name: Optional[str] = None) -> Document:
+    """Load a path, bytes or binary file-like object into a Document.
+
+    Paths are read once, or memory-mapped when at least MMAP_THRESHOLD bytes.
+    An existing Document is returned unchanged.
+    """
+    if isinstance(source, Document):
+        return source
+
+    if isinstance(source, (str, os.PathLike)):
+        path = os.fspath(source)
+        name = name or os.path.basename(path)
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size >= MMAP_THRESHOLD:
+                mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                return Document(mapping, name, path, mapping)
+            return Document(f.read(), name, path)
+
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return Document(source, name or 'document')
+
+    if hasattr(source, 'read'):
+        name = name or os.path.basename(getattr(source, 'filename', None) or getattr(source, 'name', None) or 'document')
+        return Document(source.read(), name)
+
+    raise TypeError(f"Cannot read a document from {type(source).__name__}")
+
+
+@contextmanager
+def opened_document(source: Source, name: Optional[str] = None) -> Iterator[Document]:
+    """open_document as a context manager that only closes documents it opened itself"""
+    document = open_document(source, name)
+    try:
+        yield document
+    finally:
+        if document is not source:
+            document.close()
+
+
+def iter_archive_documents(source: Source, name: Optional[str] = None,
+                           max_member_bytes: int = MAX_ARCHIVE_MEMBER_BYTES) -> Iterator[Document]:
+    """Yield each supported member of a ZIP archive as an in-memory Document"""
+    owned = not isinstance(source, Document)
+    archive_document = open_document(source, name)
+    try:
+        with archive_document.stream() as stream, zipfile.ZipFile(stream) as archive:
+            for info in archive.infolist():
+                member_name = os.path.basename(info.filename)
+                if info.is_dir() or not member_name or member_name.startswith('.') or '__MACOSX' in info.filename:
+                    continue
+                if info.file_size > max_member_bytes:
+                    logger.warning(f"Skipping {info.filename} in {archive_document.name}: "
+                                   f"{info.file_size} bytes exceeds {max_member_bytes}")
+                    continue
+                document = Document(archive.read(info), member_name)
+                if document.file_type in SUPPORTED_FORMATS:
+                    yield document
+                else:
+                    logger.warning(f"Skipping {info.filename} in {archive_document.name}: unsupported format")
+    finally:
+        if owned:
+            archive_document.close()
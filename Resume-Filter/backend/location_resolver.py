@@ -0,0 +1,277 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import logging
+from functools import lru_cache
+from typing import List, Dict, Optional, Any, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_GAZETTEER_PATH = os.environ.get('RESUME_LOCATIONS_GAZETTEER',
+                                        os.path.join(BACKEND_DIR, 'locations_gazetteer.json'))
+
+TOKEN_PATTERN = re.compile(r'[A-Za-z]+')
+# Trie key marking the end of a name; tokens never contain it
+TERM_END = '\0'
+# Lines that introduce the candidate's own location rather than an employer's or a college's
+LOCATION_LABEL = re.compile(
+    r'\b(?:address|location|city|residence|based\s+in|lives?\s+in|hometown|native|place)\b', re.IGNORECASE
+)
+# A label on its own line ("Address:") applies to this many following lines
+LABEL_REACH = 2
+# Scanned lines are memoised; contact headers and address lines repeat across a batch
+LINE_CACHE_SIZE = 4096
+
+CITY = 'city'
+STATE = 'state'
+COUNTRY = 'country'
+SPECIFICITY = {CITY: 0, STATE: 1, COUNTRY: 2}
+
+# (place ids for one name, qualifier_only) found in a line
+Mention = Tuple[Tuple[int, ...], bool]
+
+
+class Place:
+    __slots__ = ('kind', 'name', 'state', 'country')
+
+    def __init__(self, kind: str, name: str, state: Optional[str], country: str):
+        self.kind = kind
+        self.name = name
+        self.state = state
+        self.country = country
+
+    def format(self) -> str:
+        """Normalised display form: "City, State", "City, Country", "State, Country" or "Country" """
+        if self.kind == CITY:
+            region = self.state if self.state and self.state != self.name else self.country
+            return f'{self.name}, {region}' if region != self.name else self.name
+        if self.kind == STATE:
+            return f'{self.name}, {self.country}'
+        return self.name
+
+    def __repr__(self):
+        return f'Place({self.format()!r})'
+
+
+class LocationResolver:
+    """Gazetteer of cities, states and countries compiled into a token trie.
+
+    resolve() scans a document once, line by line, matching the longest
+    name at each token, and picks the candidate's own location: lines
+    labelled "Address", "Location" and the like come first, then the
+    earliest city whose state or country the rest of the document names
+    (regions on the first line alone do not count), then the
+    earliest mention below the first line, which usually holds the name.
+    Names shared by several places are settled by the states and
+    countries mentioned on the same line, then in the document.
+    Two-letter codes such as "TN" or "CA" only count right after a name
+    ("Chennai, TN"), and names must be capitalised, so words like "erode"
+    in running text are not places.
+    """
+
+    def __init__(self, version: str, gazetteer_hash: str, places: List[Place],
+                 trie: Dict[str, Any], abbreviations: Dict[str, Tuple[int, ...]], term_count: int):
+        self.version = version
+        self.gazetteer_hash = gazetteer_hash
+        self.places = places
+        self.trie = trie
+        self.abbreviations = abbreviations
+        self.term_count = term_count
+        self._scan_line = lru_cache(maxsize=LINE_CACHE_SIZE)(self._scan_line_uncached)
+
+    @classmethod
+    def compile(cls, gazetteer: Dict[str, Any], gazetteer_hash: str) -> 'LocationResolver':
+        """Build the resolver from a parsed gazetteer document"""
+        countries = gazetteer.get('countries')
+        if not isinstance(countries, dict):
+            raise ValueError("Locations gazetteer must have a 'countries' object")
+
+        places: List[Place] = []
+        names: Dict[Tuple[str, ...], List[int]] = {}
+        abbreviations: Dict[str, List[int]] = {}
+
+        def add(place: Place, entry: Dict[str, Any], aliases=()):
+            place_id = len(places)
+            places.append(place)
+            for term in [place.name] + list(aliases) + list(entry.get('aliases') or []):
+                tokens = tuple(token.lower() for token in TOKEN_PATTERN.findall(term))
+                if tokens and place_id not in names.setdefault(tokens, []):
+                    names[tokens].append(place_id)
+            for code in entry.get('abbreviations') or []:
+                abbreviations.setdefault(code, []).append(place_id)
+
+        for country, country_entry in countries.items():
+            add(Place(COUNTRY, country, None, country), country_entry)
+            for state, state_entry in (country_entry.get('states') or {}).items():
+                add(Place(STATE, state, state, country), state_entry)
+                for city, aliases in (state_entry.get('cities') or {}).items():
+                    add(Place(CITY, city, state, country), {}, aliases)
+            for city, aliases in (country_entry.get('cities') or {}).items():
+                add(Place(CITY, city, None, country), {}, aliases)
+
+        trie: Dict[str, Any] = {}
+        for tokens, place_ids in names.items():
+            node = trie
+            for token in tokens:
+                node = node.setdefault(token, {})
+            # Most specific first, gazetteer order within a kind: "Delhi" is the city before the territory
+            node[TERM_END] = tuple(sorted(place_ids, key=lambda place_id: SPECIFICITY[places[place_id].kind]))
+
+        return cls(str(gazetteer.get('version', 'unversioned')), gazetteer_hash, places, trie,
+                   {code: tuple(place_ids) for code, place_ids in abbreviations.items()}, len(names))
+
+    def _scan_line_uncached(self, line: str) -> Tuple[Mention, ...]:
+        """Leftmost-longest gazetteer matches in one line"""
+        tokens = TOKEN_PATTERN.findall(line)
+        count = len(tokens)
+        mentions = []
+        previous_end = -1
+        start = 0
+        while start < count:
+            node = self.trie.get(tokens[start].lower()) if tokens[start][0].isupper() else None
+            position = start + 1
+            match, match_end = None, start + 1
+            while node is not None:
+                place_ids = node.get(TERM_END)
+                if place_ids is not None:
+                    match, match_end = place_ids, position
+                if position >= count:
+                    break
+                node = node.get(tokens[position].lower())
+                position += 1
+            if match is not None:
+                mentions.append((match, False))
+                previous_end = match_end
+            elif start == previous_end and tokens[start] in self.abbreviations:
+                # "Pune, MH": a code qualifies the name before it
+                mentions.append((self.abbreviations[tokens[start]], True))
+                previous_end = match_end
+            start = match_end
+        return tuple(mentions)
+
+    def _regions(self, mentions: List[Mention]) -> Set[str]:
+        """State and country names a line's mentions could refer to"""
+        regions = set()
+        for place_ids, _ in mentions:
+            for place_id in place_ids:
+                place = self.places[place_id]
+                if place.kind != CITY:
+                    regions.add(place.name)
+        return regions
+
+    def _choose(self, place_ids: Tuple[int, ...], line_regions: Set[str],
+                document_regions: Set[str]) -> Place:
+        candidates = [self.places[place_id] for place_id in place_ids]
+        if len(candidates) > 1:
+            for regions in (line_regions, document_regions):
+                for place in candidates:
+                    if ({place.state, place.country} - {place.name, None}) & regions:
+                        return place
+        return candidates[0]
+
+    def find(self, text: str) -> List[Tuple[int, bool, List[Mention]]]:
+        """(line number, labelled, mentions) for every line naming a place"""
+        found = []
+        labelled_until = -1
+        for number, line in enumerate(text.splitlines()):
+            if LOCATION_LABEL.search(line):
+                labelled_until = number + LABEL_REACH
+            mentions = self._scan_line(line) if line.strip() else ()
+            if any(not qualifier for _, qualifier in mentions):
+                found.append((number, number <= labelled_until, list(mentions)))
+        return found
+
+    def _qualified(self, mentions: List[Mention], document_regions: Set[str]) -> bool:
+        """Whether a line names a city whose state or country the document also names"""
+        for place_ids, qualifier in mentions:
+            if qualifier:
+                return True
+            for place_id in place_ids:
+                place = self.places[place_id]
+                if place.kind == CITY and ({place.state, place.country} - {place.name, None}) & document_regions:
+                    return True
+        return False
+
+    def resolve_place(self, text: str) -> Optional[Place]:
+        lines = self.find(text)
+        if not lines:
+            return None
+        # The first line is usually the candidate's name: a bare "Victoria" or "Washington"
+        # there only counts when the document has nothing else, and "Sam Delhi" must not
+        # qualify a Delhi mentioned further down
+        numbered = [number for number, line in enumerate(text.splitlines()) if line.strip()]
+        document_regions, qualifying_regions = set(), set()
+        for number, _, mentions in lines:
+            regions = self._regions(mentions)
+            document_regions |= regions
+            if number != numbered[0]:
+                qualifying_regions |= regions
+
+        chosen = (next((line for line in lines if line[1]), None)
+                  or next((line for line in lines if self._qualified(line[2], qualifying_regions)), None)
+                  or next((line for line in lines if line[0] != numbered[0]), None)
+                  or (lines[0] if len(numbered) == 1 else None))
+        if chosen is None:
+            return None
+        _, _, mentions = chosen
+        line_regions = self._regions(mentions)
+        places = [self._choose(place_ids, line_regions, document_regions)
+                  for place_ids, qualifier in mentions if not qualifier]
+        return min(places, key=lambda place: SPECIFICITY[place.kind])
+
+    def resolve(self, text: str) -> Optional[str]:
+        """The candidate's location in normalised form, e.g. "Chennai, Tamil Nadu" """
+        place = self.resolve_place(text)
+        return place.format() if place else None
+
+    def stats(self) -> Dict[str, Any]:
+        cache = self._scan_line.cache_info()
+        return {
+            'version': self.version,
+            'gazetteer_hash': self.gazetteer_hash,
+            'places': len(self.places),
+            'terms': self.term_count,
+            'line_cache_hits': cache.hits,
+            'line_cache_misses': cache.misses
+        }
+
+
+def load_location_resolver(path: str = DEFAULT_GAZETTEER_PATH) -> LocationResolver:
+    with open(path, 'rb') as f:
+        raw = f.read()
+    try:
+        gazetteer = json.loads(raw.decode('utf-8'))
+    except ValueError as e:
+        raise ValueError(f"Invalid locations gazetteer {path}: {str(e)}")
+    resolver = LocationResolver.compile(gazetteer, hashlib.sha256(raw).hexdigest())
+    logger.info(f"✅ Compiled locations gazetteer {resolver.version} ({resolver.term_count} names)")
+    return resolver
+
+
+# The resolver is shared by every ResumeParser in the process
+_resolver_lock = threading.Lock()
+_resolver_state: Dict[str, Any] = {'resolver': None}
+
+
+def _after_fork():
+    # A preload thread may hold the lock while a parse worker forks
+    global _resolver_lock
+    _resolver_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_after_fork)
+
+
+def get_location_resolver() -> LocationResolver:
+    """Return the shared resolver, compiling the gazetteer on first use"""
+    resolver = _resolver_state['resolver']
+    if resolver is not None:
+        return resolver
+    with _resolver_lock:
+        if _resolver_state['resolver'] is None:
+            _resolver_state['resolver'] = load_location_resolver()
+        return _resolver_state['resolver']
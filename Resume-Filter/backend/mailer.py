@@ -0,0 +1,549 @@
+import json
+import os
+import re
+import smtplib
+import ssl
+import threading
+import time
+import uuid
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from email.message import EmailMessage
+from email.utils import formataddr, formatdate, make_msgid
+from functools import lru_cache
+from queue import LifoQueue, Empty
+from typing import List, Dict, Optional, Any, Iterator, Iterable, Callable, Tuple
+
+import metrics
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_JOBS_DIR = os.path.join('results', 'mail_jobs')
+# Messages sent on one connection before it is replaced; many servers cap this
+DEFAULT_MESSAGES_PER_CONNECTION = 100
+# A pooled connection idle for longer is checked with NOOP before reuse
+IDLE_CHECK_SECONDS = 30
+MAX_ATTEMPTS = 3
+RETRY_BACKOFF_SECONDS = 1.0
+# Progress is written to the job file at most this often (and always at the end)
+PROGRESS_WRITE_SECONDS = 0.5
+MAX_JOBS_IN_MEMORY = 100
+
+EMAIL_PATTERN = re.compile(r'^[^\s@]+@[^\s@]+\.[^\s@]+$')
+# "{{ name }}" placeholders, plus the "[Name]" form MailTemplatePage uses
+PLACEHOLDER = re.compile(r'\{\{\s*([A-Za-z_][A-Za-z0-9_ ]*?)\s*\}\}|\[([A-Za-z][A-Za-z ]*)\]')
+
+# Candidate fields available to templates; placeholder names are matched case-insensitively
+TEMPLATE_FIELDS = {
+    'name': lambda candidate: candidate.get('name') or 'Candidate',
+    'first_name': lambda candidate: (candidate.get('name') or 'Candidate').split(' ')[0],
+    'email': lambda candidate: candidate.get('email') or '',
+    'phone': lambda candidate: candidate.get('phone_number') or '',
+    'phone_number': lambda candidate: candidate.get('phone_number') or '',
+    'location': lambda candidate: candidate.get('location') or '',
+    'skills': lambda candidate: ', '.join(candidate.get('skills') or []),
+    'education': lambda candidate: ', '.join(candidate.get('education') or []),
+    'experience': lambda candidate: (f"{candidate['total_experience']:g}"
+                                     if isinstance(candidate.get('total_experience'), (int, float)) else ''),
+    'total_experience': lambda candidate: (f"{candidate['total_experience']:g}"
+                                           if isinstance(candidate.get('total_experience'), (int, float)) else '')
+}
+
+# The templates MailTemplatePage offers
+MAIL_TEMPLATES = {
+    'positive': {
+        'subject': 'Your application',
+        'body': "Hi [Name],\n\nGreat news! You've been accepted. Welcome aboard!\n\nBest,\nTeam"
+    },
+    'negative': {
+        'subject': 'Your application',
+        'body': "Hi [Name],\n\nWe regret to inform you that you were not selected.\n\nRegards,\nTeam"
+    },
+    'info': {
+        'subject': 'Your application',
+        'body': "Hi [Name],\n\nHere is some important information regarding your application.\n\nThanks,\nTeam"
+    }
+}
+
+STATUS_PENDING = 'pending'
+STATUS_SENT = 'sent'
+STATUS_FAILED = 'failed'
+STATUS_SKIPPED = 'skipped'
+STATUS_CANCELLED = 'cancelled'
+
+MAILS_SENT = metrics.REGISTRY.counter(
+    'resume_mailer_messages_total', 'Broadcast messages by delivery outcome', ('status',)
+)
+SEND_SECONDS = metrics.REGISTRY.histogram(
+    'resume_mailer_send_seconds', 'SMTP time per delivered message'
+)
+
+
+def _env_flag(name: str, default: str = '0') -> bool:
+    return os.environ.get(name, default).lower() in ('1', 'true', 'yes', 'on')
+
+
+class SmtpSettings:
+    """SMTP server, credentials and delivery limits"""
+
+    def __init__(self, host: str = 'localhost', port: int = 25, username: Optional[str] = None,
+                 password: Optional[str] = None, use_ssl: bool = False, starttls: bool = False,
+                 sender: str = 'no-reply@localhost', timeout: float = 30,
+                 concurrency: int = 4, rate_per_second: float = 10,
+                 messages_per_connection: int = DEFAULT_MESSAGES_PER_CONNECTION):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_ssl = use_ssl
+        self.starttls = starttls
+        self.sender = sender
+        self.timeout = timeout
+        # Parallel SMTP connections, i.e. messages in flight
+        self.concurrency = max(1, concurrency)
+        # Messages per second across all connections; 0 disables rate limiting
+        self.rate_per_second = rate_per_second
+        self.messages_per_connection = messages_per_connection
+
+    @classmethod
+    def from_env(cls) -> 'SmtpSettings':
+        use_ssl = _env_flag('SMTP_SSL')
+        return cls(
+            host=os.environ.get('SMTP_HOST', 'localhost'),
+            port=int(os.environ.get('SMTP_PORT', '465' if use_ssl else '25')),
+            username=os.environ.get('SMTP_USERNAME') or None,
+            password=os.environ.get('SMTP_PASSWORD') or None,
+            use_ssl=use_ssl,
+            starttls=_env_flag('SMTP_STARTTLS'),
+            sender=os.environ.get('MAIL_FROM', 'no-reply@localhost'),
+            timeout=float(os.environ.get('SMTP_TIMEOUT', '30')),
+            concurrency=int(os.environ.get('MAIL_CONCURRENCY', '4')),
+            rate_per_second=float(os.environ.get('MAIL_RATE_PER_SECOND', '10')),
+            messages_per_connection=int(os.environ.get('MAIL_MESSAGES_PER_CONNECTION',
+                                                       str(DEFAULT_MESSAGES_PER_CONNECTION)))
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Settings safe to show to clients (no password)"""
+        return {
+            'host': self.host, 'port': self.port, 'ssl': self.use_ssl, 'starttls': self.starttls,
+            'authenticated': bool(self.username), 'sender': self.sender,
+            'concurrency': self.concurrency, 'rate_per_second': self.rate_per_second,
+            'messages_per_connection': self.messages_per_connection
+        }
+
+
+class TemplateError(ValueError):
+    """A mail template uses an unknown placeholder"""
+
+
+class MailTemplate:
+    """Subject and body compiled once into literal and field parts"""
+
+    def __init__(self, subject: str, body: str):
+        self.subject = subject
+        self.body = body
+        self._subject_parts = self._compile(subject)
+        self._body_parts = self._compile(body)
+
+    @staticmethod
+    def _compile(text: str) -> List[Tuple[str, Optional[Callable]]]:
+        parts = []
+        position = 0
+        for match in PLACEHOLDER.finditer(text):
+            braced, bracketed = match.groups()
+            field = (braced or bracketed).strip().lower().replace(' ', '_')
+            getter = TEMPLATE_FIELDS.get(field)
+            if getter is None:
+                if bracketed:
+                    # Plain text in square brackets, not a placeholder
+                    continue
+                raise TemplateError(f"Unknown placeholder {match.group(0)}. "
+                                    f"Expected one of {', '.join(sorted(TEMPLATE_FIELDS))}")
+            parts.append((text[position:match.start()], None))
+            parts.append(('', getter))
+            position = match.end()
+        parts.append((text[position:], None))
+        return [(literal, getter) for literal, getter in parts if literal or getter]
+
+    @staticmethod
+    def _render(parts, candidate: Dict[str, Any], header: bool = False) -> str:
+        if header:
+            # Parsed fields may span lines ("Karthikeyan A\nChennai"); headers may not
+            return ''.join(' '.join(getter(candidate).split()) if getter else literal for literal, getter in parts)
+        return ''.join(getter(candidate) if getter else literal for literal, getter in parts)
+
+    def render(self, candidate: Dict[str, Any]) -> Tuple[str, str]:
+        """(subject, body) filled from a candidate's parsed fields"""
+        return (self._render(self._subject_parts, candidate, header=True),
+                self._render(self._body_parts, candidate))
+
+
+@lru_cache(maxsize=64)
+def compile_template(subject: str, body: str) -> MailTemplate:
+    """Compiled template, reused while the same subject and body are sent again"""
+    return MailTemplate(subject, body)
+
+
+class RateLimiter:
+    """Token bucket shared by every sending thread"""
+
+    def __init__(self, rate_per_second: float, burst: Optional[float] = None):
+        self.rate = rate_per_second
+        self.capacity = burst or max(1.0, rate_per_second)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a message may be sent"""
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class _PooledConnection:
+    def __init__(self, smtp: smtplib.SMTP):
+        self.smtp = smtp
+        self.sent = 0
+        self.last_used = time.monotonic()
+
+
+class SmtpPool:
+    """Persistent SMTP connections reused across messages and jobs"""
+
+    def __init__(self, settings: SmtpSettings):
+        self.settings = settings
+        self._idle: LifoQueue = LifoQueue()
+        self._slots = threading.BoundedSemaphore(settings.concurrency)
+        self._opened = 0
+        self._lock = threading.Lock()
+
+    def _connect(self) -> _PooledConnection:
+        settings = self.settings
+        if settings.use_ssl:
+            smtp = smtplib.SMTP_SSL(settings.host, settings.port, timeout=settings.timeout,
+                                    context=ssl.create_default_context())
+        else:
+            smtp = smtplib.SMTP(settings.host, settings.port, timeout=settings.timeout)
+            if settings.starttls:
+                smtp.starttls(context=ssl.create_default_context())
+        if settings.username:
+            smtp.login(settings.username, settings.password or '')
+        with self._lock:
+            self._opened += 1
+        return _PooledConnection(smtp)
+
+    @staticmethod
+    def _close(connection: _PooledConnection):
+        try:
+            connection.smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            connection.smtp.close()
+
+    def _is_usable(self, connection: _PooledConnection) -> bool:
+        if connection.sent >= self.settings.messages_per_connection:
+            return False
+        if time.monotonic() - connection.last_used < IDLE_CHECK_SECONDS:
+            return True
+        try:
+            return connection.smtp.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    @contextmanager
+    def connection(self) -> Iterator[_PooledConnection]:
+        """Borrow a connection; at most settings.concurrency are out at once.
+
+        A connection is returned to the pool after an SMTP error reply (the
+        session is still usable) and discarded after any other exception.
+        """
+        with self._slots:
+            connection = None
+            while connection is None:
+                try:
+                    candidate = self._idle.get_nowait()
+                except Empty:
+                    connection = self._connect()
+                    break
+                if self._is_usable(candidate):
+                    connection = candidate
+                else:
+                    self._close(candidate)
+            try:
+                yield connection
+            except (smtplib.SMTPRecipientsRefused, smtplib.SMTPResponseException):
+                connection.last_used = time.monotonic()
+                self._idle.put(connection)
+                raise
+            except BaseException:
+                self._close(connection)
+                raise
+            connection.last_used = time.monotonic()
+            self._idle.put(connection)
+
+    def close(self):
+        while True:
+            try:
+                self._close(self._idle.get_nowait())
+            except Empty:
+                return
+
+    def stats(self) -> Dict[str, Any]:
+        return {'idle': self._idle.qsize(), 'opened': self._opened}
+
+
+class BroadcastJob:
+    """One mail-merge send with a delivery status per recipient"""
+
+    def __init__(self, template: MailTemplate, recipients: List[Dict[str, Any]],
+                 job_id: Optional[str] = None):
+        self.id = job_id or uuid.uuid4().hex[:16]
+        self.template = template
+        self.status = 'queued'
+        self.created_at = datetime.now().isoformat()
+        self.started_at = None
+        self.finished_at = None
+        self.error = None
+        self.cancelled = threading.Event()
+        self._lock = threading.Lock()
+        self.recipients = []
+        seen = set()
+        for candidate in recipients:
+            email = (candidate.get('email') or '').strip()
+            entry = {'email': email, 'name': candidate.get('name'), 'status': STATUS_PENDING,
+                     'attempts': 0, 'error': None, 'sent_at': None, 'candidate': candidate}
+            if not EMAIL_PATTERN.match(email):
+                entry.update(status=STATUS_SKIPPED, error='Missing or invalid email address')
+            elif email.lower() in seen:
+                entry.update(status=STATUS_SKIPPED, error='Duplicate recipient')
+            seen.add(email.lower())
+            self.recipients.append(entry)
+
+    def update(self, entry: Dict[str, Any], **changes):
+        with self._lock:
+            entry.update(changes)
+
+    def counts(self) -> Dict[str, int]:
+        counts = {status: 0 for status in (STATUS_PENDING, STATUS_SENT, STATUS_FAILED,
+                                           STATUS_SKIPPED, STATUS_CANCELLED)}
+        with self._lock:
+            for entry in self.recipients:
+                counts[entry['status']] += 1
+        return counts
+
+    def to_dict(self, include_recipients: bool = True) -> Dict[str, Any]:
+        data = {
+            'job_id': self.id,
+            'status': self.status,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'error': self.error,
+            'total': len(self.recipients),
+            'counts': self.counts(),
+            'subject': self.template.subject
+        }
+        if include_recipients:
+            with self._lock:
+                data['recipients'] = [
+                    {field: value for field, value in entry.items() if field != 'candidate'}
+                    for entry in self.recipients
+                ]
+        return data
+
+
+class Mailer:
+    """Sends broadcast jobs over a shared SMTP pool under one rate limit.
+
+    Job state is written to jobs_dir as JSON, so any server worker can
+    report on a job another worker is running.
+    """
+
+    def __init__(self, settings: SmtpSettings, jobs_dir: str = DEFAULT_JOBS_DIR):
+        self.settings = settings
+        self.jobs_dir = jobs_dir
+        self.pool = SmtpPool(settings)
+        self.limiter = RateLimiter(settings.rate_per_second)
+        self._jobs: Dict[str, BroadcastJob] = {}
+        self._lock = threading.Lock()
+
+    def _job_path(self, job_id: str) -> str:
+        return os.path.join(self.jobs_dir, f'{job_id}.json')
+
+    def _save(self, job: BroadcastJob):
+        os.makedirs(self.jobs_dir, exist_ok=True)
+        path = self._job_path(job.id)
+        temp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(job.to_dict(), f)
+        os.replace(temp_path, path)
+
+    def _build_message(self, job: BroadcastJob, entry: Dict[str, Any]) -> EmailMessage:
+        subject, body = job.template.render(entry['candidate'])
+        message = EmailMessage()
+        message['From'] = self.settings.sender
+        message['To'] = formataddr((' '.join((entry['name'] or '').split()), entry['email']))
+        message['Subject'] = subject
+        message['Date'] = formatdate(localtime=True)
+        message['Message-ID'] = make_msgid()
+        message.set_content(body)
+        return message
+
+    def _deliver(self, job: BroadcastJob, entry: Dict[str, Any]):
+        try:
+            message = self._build_message(job, entry)
+        except Exception as e:
+            # One malformed candidate fails on its own instead of aborting the job
+            job.update(entry, status=STATUS_FAILED, error=f'Could not build message: {str(e)}')
+            MAILS_SENT.inc(status=STATUS_FAILED)
+            return
+        for attempt in range(1, MAX_ATTEMPTS + 1):
+            if job.cancelled.is_set():
+                job.update(entry, status=STATUS_CANCELLED)
+                return
+            self.limiter.acquire()
+            job.update(entry, attempts=attempt)
+            start = time.perf_counter()
+            try:
+                with self.pool.connection() as connection:
+                    refused = connection.smtp.send_message(message)
+                    connection.sent += 1
+                if refused:
+                    code, reason = refused.get(entry['email'], next(iter(refused.values())))
+                    raise smtplib.SMTPRecipientsRefused({entry['email']: (code, reason)})
+                SEND_SECONDS.observe(time.perf_counter() - start)
+                job.update(entry, status=STATUS_SENT, error=None, sent_at=datetime.now().isoformat())
+                MAILS_SENT.inc(status=STATUS_SENT)
+                return
+            except smtplib.SMTPRecipientsRefused as e:
+                code, reason = next(iter(e.recipients.values()))
+                error = f'{code} {reason.decode("utf-8", "replace") if isinstance(reason, bytes) else reason}'
+                # 4xx is a temporary refusal worth retrying, 5xx is final
+                if not 400 <= code < 500:
+                    job.update(entry, status=STATUS_FAILED, error=error)
+                    MAILS_SENT.inc(status=STATUS_FAILED)
+                    return
+            except smtplib.SMTPResponseException as e:
+                error = f'{e.smtp_code} {e.smtp_error.decode("utf-8", "replace") if isinstance(e.smtp_error, bytes) else e.smtp_error}'
+                if not 400 <= e.smtp_code < 500:
+                    job.update(entry, status=STATUS_FAILED, error=error)
+                    MAILS_SENT.inc(status=STATUS_FAILED)
+                    return
+            except (smtplib.SMTPException, OSError) as e:
+                # Dropped or refused connection: the pool opens a fresh one on retry
+                error = str(e) or type(e).__name__
+            job.update(entry, error=error)
+            if attempt < MAX_ATTEMPTS:
+                time.sleep(RETRY_BACKOFF_SECONDS * attempt)
+        job.update(entry, status=STATUS_FAILED)
+        MAILS_SENT.inc(status=STATUS_FAILED)
+
+    def run(self, job: BroadcastJob) -> BroadcastJob:
+        """Send every pending recipient of a job, settings.concurrency at a time"""
+        job.status = 'running'
+        job.started_at = datetime.now().isoformat()
+        self._save(job)
+        pending = [entry for entry in job.recipients if entry['status'] == STATUS_PENDING]
+        last_write = [time.monotonic()]
+        write_lock = threading.Lock()
+
+        def send(entry):
+            self._deliver(job, entry)
+            with write_lock:
+                if time.monotonic() - last_write[0] >= PROGRESS_WRITE_SECONDS:
+                    last_write[0] = time.monotonic()
+                    self._save(job)
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.settings.concurrency,
+                                    thread_name_prefix=f'mail-{job.id}') as executor:
+                for future in [executor.submit(send, entry) for entry in pending]:
+                    future.result()
+            job.status = 'cancelled' if job.cancelled.is_set() else 'completed'
+        except Exception as e:
+            logger.error(f"Broadcast {job.id} failed: {str(e)}")
+            job.status = 'failed'
+            job.error = str(e)
+        job.finished_at = datetime.now().isoformat()
+        self._save(job)
+        counts = job.counts()
+        logger.info(f"Broadcast {job.id} {job.status}: {counts[STATUS_SENT]} sent, {counts[STATUS_FAILED]} failed")
+        return job
+
+    def submit(self, job: BroadcastJob, background: bool = False) -> BroadcastJob:
+        """Run a job now, or on a daemon thread and return immediately"""
+        with self._lock:
+            self._jobs[job.id] = job
+            # Finished jobs stay readable from their file
+            while len(self._jobs) > MAX_JOBS_IN_MEMORY:
+                oldest = next(iter(self._jobs))
+                if self._jobs[oldest].finished_at is None:
+                    break
+                del self._jobs[oldest]
+        if not background:
+            return self.run(job)
+        self._save(job)
+        threading.Thread(target=self.run, args=(job,), name=f'broadcast-{job.id}', daemon=True).start()
+        return job
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Job status from memory, or from its file when another process ran it"""
+        job = self._jobs.get(job_id)
+        if job is not None:
+            return job.to_dict()
+        if not re.fullmatch(r'[0-9a-f]{16}', job_id):
+            return None
+        try:
+            with open(self._job_path(job_id), encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        jobs = []
+        if os.path.isdir(self.jobs_dir):
+            for filename in sorted(os.listdir(self.jobs_dir)):
+                if filename.endswith('.json'):
+                    job = self.get_job(filename[:-len('.json')])
+                    if job is not None:
+                        job.pop('recipients', None)
+                        jobs.append(job)
+        return sorted(jobs, key=lambda job: job['created_at'], reverse=True)
+
+    def cancel(self, job_id: str) -> bool:
+        """Stop a running job in this process; recipients not yet sent are marked cancelled"""
+        job = self._jobs.get(job_id)
+        if job is None or job.finished_at is not None:
+            return False
+        job.cancelled.set()
+        return True
+
+    def close(self):
+        self.pool.close()
+
+
+def build_recipients(recipients: Iterable[Any], lookup: Callable[[str], Optional[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Turn emails, {email, name, ...} objects and {key} results-log references
+    into candidate dicts for mail merge"""
+    candidates = []
+    for recipient in recipients:
+        if isinstance(recipient, str):
+            candidates.append({'email': recipient})
+        elif isinstance(recipient, dict) and recipient.get('key'):
+            record = lookup(recipient['key'])
+            candidates.append(dict(record or {}, **{k: v for k, v in recipient.items() if k != 'key'}))
+        elif isinstance(recipient, dict):
+            candidates.append(recipient)
+    return candidates
@@ -0,0 +1,368 @@
+import os
+import pickle
+import threading
+import time
+import logging
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import List, Dict, Optional, Any, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: no pre-fork server, so no shared metrics directory either
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Latency buckets in seconds, from fast regex extractors up to slow PDFs
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SNAPSHOT_SUFFIX = '.metrics'
+# Values of the master and of exited workers, folded together so counters never go backwards
+ARCHIVE_FILENAME = 'archive' + SNAPSHOT_SUFFIX
+LOCK_FILENAME = '.lock'
+
+
+def _format_labels(label_names: Tuple[str, ...], label_values: Tuple[str, ...], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(label_names, label_values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic counter with optional labels"""
+
+    metric_type = 'counter'
+
+    def __init__(self, name: str, documentation: str, label_names: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(str(labels.get(name, '')) for name in self.label_names)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels) -> float:
+        key = tuple(str(labels.get(name, '')) for name in self.label_names)
+        return self._values.get(key, 0)
+
+    def collect(self) -> List[str]:
+        with self._lock:
+            values = dict(self._values)
+        return [
+            f'{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}'
+            for key, value in sorted(values.items())
+        ]
+
+    def snapshot(self) -> Dict[Tuple[str, ...], float]:
+        with self._lock:
+            return dict(self._values)
+
+    def merge(self, values: Dict[Tuple[str, ...], float]):
+        with self._lock:
+            for key, value in values.items():
+                self._values[key] = self._values.get(key, 0) + value
+
+    def reset(self):
+        with self._lock:
+            self._values.clear()
+
+    def _after_fork(self):
+        self._lock = threading.Lock()
+
+    def empty_copy(self) -> 'Counter':
+        return Counter(self.name, self.documentation, self.label_names)
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram with optional labels"""
+
+    metric_type = 'histogram'
+
+    def __init__(self, name: str, documentation: str, label_names: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets))
+        # key -> [per-bucket counts..., +Inf count, sum]
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels.get(name, '')) for name in self.label_names)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                series = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def summary(self, **labels) -> Dict[str, float]:
+        key = tuple(str(labels.get(name, '')) for name in self.label_names)
+        series = self._values.get(key)
+        if series is None:
+            return {'count': 0, 'sum': 0.0}
+        return {'count': sum(series[:-1]), 'sum': series[-1]}
+
+    def collect(self) -> List[str]:
+        with self._lock:
+            values = {key: list(series) for key, series in self._values.items()}
+        lines = []
+        for key, series in sorted(values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), series[:-1]):
+                cumulative += count
+                le = 'le="' + _format_value(bound) + '"'
+                lines.append(f'{self.name}_bucket{_format_labels(self.label_names, key, le)} {cumulative}')
+            labels = _format_labels(self.label_names, key)
+            lines.append(f'{self.name}_sum{labels} {_format_value(series[-1])}')
+            lines.append(f'{self.name}_count{labels} {cumulative}')
+        return lines
+
+    def snapshot(self) -> Dict[Tuple[str, ...], List[float]]:
+        with self._lock:
+            return {key: list(series) for key, series in self._values.items()}
+
+    def merge(self, values: Dict[Tuple[str, ...], List[float]]):
+        with self._lock:
+            for key, series in values.items():
+                current = self._values.get(key)
+                if current is None:
+                    self._values[key] = list(series)
+                else:
+                    self._values[key] = [a + b for a, b in zip(current, series)]
+
+    def reset(self):
+        with self._lock:
+            self._values.clear()
+
+    def _after_fork(self):
+        self._lock = threading.Lock()
+
+    def empty_copy(self) -> 'Histogram':
+        return Histogram(self.name, self.documentation, self.label_names, self.buckets)
+
+
+class MetricsRegistry:
+    """Process-wide collection of metrics rendered in Prometheus text format"""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, label_names: Tuple[str, ...] = ()) -> Counter:
+        return self.register(Counter(name, documentation, label_names))
+
+    def histogram(self, name: str, documentation: str, label_names: Tuple[str, ...] = (),
+                  buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, label_names, buckets))
+
+    def get(self, name: str):
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """Render every registered metric in Prometheus exposition format"""
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.metric_type}')
+            lines.extend(metric.collect())
+        return '\n'.join(lines) + '\n'
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Raw metric values, e.g. to ship from a worker process to its parent"""
+        return {name: metric.snapshot() for name, metric in list(self._metrics.items())}
+
+    def merge(self, snapshot: Dict[str, Any]):
+        """Add values captured by snapshot() in another process"""
+        for name, values in snapshot.items():
+            metric = self._metrics.get(name)
+            if metric is not None:
+                metric.merge(values)
+
+    def reset(self):
+        for metric in list(self._metrics.values()):
+            metric.reset()
+
+    def _after_fork(self):
+        # Another request thread may have held one of these locks when a parse worker
+        # forked; the child would block on it forever
+        self._lock = threading.Lock()
+        for metric in list(self._metrics.values()):
+            metric._after_fork()
+
+    def empty_copy(self) -> 'MetricsRegistry':
+        """A registry with the same metrics and no values"""
+        registry = MetricsRegistry()
+        for metric in list(self._metrics.values()):
+            registry.register(metric.empty_copy())
+        return registry
+
+
+class SharedMetrics:
+    """Metrics of pre-forked server workers summed on every scrape, like
+    Prometheus' multiprocess mode.
+
+    Each worker writes a snapshot of its registry to the directory after
+    every request. When a worker exits, the master folds its snapshot into
+    the archive, so recycling workers does not look like a counter reset.
+    """
+
+    def __init__(self, directory: str, registry: Optional[MetricsRegistry] = None):
+        self.directory = directory
+        self.registry = registry if registry is not None else REGISTRY
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, pid: int) -> str:
+        return os.path.join(self.directory, f'worker_{pid}{SNAPSHOT_SUFFIX}')
+
+    @contextmanager
+    def _locked(self, exclusive: bool):
+        with open(os.path.join(self.directory, LOCK_FILENAME), 'a+b') as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _write(self, path: str, snapshot: Dict[str, Any]):
+        temp_path = f'{path}.{os.getpid()}.tmp'
+        with open(temp_path, 'wb') as f:
+            pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+
+    def _read(self, path: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(path, 'rb') as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable metrics snapshot {path}: {str(e)}")
+            return None
+
+    def start(self):
+        """Master: drop snapshots of a previous run and archive the master's own values"""
+        with self._locked(exclusive=True):
+            for filename in os.listdir(self.directory):
+                if filename.endswith(SNAPSHOT_SUFFIX):
+                    os.remove(os.path.join(self.directory, filename))
+            self._write(os.path.join(self.directory, ARCHIVE_FILENAME), self.registry.snapshot())
+
+    def write(self):
+        """Worker: publish this process's current values"""
+        self._write(self._path(os.getpid()), self.registry.snapshot())
+
+    def archive(self, pid: int):
+        """Master: fold an exited worker's values into the archive"""
+        with self._locked(exclusive=True):
+            path = self._path(pid)
+            snapshot = self._read(path)
+            if snapshot is None:
+                return
+            archive_path = os.path.join(self.directory, ARCHIVE_FILENAME)
+            merged = self.registry.empty_copy()
+            merged.merge(self._read(archive_path) or {})
+            merged.merge(snapshot)
+            self._write(archive_path, merged.snapshot())
+            os.remove(path)
+
+    def render(self) -> str:
+        """Every process's values summed, this one's read live"""
+        combined = self.registry.empty_copy()
+        own_path = self._path(os.getpid())
+        with self._locked(exclusive=False):
+            for filename in os.listdir(self.directory):
+                path = os.path.join(self.directory, filename)
+                if filename.endswith(SNAPSHOT_SUFFIX) and path != own_path:
+                    combined.merge(self._read(path) or {})
+        combined.merge(self.registry.snapshot())
+        return combined.render()
+
+
+REGISTRY = MetricsRegistry()
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=REGISTRY._after_fork)
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Set by the pre-fork server so /metrics covers every worker, not just the one scraped
+_shared_state: Dict[str, Optional[SharedMetrics]] = {'shared': None}
+
+
+def enable_shared_metrics(directory: str) -> SharedMetrics:
+    shared = _shared_state['shared'] = SharedMetrics(directory)
+    return shared
+
+
+def get_shared_metrics() -> Optional[SharedMetrics]:
+    return _shared_state['shared']
+
+
+def render() -> str:
+    """Prometheus text for this process, or for all server workers when shared"""
+    shared = _shared_state['shared']
+    return shared.render() if shared else REGISTRY.render()
+
+# Resume parser metrics shared by every ResumeParser instance in the process
+FILES_PARSED = REGISTRY.counter(
+    'resume_parser_files_total', 'Resume files parsed, by file type and outcome', ('file_type', 'status')
+)
+PARSE_SECONDS = REGISTRY.histogram(
+    'resume_parser_parse_seconds', 'End-to-end parse_resume latency', ('file_type',)
+)
+STAGE_SECONDS = REGISTRY.histogram(
+    'resume_parser_stage_seconds', 'Latency of each parsing stage', ('stage',)
+)
+FIELD_EXTRACTIONS = REGISTRY.counter(
+    'resume_parser_field_extractions_total', 'Field extraction outcomes', ('field', 'result')
+)
+
+
+def time_stage(stage: str):
+    """Context manager recording the duration of a parsing stage"""
+    return STAGE_SECONDS.time(stage=stage)
+
+
+def record_field(field: str, value, error: Optional[Exception] = None):
+    """Count a field extraction as success, empty or error"""
+    if error is not None:
+        result = 'error'
+    elif value:
+        result = 'success'
+    else:
+        result = 'empty'
+    FIELD_EXTRACTIONS.inc(field=field, result=result)
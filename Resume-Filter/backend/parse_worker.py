@@ -0,0 +1,146 @@
+import multiprocessing
+import os
+import logging
+from typing import Optional, Any, Callable, Tuple
+
+import metrics
+
+logger = logging.getLogger(__name__)
+
+try:
+    import resource
+except ImportError:  # Windows: no rlimits, wall-clock limit still applies
+    resource = None
+
+# Status values reported in processing_results
+STATUS_TIMEOUT = 'timeout'
+STATUS_OVERSIZE = 'oversize'
+
+
+class ParseLimitExceeded(Exception):
+    """A file was stopped because it exceeded a per-file limit"""
+
+    status = 'error'
+
+    def __init__(self, file_path: str, message: str):
+        super().__init__(message)
+        self.file_path = file_path
+
+
+class ParseTimeout(ParseLimitExceeded):
+    status = STATUS_TIMEOUT
+
+
+class ParseOversize(ParseLimitExceeded):
+    status = STATUS_OVERSIZE
+
+
+class ParseLimits:
+    """Per-file wall-clock, memory and input-size limits (None disables a limit)"""
+
+    def __init__(self, timeout_seconds: Optional[float] = None, memory_limit_mb: Optional[int] = None,
+                 max_file_mb: Optional[float] = None):
+        self.timeout_seconds = timeout_seconds or None
+        self.memory_limit_mb = memory_limit_mb or None
+        self.max_file_mb = max_file_mb or None
+
+    @property
+    def isolated(self) -> bool:
+        """Whether parsing must run in a killable child process"""
+        return bool(self.timeout_seconds or self.memory_limit_mb)
+
+    def __repr__(self):
+        return (f"ParseLimits(timeout_seconds={self.timeout_seconds}, "
+                f"memory_limit_mb={self.memory_limit_mb}, max_file_mb={self.max_file_mb})")
+
+
+def _mp_context():
+    # fork shares the already-loaded parser and models with the child copy-on-write
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('fork' if 'fork' in methods else 'spawn')
+
+
+def _current_vm_bytes() -> int:
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[0]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return 0
+
+
+def _apply_memory_limit(memory_limit_mb: Optional[int]):
+    """Cap the child's address space at its current size plus the allowance"""
+    if not memory_limit_mb or resource is None:
+        return
+    limit = _current_vm_bytes() + memory_limit_mb * 1024 * 1024
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+
+
+def _child_main(conn, func: Callable, args: Tuple, memory_limit_mb: Optional[int]):
+    # Only report what this child records; the parent merges it into its own registry
+    metrics.REGISTRY.reset()
+    try:
+        _apply_memory_limit(memory_limit_mb)
+        result = func(*args)
+        conn.send(('ok', result, metrics.REGISTRY.snapshot()))
+    except MemoryError:
+        conn.send((STATUS_OVERSIZE, 'Memory limit exceeded', metrics.REGISTRY.snapshot()))
+    except Exception as e:
+        conn.send(('error', str(e), metrics.REGISTRY.snapshot()))
+    finally:
+        conn.close()
+
+
+def run_with_limits(func: Callable, args: Tuple, file_path: str, limits: ParseLimits,
+                    size_bytes: Optional[int] = None) -> Any:
+    """Run func(*args) for one file under the given limits and return its result.
+
+    file_path names the input in errors; size_bytes is its size when it is
+    already in memory, otherwise the file on disk is measured.
+    Raises ParseOversize or ParseTimeout when a limit is hit, and RuntimeError
+    when the worker fails in any other way.
+    """
+    if limits.max_file_mb:
+        if size_bytes is None:
+            size_bytes = os.path.getsize(file_path)
+        size_mb = size_bytes / (1024 * 1024)
+        if size_mb > limits.max_file_mb:
+            raise ParseOversize(file_path, f'File is {size_mb:.1f}MB, limit is {limits.max_file_mb}MB')
+
+    if not limits.isolated:
+        return func(*args)
+
+    context = _mp_context()
+    parent_conn, child_conn = context.Pipe(duplex=False)
+    process = context.Process(
+        target=_child_main,
+        args=(child_conn, func, args, limits.memory_limit_mb),
+        name=f'parse-{os.path.basename(file_path)}',
+        daemon=True
+    )
+    process.start()
+    child_conn.close()
+
+    try:
+        if not parent_conn.poll(limits.timeout_seconds):
+            process.kill()
+            process.join()
+            raise ParseTimeout(file_path, f'Parsing exceeded {limits.timeout_seconds}s and was stopped')
+        try:
+            status, payload, child_metrics = parent_conn.recv()
+        except EOFError:
+            process.join()
+            raise RuntimeError(f'Parse worker exited unexpectedly (exit code {process.exitcode})')
+    finally:
+        parent_conn.close()
+
+    process.join()
+    metrics.REGISTRY.merge(child_metrics)
+    if status == STATUS_OVERSIZE:
+        raise ParseOversize(file_path, payload)
+    if status == 'error':
+        raise RuntimeError(payload)
+    return payload
@@ -0,0 +1,252 @@
+import importlib.util
+import os
+import re
+import tempfile
+import threading
+import time
+import logging
+from typing import List, Dict, Optional, Any
+
+logger = logging.getLogger(__name__)
+
+# Force a backend (e.g. "pdfminer") instead of picking the fastest one at startup
+PREFERRED_BACKEND = os.environ.get('RESUME_PDF_BACKEND', '').strip().lower() or None
+CALIBRATION_REPEAT = 3
+# The sample is repeated to about two pages; a one-page file only measures fixed per-file overhead
+CALIBRATION_COPIES = 12
+
+# Text of the calibration PDF; a backend passes if it recovers every line
+QUALITY_SAMPLE = [
+    'Priya Sharma',
+    'priya.sharma@mail.com | +91 98765 43210',
+    'Chennai, Tamil Nadu',
+    'SKILLS',
+    'Python, Django, React, PostgreSQL, Docker, Kubernetes',
+    'EXPERIENCE',
+    'Senior Software Engineer, Acme Corp (Jan 2019 - Present)',
+    'Built data pipelines (ETL) processing 2M records/day with 99.9% uptime.',
+    'EDUCATION',
+    'B.Tech in Computer Science, Anna University, 2016'
+]
+WHITESPACE = re.compile(r'\s+')
+
+
+def _pdf_escape(line: str) -> str:
+    return line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def write_pdf(path: str, lines: List[str], lines_per_page: int = 60):
+    """Write a minimal text PDF without any PDF library"""
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+    objects = []  # object bodies, object number = index + 1
+    page_ids = []
+    font_id = 3
+
+    objects.append(None)  # 1: catalog, filled below
+    objects.append(None)  # 2: page tree, filled below
+    objects.append(b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>')
+
+    for page_lines in pages:
+        stream = 'BT /F1 10 Tf 12 TL 50 800 Td ' + ' '.join(
+            f'({_pdf_escape(line)}) Tj T*' for line in page_lines
+        ) + ' ET'
+        stream_bytes = stream.encode('latin-1', 'replace')
+        objects.append(b'<< /Length %d >>\nstream\n' % len(stream_bytes) + stream_bytes + b'\nendstream')
+        content_id = len(objects)
+        objects.append(
+            b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] '
+            b'/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>' % (font_id, content_id)
+        )
+        page_ids.append(len(objects))
+
+    objects[0] = b'<< /Type /Catalog /Pages 2 0 R >>'
+    kids = ' '.join(f'{pid} 0 R' for pid in page_ids).encode()
+    objects[1] = b'<< /Type /Pages /Kids [' + kids + b'] /Count %d >>' % len(page_ids)
+
+    output = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(output))
+        output += b'%d 0 obj\n' % number + body + b'\nendobj\n'
+    xref_offset = len(output)
+    output += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    for offset in offsets:
+        output += b'%010d 00000 n \n' % offset
+    output += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref_offset)
+
+    with open(path, 'wb') as f:
+        f.write(output)
+
+
+class PdfBackend:
+    """A PDF text extractor backed by one optional library"""
+
+    name = ''
+    module = ''
+
+    def available(self) -> bool:
+        return importlib.util.find_spec(self.module) is not None
+
+    def extract(self, source) -> str:
+        """Return the text of a PDF path or binary stream, raising if it cannot be read"""
+        raise NotImplementedError
+
+
+class PdfiumBackend(PdfBackend):
+    """pypdfium2: PDFium's C text layer, usually the fastest option"""
+
+    name = 'pypdfium2'
+    module = 'pypdfium2'
+
+    def extract(self, source) -> str:
+        import pypdfium2
+
+        pages = []
+        pdf = pypdfium2.PdfDocument(source)
+        try:
+            for page in pdf:
+                text_page = page.get_textpage()
+                try:
+                    pages.append(text_page.get_text_range())
+                finally:
+                    text_page.close()
+                    page.close()
+        finally:
+            pdf.close()
+        return '\n'.join(pages)
+
+
+class PdfMinerBackend(PdfBackend):
+    """pdfminer.six: pure Python, layout analysis copes with multi-column pages"""
+
+    name = 'pdfminer'
+    module = 'pdfminer'
+
+    def extract(self, source) -> str:
+        from pdfminer.high_level import extract_text
+        return extract_text(source)
+
+
+class PyPDF2Backend(PdfBackend):
+    """PyPDF2: the original extractor, kept as the fallback"""
+
+    name = 'pypdf2'
+    module = 'PyPDF2'
+
+    def extract(self, source) -> str:
+        import PyPDF2
+
+        text = ""
+        pdf_reader = PyPDF2.PdfReader(source)
+
+        # Check if PDF is encrypted
+        if pdf_reader.is_encrypted:
+            logger.warning("PDF is encrypted. Attempting to decrypt...")
+            try:
+                pdf_reader.decrypt('')
+            except Exception:
+                raise ValueError("Could not decrypt PDF")
+
+        for page_num, page in enumerate(pdf_reader.pages):
+            try:
+                page_text = page.extract_text()
+                if page_text:
+                    text += page_text + "\n"
+            except Exception as e:
+                logger.warning(f"Error extracting text from page {page_num + 1}: {str(e)}")
+                continue
+        return text
+
+
+# Preference order when timings tie or calibration is unavailable
+PDF_BACKENDS = {backend.name: backend for backend in (PdfiumBackend(), PdfMinerBackend(), PyPDF2Backend())}
+
+
+def check_quality(text: str, expected_lines: List[str] = QUALITY_SAMPLE) -> bool:
+    """Whether every expected line survives extraction, ignoring whitespace"""
+    compact = WHITESPACE.sub('', text or '')
+    return all(WHITESPACE.sub('', line) in compact for line in expected_lines)
+
+
+def calibrate_backends(repeat: int = CALIBRATION_REPEAT) -> List[Dict[str, Any]]:
+    """Time every PDF backend on a sample document and check its output"""
+    report = []
+    with tempfile.TemporaryDirectory(prefix='pdf_calibration_') as directory:
+        sample_path = os.path.join(directory, 'sample.pdf')
+        write_pdf(sample_path, QUALITY_SAMPLE * CALIBRATION_COPIES)
+
+        for backend in PDF_BACKENDS.values():
+            entry = {'backend': backend.name, 'available': backend.available(),
+                     'passed': False, 'best_ms': None, 'error': None}
+            report.append(entry)
+            if not entry['available']:
+                continue
+            try:
+                timings = []
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    text = backend.extract(sample_path)
+                    timings.append(time.perf_counter() - start)
+                entry['best_ms'] = round(min(timings) * 1000, 3)
+                entry['passed'] = check_quality(text)
+            except Exception as e:
+                entry['error'] = str(e)
+    return report
+
+
+def select_backend(report: List[Dict[str, Any]], preferred: Optional[str] = PREFERRED_BACKEND) -> Optional[str]:
+    """Fastest backend that passed the quality check, unless one is forced"""
+    passed = [entry for entry in report if entry['passed']]
+    if preferred:
+        for entry in report:
+            if entry['backend'] == preferred and entry['available']:
+                return preferred
+        logger.warning(f"⚠️  PDF backend '{preferred}' is not installed; selecting automatically")
+    if not passed:
+        return None
+    return min(passed, key=lambda entry: entry['best_ms'])['backend']
+
+
+# Calibration runs once per process; forked parse workers inherit the result
+_backend_lock = threading.Lock()
+_backend_state: Dict[str, Any] = {'selected': None, 'order': None, 'report': None}
+
+
+def _after_fork():
+    # Calibration in another thread may hold the lock while a parse worker forks
+    global _backend_lock
+    _backend_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_after_fork)
+
+
+def get_pdf_backends() -> List[PdfBackend]:
+    """Installed backends to try in order: the selected one first, then the fallbacks"""
+    order = _backend_state['order']
+    if order is not None:
+        return order
+    with _backend_lock:
+        if _backend_state['order'] is None:
+            report = calibrate_backends()
+            selected = select_backend(report)
+            available = [PDF_BACKENDS[entry['backend']] for entry in report if entry['available']]
+            if selected:
+                available.sort(key=lambda backend: backend.name != selected)
+                logger.info(f"✓ Using PDF backend '{selected}'")
+            else:
+                logger.warning("⚠️  No PDF backend passed the quality check; PDF text may be missing")
+            _backend_state.update(selected=selected, order=available, report=report)
+        return _backend_state['order']
+
+
+def get_backend_report() -> Dict[str, Any]:
+    """Calibration timings and the selected backend"""
+    get_pdf_backends()
+    return {'selected': _backend_state['selected'], 'backends': _backend_state['report']}
+
+
+def get_selected_backend() -> Optional[str]:
+    """Selected backend name without triggering calibration"""
+    return _backend_state['selected']
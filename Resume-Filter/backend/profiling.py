@@ -0,0 +1,136 @@
+import cProfile
+import json
+import os
+import pstats
+import random
+import threading
+import time
+import tracemalloc
+import logging
+from contextlib import contextmanager
+from datetime import datetime
+from typing import List, Optional
+
+from results_log import file_digest
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DIAGNOSTICS_DIR = 'diagnostics'
+DEFAULT_MAX_DUMPS = 50
+TOP_ALLOCATIONS = 25
+
+
+class ParseProfiler:
+    """Opt-in sampling profiler writing cProfile and tracemalloc dumps per file"""
+
+    def __init__(self, directory: str = DEFAULT_DIAGNOSTICS_DIR, sample_rate: float = 0.0,
+                 max_dumps: int = DEFAULT_MAX_DUMPS, seed: Optional[int] = None):
+        self.directory = directory
+        self.sample_rate = sample_rate
+        self.max_dumps = max_dumps
+        self._random = random.Random(seed)
+        # cProfile and tracemalloc are process-global, so profile one file at a time
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.sample_rate > 0
+
+    def should_sample(self) -> bool:
+        return self.sample_rate >= 1 or (self.sample_rate > 0 and self._random.random() < self.sample_rate)
+
+    @contextmanager
+    def profile(self, file_path: str, file_hash: Optional[str] = None):
+        """Profile the enclosed block, or run it untouched if another profile is active"""
+        if not self._lock.acquire(blocking=False):
+            yield None
+            return
+
+        profiler = cProfile.Profile()
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            profiler.enable()
+            try:
+                yield profiler
+            finally:
+                profiler.disable()
+                elapsed = time.perf_counter() - start
+                snapshot = tracemalloc.take_snapshot()
+                _, peak = tracemalloc.get_traced_memory()
+                if started_tracing:
+                    tracemalloc.stop()
+                # Dump even when parsing raised; failing files are the interesting ones
+                try:
+                    self._write_dump(file_path, profiler, snapshot, elapsed, peak, file_hash)
+                except Exception as e:
+                    logger.error(f"Could not write profile for {file_path}: {str(e)}")
+        finally:
+            self._lock.release()
+
+    def _write_dump(self, file_path: str, profiler: cProfile.Profile, snapshot, elapsed: float, peak: int,
+                    file_hash: Optional[str] = None):
+        os.makedirs(self.directory, exist_ok=True)
+        if file_hash:
+            file_hash = file_hash[:16]
+        else:
+            try:
+                file_hash = file_digest(file_path)[:16]
+            except OSError:
+                file_hash = 'unknown'
+        stem = os.path.join(self.directory, f"{file_hash}_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}")
+
+        profiler.dump_stats(stem + '.prof')
+
+        top = snapshot.statistics('lineno')[:TOP_ALLOCATIONS]
+        summary = {
+            'file_name': os.path.basename(file_path),
+            'file_hash': file_hash,
+            'profiled_at': datetime.now().isoformat(),
+            'elapsed_seconds': round(elapsed, 6),
+            'peak_memory_bytes': peak,
+            'top_functions': self._top_functions(profiler),
+            'top_allocations': [
+                {'location': str(stat.traceback[0]), 'size_bytes': stat.size, 'count': stat.count}
+                for stat in top
+            ]
+        }
+        with open(stem + '.json', 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+
+        logger.info(f"Profile for {os.path.basename(file_path)} written to {stem}.prof")
+        self._enforce_cap()
+
+    def _top_functions(self, profiler: cProfile.Profile, limit: int = 15):
+        stats = pstats.Stats(profiler)
+        rows = []
+        for (filename, line, name), (_, calls, _, cumulative, _) in stats.stats.items():
+            rows.append({'function': f'{os.path.basename(filename)}:{line}({name})',
+                         'calls': calls, 'cumulative_seconds': round(cumulative, 6)})
+        rows.sort(key=lambda row: row['cumulative_seconds'], reverse=True)
+        return rows[:limit]
+
+    def _enforce_cap(self):
+        """Delete the oldest dumps beyond max_dumps"""
+        stems = {}
+        for filename in os.listdir(self.directory):
+            stem, extension = os.path.splitext(filename)
+            if extension in ('.prof', '.json'):
+                path = os.path.join(self.directory, filename)
+                stems[stem] = max(stems.get(stem, 0), os.path.getmtime(path))
+
+        excess = sorted(stems, key=stems.get)[:max(0, len(stems) - self.max_dumps)]
+        for stem in excess:
+            for extension in ('.prof', '.json'):
+                path = os.path.join(self.directory, stem + extension)
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def list_dumps(self) -> List[str]:
+        """Return the names of the profile summaries currently kept"""
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(name for name in os.listdir(self.directory) if name.endswith('.json'))
@@ -0,0 +1,364 @@
+import hashlib
+import os
+import re
+import threading
+import time
+import logging
+from contextlib import contextmanager
+from typing import List, Dict, Optional, Any, Iterator, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: the log is then only safe within one process
+    fcntl = None
+
+import result_serializer
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_PATTERN = re.compile(r'^segment_(\d{6})\.ndjson$')
+DEFAULT_SEGMENT_BYTES = 4 * 1024 * 1024  # 4MB
+# Compact once superseded entries outnumber this share of the live ones
+DEFAULT_MAX_DEAD_RATIO = 0.5
+LOCK_FILENAME = '.lock'
+# Bumped by clear() and compact() so other processes know to re-read every segment
+GENERATION_FILENAME = '.generation'
+
+
+def file_digest(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+    """Return the SHA-256 hex digest of a file's contents"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ResultsLog:
+    """Append-only segmented log of parsed resumes keyed by file hash.
+
+    Several processes (e.g. pre-forked server workers) may share one
+    directory: every operation holds an exclusive flock on the directory's
+    lock file and first indexes whatever other processes appended since.
+    """
+
+    def __init__(self, directory: str, max_segment_bytes: int = DEFAULT_SEGMENT_BYTES,
+                 retention_days: Optional[float] = None, max_records: Optional[int] = None):
+        self.directory = directory
+        self.max_segment_bytes = max_segment_bytes
+        self.retention_days = retention_days
+        self.max_records = max_records
+        self._lock = threading.RLock()
+        # key -> (segment id, byte offset, entry length, timestamp) of the latest entry
+        self._index: Dict[str, Tuple[int, int, int, float]] = {}
+        # segment id -> bytes already indexed, so other processes' appends are read incrementally
+        self._scanned: Dict[int, int] = {}
+        # Entries across all segments, live or superseded
+        self._entry_count = 0
+        self._generation = None
+        # Keys appended by other processes since the last refresh(); None after a full reload
+        self._external_keys: Optional[List[str]] = []
+        self._active_id = 1
+        self._lock_file = None
+        self._pid = None
+        self._compactor = None
+        self._stop_event = threading.Event()
+
+        os.makedirs(directory, exist_ok=True)
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._after_fork)
+        with self._locked():
+            self._external_keys = []
+
+    def _after_fork(self):
+        # The parent's lock may have been held by its compactor thread at fork time
+        self._lock = threading.RLock()
+        self._compactor = None
+        self._stop_event = threading.Event()
+
+    def _segment_path(self, segment_id: int) -> str:
+        return os.path.join(self.directory, f'segment_{segment_id:06d}.ndjson')
+
+    def _segment_ids(self):
+        ids = []
+        for filename in os.listdir(self.directory):
+            match = SEGMENT_PATTERN.match(filename)
+            if match:
+                ids.append(int(match.group(1)))
+        return sorted(ids)
+
+    @contextmanager
+    def _locked(self):
+        """Hold the thread and inter-process locks with the index brought up to date"""
+        with self._lock:
+            if self._pid != os.getpid():
+                # flock belongs to the open file description, which a forked child
+                # shares with its parent, so every process opens its own
+                self._pid = os.getpid()
+                self._lock_file = open(os.path.join(self.directory, LOCK_FILENAME), 'a+b')
+            if fcntl:
+                fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                self._sync()
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _read_generation(self) -> int:
+        try:
+            with open(os.path.join(self.directory, GENERATION_FILENAME), 'rb') as f:
+                return int(f.read() or 0)
+        except (FileNotFoundError, ValueError):
+            return 0
+
+    def _bump_generation(self):
+        generation = self._read_generation() + 1
+        temp_path = os.path.join(self.directory, f'{GENERATION_FILENAME}.{os.getpid()}.tmp')
+        with open(temp_path, 'wb') as f:
+            f.write(str(generation).encode('ascii'))
+        os.replace(temp_path, os.path.join(self.directory, GENERATION_FILENAME))
+        self._generation = generation
+
+    def _sync(self):
+        """Index entries written by other processes; a new generation means a full rescan"""
+        generation = self._read_generation()
+        if generation != self._generation:
+            self._load(generation)
+            return
+        segment_ids = self._segment_ids()
+        for segment_id in segment_ids:
+            scanned = self._scanned.get(segment_id, 0)
+            if os.path.getsize(self._segment_path(segment_id)) > scanned:
+                keys = self._index_segment(segment_id, scanned)
+                if self._external_keys is not None:
+                    self._external_keys.extend(keys)
+        if segment_ids:
+            self._active_id = segment_ids[-1]
+
+    def _load(self, generation: int):
+        """Rebuild the offset index by scanning existing segments"""
+        self._index.clear()
+        self._scanned.clear()
+        self._entry_count = 0
+        segment_ids = self._segment_ids()
+        for segment_id in segment_ids:
+            self._index_segment(segment_id)
+        self._active_id = segment_ids[-1] if segment_ids else 1
+        self._generation = generation
+        self._external_keys = None
+
+    def _index_segment(self, segment_id: int, offset: int = 0) -> List[str]:
+        keys = []
+        with open(self._segment_path(segment_id), 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                length = len(line)
+                if not line.endswith(b'\n'):
+                    # Torn write from a crash (appends are whole under the lock): cut it off
+                    # so the next append starts at the offset the index records for it
+                    logger.warning(f"Truncating torn entry in segment {segment_id} at offset {offset}")
+                    os.truncate(self._segment_path(segment_id), offset)
+                    break
+                try:
+                    entry = result_serializer.loads(line)
+                    self._index[entry['key']] = (segment_id, offset, length, entry.get('ts', 0))
+                    keys.append(entry['key'])
+                    self._entry_count += 1
+                except (ValueError, KeyError, TypeError):
+                    logger.warning(f"Skipping corrupt entry in segment {segment_id} at offset {offset}")
+                offset += length
+        self._scanned[segment_id] = offset
+        return keys
+
+    def append(self, key: str, record: Dict[str, Any]) -> bool:
+        """Append a record for key, superseding any earlier entry"""
+        ts = time.time()
+        line = result_serializer.dumps({'key': key, 'ts': ts, 'record': record}) + b'\n'
+        with self._locked():
+            # _sync() indexed the active segment up to its current end
+            offset = self._scanned.get(self._active_id, 0)
+            if offset and offset + len(line) > self.max_segment_bytes:
+                self._active_id += 1
+                offset = 0
+            with open(self._segment_path(self._active_id), 'ab') as f:
+                offset = f.tell()
+                f.write(line)
+            self._index[key] = (self._active_id, offset, len(line), ts)
+            self._scanned[self._active_id] = offset + len(line)
+            self._entry_count += 1
+        return True
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the latest record for key, or None"""
+        with self._locked():
+            location = self._index.get(key)
+            if location is None:
+                return None
+            segment_id, offset, length, _ = location
+            with open(self._segment_path(segment_id), 'rb') as f:
+                f.seek(offset)
+                return result_serializer.loads(f.read(length))['record']
+
+    def refresh(self) -> Optional[List[str]]:
+        """Keys other processes appended since the last call, or None if the whole
+        log changed underneath (cleared or compacted) and callers must rebuild"""
+        with self._locked():
+            keys = self._external_keys
+            self._external_keys = []
+            return keys
+
+    def __contains__(self, key):
+        return key in self._index
+
+    def __len__(self):
+        return len(self._index)
+
+    def iter_records(self) -> Iterator[Dict[str, Any]]:
+        """Yield the latest record for every key, segment by segment"""
+        with self._locked():
+            by_segment = {}
+            for segment_id, offset, length, _ in self._index.values():
+                by_segment.setdefault(segment_id, []).append((offset, length))
+
+            # Read under the lock so compaction cannot remove segments mid-scan
+            records = []
+            for segment_id in sorted(by_segment):
+                with open(self._segment_path(segment_id), 'rb') as f:
+                    for offset, length in sorted(by_segment[segment_id]):
+                        f.seek(offset)
+                        records.append(result_serializer.loads(f.read(length))['record'])
+        yield from records
+
+    def disk_usage(self) -> int:
+        """Total bytes used by all segments"""
+        return sum(os.path.getsize(self._segment_path(i)) for i in self._segment_ids())
+
+    def stats(self) -> Dict[str, Any]:
+        with self._locked():
+            return {
+                'unique_records': len(self._index),
+                'dead_entries': self._entry_count - len(self._index),
+                'segments': len(self._segment_ids()),
+                'disk_bytes': self.disk_usage()
+            }
+
+    def clear(self):
+        """Delete every segment and start an empty log"""
+        with self._locked():
+            for segment_id in self._segment_ids():
+                os.remove(self._segment_path(segment_id))
+            self._index.clear()
+            self._scanned.clear()
+            self._entry_count = 0
+            self._active_id = 1
+            self._bump_generation()
+
+    def _retained_keys(self):
+        """Keys that survive the retention policy"""
+        entries = self._index.items()
+        if self.retention_days is not None:
+            cutoff = time.time() - self.retention_days * 86400
+            entries = [(key, loc) for key, loc in entries if loc[3] >= cutoff]
+        if self.max_records is not None:
+            entries = sorted(entries, key=lambda item: item[1][3], reverse=True)[:self.max_records]
+        return {key for key, _ in entries}
+
+    def compact(self) -> Dict[str, int]:
+        """Merge segments, dropping superseded and expired entries"""
+        with self._locked():
+            before = self.disk_usage()
+            retained = self._retained_keys()
+            old_ids = self._segment_ids()
+
+            # Everything is rewritten into a new segment that later appends continue
+            new_index = {}
+            out_id = (old_ids[-1] if old_ids else 0) + 1
+            out_path = self._segment_path(out_id) + '.compacting'
+            out_offset = 0
+            with open(out_path, 'wb') as out:
+                for segment_id in old_ids:
+                    with open(self._segment_path(segment_id), 'rb') as f:
+                        offset = 0
+                        for line in f:
+                            length = len(line)
+                            try:
+                                key = result_serializer.loads(line)['key']
+                            except (ValueError, KeyError, TypeError):
+                                offset += length
+                                continue
+                            location = self._index.get(key)
+                            if (key in retained and location
+                                    and location[0] == segment_id and location[1] == offset):
+                                out.write(line)
+                                new_index[key] = (out_id, out_offset, length, location[3])
+                                out_offset += length
+                            offset += length
+
+            # The merged segment goes live before the old ones are removed; if a crash
+            # comes in between, its higher id makes its copies win on the next load
+            os.replace(out_path, self._segment_path(out_id))
+            for segment_id in old_ids:
+                os.remove(self._segment_path(segment_id))
+
+            self._index = new_index
+            self._scanned = {out_id: out_offset}
+            self._entry_count = len(new_index)
+            self._active_id = out_id
+            self._bump_generation()
+            # Expired records are gone, so this process's indexes need a rebuild too
+            self._external_keys = None
+
+            after = self.disk_usage()
+            logger.info(f"Compacted {len(old_ids)} segments: {before} -> {after} bytes")
+            return {'segments_merged': len(old_ids), 'bytes_before': before, 'bytes_after': after}
+
+    def expired_count(self) -> int:
+        """Stored records the retention policy no longer keeps"""
+        if self.retention_days is None and self.max_records is None:
+            return 0
+        with self._locked():
+            return len(self._index) - len(self._retained_keys())
+
+    def dead_count(self) -> int:
+        """Superseded entries still taking up space in the segments"""
+        with self._locked():
+            return self._entry_count - len(self._index)
+
+    def needs_compaction(self, min_segments: int = 2, max_dead_ratio: float = DEFAULT_MAX_DEAD_RATIO) -> bool:
+        """Too many segments, too many superseded entries for the live ones, or
+        records past retention that only compaction drops"""
+        return (len(self._segment_ids()) > min_segments
+                or self.dead_count() > len(self) * max_dead_ratio
+                or self.expired_count() > 0)
+
+    def start_compactor(self, interval: float = 300, min_segments: int = 2):
+        """Check periodically on a daemon thread, compacting when needs_compaction()"""
+        if self._compactor and self._compactor.is_alive():
+            return
+
+        def run():
+            while not self._stop_event.wait(interval):
+                try:
+                    if self.needs_compaction(min_segments):
+                        self.compact()
+                except Exception as e:
+                    logger.error(f"Results log compaction failed: {str(e)}")
+
+        self._stop_event.clear()
+        self._compactor = threading.Thread(target=run, name='results-log-compactor', daemon=True)
+        self._compactor.start()
+
+    def stop_compactor(self):
+        self._stop_event.set()
+        if self._compactor:
+            self._compactor.join()
+            self._compactor = None
+
+    def close(self):
+        self.stop_compactor()
+        with self._lock:
+            if self._lock_file:
+                self._lock_file.close()
+                self._lock_file = None
+                self._pid = None
@@ -1,35 +1,169 @@
 import re
-import spacy
-import pandas as pd
-import PyPDF2
-import docx
 from datetime import datetime
 import json
 import os
+import threading
 from collections import defaultdict
-import phonenumbers
-from phonenumbers import geocoder, carrier
-import nltk
-from nltk.tokenize import word_tokenize, sent_tokenize
-from nltk.corpus import stopwords
-from nltk.chunk import ne_chunk
-from nltk.tag import pos_tag
 import logging
+import result_serializer
+import metrics
+from section_segmenter import SectionSegmenter
+from contact_scanner import ContactScanner
+from skills_taxonomy import SkillMatcher, get_skill_matcher
+from location_resolver import LocationResolver, get_location_resolver
+from employment_timeline import EmploymentTimeline, build_timeline, stated_years
+from docx_reader import extract_docx_text
+from ingest import Document, opened_document
+from pdf_backends import get_pdf_backends, get_selected_backend
+from parse_worker import ParseLimits, ParseLimitExceeded, run_with_limits
 from typing import List, Dict, Optional, Any
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-nlp = spacy.load("en_core_web_sm")
+SPACY_MODEL = "en_core_web_sm"
+NLTK_REQUIREMENTS = {
+    'punkt': 'tokenizers/punkt',
+    'stopwords': 'corpora/stopwords',
+    'averaged_perceptron_tagger': 'taggers/averaged_perceptron_tagger',
+    'maxent_ne_chunker': 'chunkers/maxent_ne_chunker',
+    'words': 'corpora/words'
+}
+
+# Parsing tiers: "full" runs every extractor, "quick" is regex-only triage
+PARSE_MODE_FULL = 'full'
+PARSE_MODE_QUICK = 'quick'
+PARSE_MODES = (PARSE_MODE_FULL, PARSE_MODE_QUICK)
+
+# Field -> extractor method, in result order
+FIELD_EXTRACTORS = (
+    ('name', 'extract_name'),
+    ('email', 'extract_email'),
+    ('phone_number', 'extract_phone'),
+    ('skills', 'extract_skills'),
+    ('education', 'extract_education'),
+    ('location', 'extract_location'),
+    ('total_experience', 'extract_experience')
+)
+PARSEABLE_FIELDS = tuple(field for field, _ in FIELD_EXTRACTORS) + ('additional_info',)
+QUICK_FIELDS = frozenset({'name', 'email', 'phone_number', 'skills', 'total_experience'})
+# Extractors that can fall back to spaCy and accept a use_nlp flag
+NLP_FIELDS = frozenset({'name'})
+# "Address: ..." line used when no gazetteer place is named anywhere
+LOCATION_LABEL_PATTERN = re.compile(r'(?:address|location|city|residence|based\s+in)\s*[:\-]\s*([^\n]+)', re.IGNORECASE)
+
+def resolve_fields(mode: str = PARSE_MODE_FULL, fields: Optional[List[str]] = None) -> frozenset:
+    """Return the set of fields to extract for a mode and optional field selection"""
+    if mode not in PARSE_MODES:
+        raise ValueError(f"Unknown parse mode: {mode}. Expected one of {', '.join(PARSE_MODES)}")
+    available = QUICK_FIELDS if mode == PARSE_MODE_QUICK else frozenset(PARSEABLE_FIELDS)
+    if not fields:
+        return available
+    unknown = set(fields) - set(PARSEABLE_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}. Expected any of {', '.join(PARSEABLE_FIELDS)}")
+    return available & frozenset(fields)
+
+
+def parsed_fields(mode: str = PARSE_MODE_FULL, fields: Optional[List[str]] = None) -> frozenset:
+    """Fields parse_resume extracts by default; additional_info needs additional_info=True"""
+    return resolve_fields(mode, fields) - {'additional_info'}
+
+
+# Heavy models are loaded lazily, once per process, and shared by every parser
+_model_lock = threading.Lock()
+_model_state = {'spacy': 'not_loaded', 'nltk': 'not_checked'}
+_spacy_model = None
+
+
+def _after_fork():
+    # A preload thread may hold the lock while a parse worker forks
+    global _model_lock
+    _model_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_after_fork)
+
+
+def ensure_nltk_data() -> bool:
+    """Check (and download if missing) the NLTK data once per process"""
+    if _model_state['nltk'] in ('ready', 'unavailable'):
+        return _model_state['nltk'] == 'ready'
+
+    with _model_lock:
+        if _model_state['nltk'] == 'not_checked':
+            try:
+                import nltk
+                for requirement, resource in NLTK_REQUIREMENTS.items():
+                    try:
+                        nltk.data.find(resource)
+                    except LookupError:
+                        logger.info(f"Downloading NLTK data: {requirement}")
+                        nltk.download(requirement, quiet=True)
+                _model_state['nltk'] = 'ready'
+            except ImportError:
+                logger.warning("⚠️  NLTK is not installed.")
+                _model_state['nltk'] = 'unavailable'
+    return _model_state['nltk'] == 'ready'
+
+
+def load_spacy_model():
+    """Return the shared spaCy pipeline, loading it on first use"""
+    global _spacy_model
+    if _model_state['spacy'] in ('loaded', 'unavailable'):
+        return _spacy_model
+
+    with _model_lock:
+        if _model_state['spacy'] == 'not_loaded':
+            try:
+                import spacy
+                _spacy_model = spacy.load(SPACY_MODEL)
+                _model_state['spacy'] = 'loaded'
+                logger.info(f"✓ spaCy model '{SPACY_MODEL}' loaded successfully")
+            except (ImportError, OSError):
+                logger.warning(f"⚠️  spaCy model '{SPACY_MODEL}' not found. Using fallback parsing.")
+                logger.warning(f"Install it using: python -m spacy download {SPACY_MODEL}")
+                _spacy_model = None
+                _model_state['spacy'] = 'unavailable'
+    return _spacy_model
+
+
+def preload_models():
+    """Eagerly load every lazily-loaded model (used for warm-up)"""
+    ensure_nltk_data()
+    load_spacy_model()
+    get_skill_matcher()
+    get_location_resolver()
+    get_pdf_backends()
+    return get_model_status()
+
+
+def get_model_status() -> Dict[str, Any]:
+    """Report model readiness without triggering any loading"""
+    return {
+        'spacy': _model_state['spacy'],
+        'nltk': _model_state['nltk'],
+        'pdf_backend': get_selected_backend(),
+        'ready': _model_state['spacy'] != 'not_loaded'
+    }
+
 
 class ResumeParser:
-    def __init__(self):
+    def __init__(self, profiler=None, limits: Optional[ParseLimits] = None, keep_text: bool = False):
         """Initialize the Resume Parser with all required dependencies"""
-        self._setup_nltk_data()
-        self._setup_spacy_model()
-        self._initialize_skill_keywords()
+        # Optional profiling.ParseProfiler sampling parse_resume calls
+        self.profiler = profiler
+        # Optional per-file time/memory limits; files over a limit raise ParseLimitExceeded
+        self.limits = limits
+        # Return the extracted text under 'text', e.g. for full-text indexing
+        self.keep_text = keep_text
         self._initialize_education_patterns()
+        self.section_segmenter = SectionSegmenter()
+        self.contact_scanner = ContactScanner()
+        # Per-document analyses (sections, contacts) shared by all extractors
+        self._document_cache = {'text': None}
         
         # Statistics tracking
         self.processing_stats = {
@@ -39,86 +173,29 @@ class ResumeParser:
             'processing_time': 0
         }
 
-    def _setup_nltk_data(self):
-        """Download and setup required NLTK data"""
-        nltk_requirements = [
-            'punkt', 'stopwords', 'averaged_perceptron_tagger',
-            'maxent_ne_chunker', 'words'
-        ]
-        
-        for requirement in nltk_requirements:
-            try:
-                nltk.data.find(f'tokenizers/{requirement}' if requirement == 'punkt' 
-                              else f'corpora/{requirement}' if requirement in ['stopwords', 'words']
-                              else f'taggers/{requirement}' if 'tagger' in requirement
-                              else f'chunkers/{requirement}')
-            except LookupError:
-                logger.info(f"Downloading NLTK data: {requirement}")
-                nltk.download(requirement, quiet=True)
-
-    def _setup_spacy_model(self):
-        """Setup spaCy model with fallback"""
-        try:
-            self.nlp = spacy.load("en_core_web_sm")
-            logger.info("✓ spaCy model 'en_core_web_sm' loaded successfully")
-        except OSError:
-            logger.warning("⚠️  spaCy model 'en_core_web_sm' not found. Using fallback parsing.")
-            logger.warning("Install it using: python -m spacy download en_core_web_sm")
-            self.nlp = None
-
-    def _initialize_skill_keywords(self):
-        """Initialize comprehensive skills keywords database"""
-        self.skills_keywords = {
-            'programming_languages': [
-                'python', 'java', 'javascript', 'typescript', 'c++', 'c#', 'php', 'ruby', 
-                'go', 'rust', 'swift', 'kotlin', 'scala', 'r', 'matlab', 'perl', 'bash', 
-                'powershell', 'html', 'css', 'sql', 'nosql', 'c', 'assembly', 'vba',
-                'dart', 'elixir', 'haskell', 'lua', 'objective-c', 'groovy', 'clojure'
-            ],
-            'frameworks_libraries': [
-                'django', 'flask', 'fastapi', 'react', 'angular', 'vue', 'svelte', 'spring',
-                'express', 'laravel', 'rails', 'asp.net', 'bootstrap', 'jquery', 'nodejs',
-                'tensorflow', 'pytorch', 'keras', 'scikit-learn', 'opencv', 'pandas', 'numpy',
-                'matplotlib', 'seaborn', 'plotly', 'streamlit', 'gradio', 'huggingface',
-                'next.js', 'nuxt.js', 'gatsby', 'redux', 'mobx', 'webpack', 'vite'
-            ],
-            'databases': [
-                'mysql', 'postgresql', 'mongodb', 'redis', 'sqlite', 'oracle', 'cassandra',
-                'elasticsearch', 'neo4j', 'dynamodb', 'firebase', 'supabase', 'mariadb',
-                'couchdb', 'influxdb', 'clickhouse', 'snowflake', 'bigquery'
-            ],
-            'cloud_devops': [
-                'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins', 'travis',
-                'ansible', 'terraform', 'vagrant', 'helm', 'istio', 'prometheus',
-                'grafana', 'elk', 'splunk', 'datadog', 'newrelic', 'ci/cd', 'gitlab-ci',
-                'github-actions', 'circleci', 'heroku', 'vercel', 'netlify'
-            ],
-            'tools_technologies': [
-                'git', 'github', 'gitlab', 'bitbucket', 'linux', 'windows', 'macos',
-                'jira', 'confluence', 'slack', 'teams', 'trello', 'asana', 'notion',
-                'figma', 'sketch', 'adobe', 'photoshop', 'illustrator', 'xd',
-                'postman', 'insomnia', 'swagger', 'apache', 'nginx', 'elasticsearch'
-            ],
-            'concepts_methodologies': [
-                'machine learning', 'artificial intelligence', 'deep learning', 'data science',
-                'web development', 'mobile development', 'devops', 'cloud computing',
-                'microservices', 'api', 'rest', 'graphql', 'agile', 'scrum', 'kanban',
-                'testing', 'automation', 'security', 'networking', 'blockchain',
-                'cybersecurity', 'data analysis', 'business intelligence', 'etl',
-                'big data', 'nlp', 'computer vision', 'iot', 'edge computing'
-            ],
-            'soft_skills': [
-                'leadership', 'communication', 'teamwork', 'problem solving', 'analytical',
-                'critical thinking', 'creativity', 'adaptability', 'time management',
-                'project management', 'collaboration', 'mentoring', 'presentation',
-                'negotiation', 'strategic thinking', 'innovation', 'customer service'
-            ]
-        }
-        
-        # Flatten all skills for easy searching
-        self.all_skills = []
-        for category in self.skills_keywords.values():
-            self.all_skills.extend(category)
+    @property
+    def nlp(self):
+        """spaCy pipeline, loaded on first use and shared process-wide"""
+        return load_spacy_model()
+
+    @property
+    def skill_matcher(self) -> SkillMatcher:
+        """Compiled skills taxonomy, shared process-wide and reloadable at runtime"""
+        return get_skill_matcher()
+
+    @property
+    def location_resolver(self) -> LocationResolver:
+        """Compiled locations gazetteer, shared process-wide"""
+        return get_location_resolver()
+
+    @property
+    def skills_keywords(self) -> Dict[str, List[str]]:
+        """Canonical skills by category, as listed in the taxonomy file"""
+        return self.skill_matcher.categories
+
+    @property
+    def all_skills(self) -> List[str]:
+        return self.skill_matcher.skills
 
     def _initialize_education_patterns(self):
         """Initialize education keywords and patterns"""
@@ -144,78 +221,88 @@ class ResumeParser:
             r'doctorate\s*(?:in\s+)?([^,\n.]*)'
         ]
 
-    def extract_text_from_pdf(self, file_path: str) -> str:
-        """Extract text from PDF file with enhanced error handling"""
-        try:
-            text = ""
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                
-                # Check if PDF is encrypted
-                if pdf_reader.is_encrypted:
-                    logger.warning(f"PDF {file_path} is encrypted. Attempting to decrypt...")
-                    try:
-                        pdf_reader.decrypt('')
-                    except:
-                        logger.error(f"Could not decrypt PDF {file_path}")
-                        return ""
-                
-                for page_num, page in enumerate(pdf_reader.pages):
-                    try:
-                        page_text = page.extract_text()
-                        if page_text:
-                            text += page_text + "\n"
-                    except Exception as e:
-                        logger.warning(f"Error extracting text from page {page_num + 1} of {file_path}: {str(e)}")
-                        continue
-            
-            return text.strip()
-        except Exception as e:
-            logger.error(f"Error reading PDF {file_path}: {str(e)}")
-            return ""
-
-    def extract_text_from_docx(self, file_path: str) -> str:
-        """Extract text from DOCX file with enhanced error handling"""
-        try:
-            doc = docx.Document(file_path)
-            text = ""
-            
-            # Extract text from paragraphs
-            for paragraph in doc.paragraphs:
-                if paragraph.text.strip():
-                    text += paragraph.text + "\n"
-            
-            # Extract text from tables
-            for table in doc.tables:
-                for row in table.rows:
-                    for cell in row.cells:
-                        if cell.text.strip():
-                            text += cell.text + " "
-                    text += "\n"
-            
-            return text.strip()
-        except Exception as e:
-            logger.error(f"Error reading DOCX {file_path}: {str(e)}")
-            return ""
-
-    def extract_text_from_txt(self, file_path: str) -> str:
-        """Extract text from TXT file with multiple encoding support"""
-        encodings = ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1']
+    def extract_text_from_pdf(self, source) -> str:
+        """Extract text from a PDF path, bytes or stream with the fastest installed backend"""
+        with opened_document(source) as document:
+            for backend in get_pdf_backends():
+                try:
+                    with metrics.time_stage(f'pdf_{backend.name}'), document.stream() as stream:
+                        text = backend.extract(stream)
+                    return text.strip()
+                except Exception as e:
+                    logger.warning(f"PDF backend {backend.name} could not read {document.name}: {str(e)}")
         
-        for encoding in encodings:
+        logger.error(f"Error reading PDF {document.name}: no PDF backend could extract it")
+        return ""
+
+    def extract_text_from_docx(self, source) -> str:
+        """Extract text from DOCX by streaming word/document.xml in document order"""
+        with opened_document(source) as document:
             try:
-                with open(file_path, 'r', encoding=encoding) as file:
-                    return file.read().strip()
-            except UnicodeDecodeError:
-                continue
+                with document.stream() as stream:
+                    return extract_docx_text(stream).strip()
             except Exception as e:
-                logger.error(f"Error reading TXT {file_path}: {str(e)}")
+                logger.error(f"Error reading DOCX {document.name}: {str(e)}")
                 return ""
-        
-        logger.error(f"Could not decode TXT file {file_path} with any encoding")
-        return ""
 
-    def extract_name(self, text: str) -> Optional[str]:
+    def extract_text_from_txt(self, source) -> str:
+        """Extract text from TXT, decoding the bytes once with encoding detection"""
+        with opened_document(source) as document:
+            return document.text().strip()
+
+    def extract_text(self, document: Document) -> Optional[str]:
+        """Extract text using the format sniffed from the document's bytes; None if unsupported"""
+        if document.file_type == 'pdf':
+            return self.extract_text_from_pdf(document)
+        if document.file_type == 'docx':
+            return self.extract_text_from_docx(document)
+        if document.file_type == 'txt':
+            return self.extract_text_from_txt(document)
+        return None
+
+    def _get_document_cache(self, text: str) -> Dict[str, Any]:
+        cache = self._document_cache
+        if cache['text'] is not text and cache['text'] != text:
+            cache = self._document_cache = {'text': text}
+        return cache
+
+    def clear_document_cache(self):
+        """Forget the shared per-document analyses, e.g. to time an extractor from cold"""
+        self._document_cache = {'text': None}
+
+    def get_sections(self, text: str):
+        """Segment text into labelled sections once per document"""
+        cache = self._get_document_cache(text)
+        if 'sections' not in cache:
+            with metrics.time_stage('segment_sections'):
+                cache['sections'] = self.section_segmenter.segment(text)
+        return cache['sections']
+
+    def get_contacts(self, text: str):
+        """Scan text for emails, phones and profile URLs once per document"""
+        cache = self._get_document_cache(text)
+        if 'contacts' not in cache:
+            with metrics.time_stage('scan_contacts'):
+                cache['contacts'] = self.contact_scanner.scan(text)
+        return cache['contacts']
+
+    def _run_nlp(self, text: str):
+        """Run the spaCy pipeline, recording its time as a separate stage"""
+        with metrics.time_stage('spacy'):
+            return self.nlp(text)
+
+    def _run_extractor(self, field: str, extractor, text: str, **kwargs):
+        """Run one field extractor with timing and success/failure counters"""
+        try:
+            with metrics.time_stage(extractor.__name__):
+                value = extractor(text, **kwargs)
+        except Exception as e:
+            metrics.record_field(field, None, error=e)
+            raise
+        metrics.record_field(field, value)
+        return value
+
+    def extract_name(self, text: str, use_nlp: bool = True) -> Optional[str]:
         """Extract name from resume text with improved accuracy"""
         lines = text.split('\n')
         
@@ -233,8 +320,8 @@ class ResumeParser:
                             return ' '.join(word.strip('.,') for word in words).title()
         
         # Strategy 2: Use spaCy if available
-        if self.nlp:
-            doc = self.nlp(text[:1000])  # Process first 1000 characters
+        if use_nlp and self.nlp:
+            doc = self._run_nlp(text[:1000])  # Process first 1000 characters
             person_entities = [ent.text.strip() for ent in doc.ents if ent.label_ == "PERSON"]
             
             if person_entities:
@@ -262,106 +349,18 @@ class ResumeParser:
 
     def extract_email(self, text: str) -> Optional[str]:
         """Extract email from resume text with improved validation"""
-        # Enhanced email pattern that handles more formats
-        email_pattern = r'\b[A-Za-z0-9]([A-Za-z0-9._%-]*[A-Za-z0-9])?@[A-Za-z0-9]([A-Za-z0-9.-]*[A-Za-z0-9])?\.[A-Za-z]{2,}\b'
-        emails = re.findall(email_pattern, text, re.IGNORECASE)
-        
-        if emails:
-            # Reconstruct full email from tuple groups
-            full_emails = []
-            for email_parts in emails:
-                if isinstance(email_parts, tuple):
-                    # This handles the case where regex groups are captured
-                    continue
-                else:
-                    full_emails.append(email_parts)
-            
-            # Simple pattern for complete emails
-            simple_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-            simple_emails = re.findall(simple_pattern, text, re.IGNORECASE)
-            
-            if simple_emails:
-                # Filter out obviously fake or template emails
-                valid_emails = [email for email in simple_emails 
-                              if not any(fake in email.lower() for fake in 
-                                       ['example', 'test', 'sample', 'dummy', 'placeholder'])]
-                return valid_emails[0] if valid_emails else simple_emails[0]
-        
-        return None
+        return self.get_contacts(text).email
 
     def extract_phone(self, text: str) -> Optional[str]:
-        """Extract phone number from resume text with international support"""
-        # Multiple phone patterns for different formats
-        phone_patterns = [
-            r'(\+91[-.\s]?)?[6789]\d{9}',  # Indian mobile numbers
-            r'(\+1[-.\s]?)?\(?[2-9]\d{2}\)?[-.\s]?[2-9]\d{2}[-.\s]?\d{4}',  # US numbers
-            r'(\+44[-.\s]?)?(?:0)?[1-9]\d{8,9}',  # UK numbers
-            r'(\+\d{1,3}[-.\s]?)?\d{10,14}',  # Generic international
-            r'\b\d{3}[-.\s]?\d{3}[-.\s]?\d{4}\b',  # Standard format
-            r'\(\d{3}\)\s*\d{3}[-.\s]?\d{4}',  # (xxx) xxx-xxxx format
-            r'\b\d{10}\b'  # 10 digit numbers
-        ]
-        
-        for pattern in phone_patterns:
-            matches = re.findall(pattern, text)
-            if matches:
-                phone = matches[0]
-                if isinstance(phone, tuple):
-                    phone = ''.join(phone)
-                
-                # Clean up the phone number
-                clean_phone = re.sub(r'[^\d+]', '', phone)
-                
-                # Validate length
-                if 10 <= len(clean_phone.replace('+', '')) <= 15:
-                    return clean_phone
-        
-        return None
+        """Extract phone number from resume text in E.164 format"""
+        return self.get_contacts(text).phone
 
     def extract_skills(self, text: str) -> Optional[List[str]]:
-        """Extract skills from resume text with enhanced matching"""
-        text_lower = text.lower()
-        found_skills = set()
-        
-        # Method 1: Direct keyword matching
-        for skill in self.all_skills:
-            skill_lower = skill.lower()
-            
-            # Exact match or word boundary match
-            if skill_lower in text_lower:
-                # Check if it's a whole word match for better accuracy
-                pattern = r'\b' + re.escape(skill_lower) + r'\b'
-                if re.search(pattern, text_lower):
-                    found_skills.add(skill.title())
-        
-        # Method 2: Skills section parsing
-        skills_sections = [
-            'skills', 'technical skills', 'core competencies', 'expertise',
-            'technologies', 'programming languages', 'tools', 'frameworks'
-        ]
-        
-        for section in skills_sections:
-            section_pattern = rf'{section}[:\-\s]*([^\n]*(?:\n[^\n]*)*?)(?=\n\s*[A-Z][^:\n]*:|$)'
-            match = re.search(section_pattern, text, re.IGNORECASE | re.MULTILINE)
-            
-            if match:
-                skills_text = match.group(1).lower()
-                for skill in self.all_skills:
-                    if skill.lower() in skills_text:
-                        found_skills.add(skill.title())
-        
-        # Method 3: Bullet point parsing
-        bullet_patterns = [r'•\s*([^\n]+)', r'▪\s*([^\n]+)', r'-\s*([^\n]+)', r'\*\s*([^\n]+)']
-        
-        for pattern in bullet_patterns:
-            matches = re.findall(pattern, text)
-            for match in matches:
-                match_lower = match.lower()
-                for skill in self.all_skills:
-                    if skill.lower() in match_lower:
-                        found_skills.add(skill.title())
-        
-        return list(found_skills) if found_skills else None
+        """Extract skills from resume text using the skills taxonomy and its aliases"""
+        # One trie pass over the tokens covers the skills section and bullet lists too
+        with metrics.time_stage('match_skills'):
+            found_skills = self.skill_matcher.match(text)
+        return [skill.title() for skill in found_skills] if found_skills else None
 
     def extract_education(self, text: str) -> Optional[List[str]]:
         """Extract education information with improved parsing"""
@@ -376,23 +375,14 @@ class ResumeParser:
                     education_info.add(match.strip().title())
         
         # Method 2: Education section parsing
-        education_patterns = [
-            r'education[:\-\s]*([^\n]*(?:\n[^\n]*)*?)(?=\n\s*[A-Z][^:\n]*:|$)',
-            r'academic.*?(?:background|qualification|record)[:\-\s]*([^\n]*(?:\n[^\n]*)*?)(?=\n\s*[A-Z][^:\n]*:|$)',
-            r'qualification[s]?[:\-\s]*([^\n]*(?:\n[^\n]*)*?)(?=\n\s*[A-Z][^:\n]*:|$)'
-        ]
-        
-        for pattern in education_patterns:
-            match = re.search(pattern, text, re.IGNORECASE | re.MULTILINE)
-            if match:
-                edu_section = match.group(1)
-                
-                # Extract degree information from the section
-                for degree_pattern in self.degree_patterns:
-                    degree_matches = re.findall(degree_pattern, edu_section, re.IGNORECASE)
-                    for degree_match in degree_matches:
-                        if degree_match.strip():
-                            education_info.add(degree_match.strip().title())
+        edu_section = self.get_sections(text).get('education')
+        if edu_section:
+            # Extract degree information from the section
+            for degree_pattern in self.degree_patterns:
+                degree_matches = re.findall(degree_pattern, edu_section, re.IGNORECASE)
+                for degree_match in degree_matches:
+                    if degree_match.strip():
+                        education_info.add(degree_match.strip().title())
         
         # Method 3: Look for university/institution names
         university_patterns = [
@@ -422,147 +412,148 @@ class ResumeParser:
         return cleaned_education if cleaned_education else None
 
     def extract_location(self, text: str) -> Optional[str]:
-        """Extract location from resume text with enhanced patterns"""
-        # Enhanced location patterns
-        location_patterns = [
-            r'(?:address|location|city|residence|based\s+in)[:\-\s]*([^,\n]+(?:,\s*[^,\n]+)*)',
-            r'\b([A-Za-z\s]+,\s*[A-Za-z\s]+,\s*\d{5,6})\b',  # City, State, PIN
-            r'\b([A-Za-z\s]+,\s*[A-Za-z\s]+)\b(?=\s*\d{5,6})',  # City, State before PIN
-            r'(?:from|in)\s+([A-Za-z\s]+,\s*[A-Za-z\s]+)',  # "from City, State"
-            r'\b(\d{5,6})\s*,?\s*([A-Za-z\s]+(?:,\s*[A-Za-z\s]+)?)\b'  # PIN, City, State
-        ]
-        
-        for pattern in location_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            if matches:
-                location = matches[0]
-                if isinstance(location, tuple):
-                    location = ', '.join(filter(None, location))
-                
-                location = location.strip()
-                if 3 < len(location) < 100:
-                    return location
-        
-        # Use spaCy for location extraction if available
-        if self.nlp:
-            doc = self.nlp(text)
-            locations = []
-            for ent in doc.ents:
-                if ent.label_ in ["GPE", "LOC"]:  # Geopolitical entity or location
-                    locations.append(ent.text)
-            
-            if locations:
-                return ", ".join(locations[:2])  # Return first two locations
+        """Extract the candidate's location, normalised against the offline gazetteer"""
+        location = self.location_resolver.resolve(text)
+        if location:
+            return location
+        
+        # Places missing from the gazetteer: take an explicitly labelled line as written
+        match = LOCATION_LABEL_PATTERN.search(text)
+        if match:
+            location = match.group(1).strip(' ,.-')
+            if 3 < len(location) < 100:
+                return location
         
         return None
 
     def extract_experience(self, text: str) -> Optional[float]:
         """Extract total years of experience with improved accuracy"""
-        text_lower = text.lower()
-        
-        # Enhanced experience patterns
-        experience_patterns = [
-            r'(\d+(?:\.\d+)?)\s*(?:\+)?\s*years?\s+(?:of\s+)?(?:work\s+)?experience',
-            r'experience.*?(\d+(?:\.\d+)?)\s*(?:\+)?\s*years?',
-            r'(\d+(?:\.\d+)?)\s*(?:\+)?\s*yrs?\s+(?:of\s+)?(?:work\s+)?experience',
-            r'experience.*?(\d+(?:\.\d+)?)\s*(?:\+)?\s*yrs?',
-            r'(\d+(?:\.\d+)?)\s*(?:\+)?\s*years?\s+(?:in|of|with)',
-            r'over\s+(\d+(?:\.\d+)?)\s*years?',
-            r'more\s+than\s+(\d+(?:\.\d+)?)\s*years?',
-            r'(\d+(?:\.\d+)?)\+\s*years?'
-        ]
-        
-        years = []
-        
-        for pattern in experience_patterns:
-            matches = re.findall(pattern, text_lower)
-            for match in matches:
-                try:
-                    year_value = float(match)
-                    if 0 <= year_value <= 50:  # Reasonable range
-                        years.append(year_value)
-                except ValueError:
-                    continue
-        
-        if years:
-            return max(years)  # Return the highest experience mentioned
-        
-        # Try to calculate from employment dates
-        date_patterns = [
-            r'(\d{4})\s*[-–—]\s*(\d{4}|present|current)',
-            r'(\w+\s+\d{4})\s*[-–—]\s*(\w+\s+\d{4}|present|current)',
-            r'(\d{1,2}/\d{4})\s*[-–—]\s*(\d{1,2}/\d{4}|present|current)'
-        ]
-        
-        employment_years = []
-        current_year = datetime.now().year
-        
-        for pattern in date_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for match in matches:
-                try:
-                    start_str, end_str = match
-                    
-                    # Extract start year
-                    start_year_match = re.search(r'\d{4}', start_str)
-                    if not start_year_match:
-                        continue
-                    start_year = int(start_year_match.group())
-                    
-                    # Extract end year
-                    if any(word in end_str.lower() for word in ['present', 'current', 'now']):
-                        end_year = current_year
-                    else:
-                        end_year_match = re.search(r'\d{4}', end_str)
-                        if not end_year_match:
-                            continue
-                        end_year = int(end_year_match.group())
-                    
-                    # Validate years
-                    if 1990 <= start_year <= current_year and start_year <= end_year:
-                        employment_years.append(end_year - start_year)
-                
-                except (ValueError, AttributeError):
-                    continue
-        
-        return sum(employment_years) if employment_years else None
+        # Prefer an explicitly stated figure, e.g. "5+ years of experience"
+        years = stated_years(text)
+        if years is not None:
+            return years
+        
+        # Otherwise merge dated employment ranges so overlapping roles count once
+        timeline = self.extract_employment_timeline(text)
+        return timeline.total_years if timeline.total_months else None
+
+    def extract_employment_timeline(self, text: str) -> EmploymentTimeline:
+        """Build the per-role employment timeline, ignoring education dates"""
+        return build_timeline(text, self.get_sections(text))
+
+    def parse_resume(self, source, mode: str = PARSE_MODE_FULL, fields: Optional[List[str]] = None,
+                     name: Optional[str] = None, additional_info: bool = False) -> Optional[Dict[str, Any]]:
+        """Parse a single resume from a path, bytes or binary file-like object.
 
-    def parse_resume(self, file_path: str) -> Optional[Dict[str, Any]]:
-        """Parse a single resume file and extract information"""
+        additional_info also extracts certifications, languages, urls and the
+        employment timeline, within the same limits as the other fields.
+        """
+        selected = resolve_fields(mode, fields)
+        if not additional_info:
+            selected -= {'additional_info'}
+        # Sample here: a forked worker's draw would never advance this process's RNG
+        profile = bool(self.profiler and self.profiler.should_sample())
+        with opened_document(source, name) as document:
+            if self.limits:
+                return self._parse_limited(document, mode, selected, profile)
+            return self._parse_profiled(document, mode, selected, profile)
+
+    def _parse_profiled(self, document: Document, mode: str, selected: frozenset,
+                        profile: bool = False) -> Optional[Dict[str, Any]]:
+        if profile:
+            with self.profiler.profile(document.path or document.name, document.digest()):
+                return self._parse_resume(document, mode, selected)
+        return self._parse_resume(document, mode, selected)
+
+    def _parse_in_worker(self, document: Document, mode: str, selected: frozenset, profile: bool = False):
+        """Entry point inside the limited worker process; returns result and statistics"""
+        self.reset_statistics()
+        parsed_data = self._parse_profiled(document, mode, selected, profile)
+        return parsed_data, self.processing_stats
+
+    def _parse_limited(self, document: Document, mode: str, selected: frozenset,
+                       profile: bool = False) -> Optional[Dict[str, Any]]:
+        """Parse under self.limits, killing the worker if a limit is exceeded"""
+        file_type = document.file_type
+        if file_type == 'pdf':
+            # Select the PDF backend here so forked workers inherit it instead of recalibrating
+            get_pdf_backends()
+        try:
+            if not self.limits.isolated:
+                return run_with_limits(
+                    self._parse_profiled, (document, mode, selected, profile), document.name, self.limits,
+                    document.size
+                )
+            # The forked worker inherits the document buffer; nothing is re-read from disk
+            parsed_data, stats = run_with_limits(
+                self._parse_in_worker, (document, mode, selected, profile), document.name, self.limits,
+                document.size
+            )
+            self._merge_statistics(stats)
+            return parsed_data
+        except ParseLimitExceeded as e:
+            logger.error(f"✗ {e.status.title()} parsing {document.name}: {str(e)}")
+            metrics.FILES_PARSED.inc(file_type=file_type, status=e.status)
+            self.processing_stats['failed_files'].append({
+                'file': document.name,
+                'error': str(e),
+                'status': e.status
+            })
+            raise
+        except RuntimeError as e:
+            logger.error(f"✗ Error parsing {document.name}: {str(e)}")
+            metrics.FILES_PARSED.inc(file_type=file_type, status='error')
+            self.processing_stats['failed_files'].append({
+                'file': document.name,
+                'error': str(e)
+            })
+            return None
+
+    def _merge_statistics(self, stats: Dict[str, Any]):
+        """Fold statistics gathered in a worker process into this parser"""
+        self.processing_stats['total_processed'] += stats['total_processed']
+        for field, count in stats['successful_extractions'].items():
+            self.processing_stats['successful_extractions'][field] += count
+        self.processing_stats['failed_files'].extend(stats['failed_files'])
+
+    def _parse_resume(self, document: Document, mode: str, selected: frozenset) -> Optional[Dict[str, Any]]:
         start_time = datetime.now()
+        file_type = document.file_type
         
         try:
-            # Determine file type and extract text
-            file_extension = os.path.splitext(file_path)[1].lower()
-            
-            if file_extension == '.pdf':
-                text = self.extract_text_from_pdf(file_path)
-            elif file_extension == '.docx':
-                text = self.extract_text_from_docx(file_path)
-            elif file_extension == '.txt':
-                text = self.extract_text_from_txt(file_path)
-            else:
-                logger.error(f"Unsupported file format: {file_extension}")
+            # Pick the extractor from the sniffed format, not the file extension
+            with metrics.time_stage('text_extraction'):
+                text = self.extract_text(document)
+            if text is None:
+                logger.error(f"Unsupported file format: {document.name} ({file_type})")
+                metrics.FILES_PARSED.inc(file_type=file_type, status='unsupported')
                 return None
             
             if not text.strip():
-                logger.warning(f"No text extracted from {file_path}")
+                logger.warning(f"No text extracted from {document.name}")
+                metrics.FILES_PARSED.inc(file_type=file_type, status='empty')
                 return None
             
-            # Extract information
+            # Extract information; unselected extractors are skipped and the quick tier never runs spaCy
+            quick = mode == PARSE_MODE_QUICK
             parsed_data = {
-                'file_name': os.path.basename(file_path),
-                'file_path': file_path,
-                'name': self.extract_name(text),
-                'email': self.extract_email(text),
-                'phone_number': self.extract_phone(text),
-                'skills': self.extract_skills(text),
-                'education': self.extract_education(text),
-                'location': self.extract_location(text),
-                'total_experience': self.extract_experience(text),
-                'processed_at': datetime.now().isoformat(),
-                'processing_time': (datetime.now() - start_time).total_seconds()
+                'file_name': document.name,
+                'file_path': document.path,
+                'file_hash': document.digest()
             }
+            for field, method in FIELD_EXTRACTORS:
+                if field not in selected:
+                    parsed_data[field] = None
+                    continue
+                kwargs = {'use_nlp': not quick} if field in NLP_FIELDS else {}
+                parsed_data[field] = self._run_extractor(field, getattr(self, method), text, **kwargs)
+            if 'additional_info' in selected:
+                parsed_data.update(self._run_extractor('additional_info', self.extract_additional_info, text))
+            if self.keep_text:
+                parsed_data['text'] = text
+            parsed_data['parse_mode'] = mode
+            parsed_data['processed_at'] = datetime.now().isoformat()
+            parsed_data['processing_time'] = (datetime.now() - start_time).total_seconds()
             
             # Update statistics
             self.processing_stats['total_processed'] += 1
@@ -570,18 +561,25 @@ class ResumeParser:
                 if parsed_data.get(field):
                     self.processing_stats['successful_extractions'][field] += 1
             
-            logger.info(f"✓ Successfully parsed {os.path.basename(file_path)}")
+            metrics.FILES_PARSED.inc(file_type=file_type, status='success')
+            metrics.PARSE_SECONDS.observe(parsed_data['processing_time'], file_type=file_type)
+            logger.info(f"✓ Successfully parsed {document.name}")
             return parsed_data
             
+        except MemoryError:
+            # Let the limited worker report this file as oversize
+            raise
         except Exception as e:
-            logger.error(f"✗ Error parsing {file_path}: {str(e)}")
+            logger.error(f"✗ Error parsing {document.name}: {str(e)}")
+            metrics.FILES_PARSED.inc(file_type=file_type, status='error')
             self.processing_stats['failed_files'].append({
-                'file': os.path.basename(file_path),
+                'file': document.name,
                 'error': str(e)
             })
             return None
 
-    def parse_multiple_resumes(self, folder_path: str) -> List[Dict[str, Any]]:
+    def parse_multiple_resumes(self, folder_path: str, mode: str = PARSE_MODE_FULL,
+                               fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
         """Parse multiple resume files from a folder"""
         supported_extensions = ['.pdf', '.docx', '.txt']
         parsed_resumes = []
@@ -608,7 +606,7 @@ class ResumeParser:
             logger.info(f"Processing {i}/{len(files)}: {filename}")
             
             try:
-                parsed_data = self.parse_resume(file_path)
+                parsed_data = self.parse_resume(file_path, mode, fields)
                 if parsed_data:
                     parsed_resumes.append(parsed_data)
             except Exception as e:
@@ -715,9 +713,19 @@ class ResumeParser:
                 for failed in stats['failed_files']:
                     print(f"  - {failed['file']}: {failed['error']}")
 
-    def save_to_json(self, parsed_resumes: List[Dict[str, Any]], output_file: str = 'parsed_resumes.json'):
+    def save_to_json(self, parsed_resumes: List[Dict[str, Any]], output_file: str = 'parsed_resumes.json',
+                     compress: Optional[bool] = None):
         """Save parsed results to JSON file with metadata"""
         try:
+            if compress and not output_file.endswith(result_serializer.GZIP_SUFFIX):
+                # Readers detect gzip by the suffix, so a compressed file must carry it
+                output_file += result_serializer.GZIP_SUFFIX
+            if output_file.endswith(f'.ndjson{result_serializer.GZIP_SUFFIX}') or output_file.endswith('.ndjson'):
+                # NDJSON holds records only, streamed one per line
+                result_serializer.write_ndjson(parsed_resumes, output_file, compress)
+                logger.info(f"✓ Results saved to {output_file}")
+                return True
+
             # Prepare data with metadata
             export_data = {
                 'metadata': {
@@ -729,8 +737,7 @@ class ResumeParser:
                 'resumes': parsed_resumes
             }
             
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(export_data, f, indent=2, ensure_ascii=False)
+            result_serializer.write_json(export_data, output_file, compress)
             
             logger.info(f"✓ Results saved to {output_file}")
             return True
@@ -745,6 +752,7 @@ class ResumeParser:
             if not parsed_resumes:
                 logger.warning("No resumes to export to Excel.")
                 return False
+            import pandas as pd
             df = pd.DataFrame(parsed_resumes)
             df.to_excel(output_file, index=False)
             logger.info(f"✓ Results exported to {output_file}")
@@ -817,14 +825,20 @@ class ResumeParser:
         """Extract additional information like certifications, languages, etc."""
         additional_info = {}
         
+        sections = self.get_sections(text)
+        
         # Extract certifications
         cert_patterns = [
-            r'certifications?[:\-\s]*([^\n]*(?:\n[^\n]*)*?)(?=\n\s*[A-Z][^:\n]*:|$)',
             r'certified?\s+in\s+([^\n,]+)',
             r'certificate\s+in\s+([^\n,]+)'
         ]
         
         certifications = set()
+        for line in sections.lines('certifications'):
+            line = line.strip().lstrip('•▪*-').strip()
+            if len(line) > 3:
+                certifications.add(line.title())
+        
         for pattern in cert_patterns:
             matches = re.findall(pattern, text, re.IGNORECASE | re.MULTILINE)
             for match in matches:
@@ -836,7 +850,6 @@ class ResumeParser:
         
         # Extract languages
         lang_patterns = [
-            r'languages?[:\-\s]*([^\n]*(?:\n[^\n]*)*?)(?=\n\s*[A-Z][^:\n]*:|$)',
             r'fluent\s+in\s+([^\n,]+)',
             r'native\s+([^\n,]+)\s+speaker'
         ]
@@ -853,76 +866,58 @@ class ResumeParser:
             if lang in text_lower:
                 languages.add(lang.title())
         
+        language_sources = [sections.get('languages')]
         for pattern in lang_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE | re.MULTILINE)
-            for match in matches:
-                if match.strip():
-                    # Extract individual languages from the match
-                    lang_words = re.findall(r'\b[A-Za-z]+\b', match)
-                    for word in lang_words:
-                        if word.lower() in common_languages:
-                            languages.add(word.title())
+            language_sources.extend(re.findall(pattern, text, re.IGNORECASE | re.MULTILINE))
+        
+        for match in language_sources:
+            if match.strip():
+                # Extract individual languages from the match
+                lang_words = re.findall(r'\b[A-Za-z]+\b', match)
+                for word in lang_words:
+                    if word.lower() in common_languages:
+                        languages.add(word.title())
         
         if languages:
             additional_info['languages'] = list(languages)
         
         # Extract social media/portfolio links
-        url_patterns = [
-            r'(?:https?://)?(?:www\.)?linkedin\.com/in/[\w\-]+',
-            r'(?:https?://)?(?:www\.)?github\.com/[\w\-]+',
-            r'(?:https?://)?(?:www\.)?[\w\-]+\.(?:com|org|net|io)/[\w\-/]*',
-        ]
-        
-        urls = set()
-        for pattern in url_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for match in matches:
-                if match.strip():
-                    urls.add(match.strip())
-        
+        urls = self.get_contacts(text).urls
         if urls:
             additional_info['urls'] = list(urls)
         
+        # Per-role employment timeline
+        timeline = self.extract_employment_timeline(text)
+        if timeline.intervals:
+            additional_info['employment_timeline'] = timeline.roles()
+        
         return additional_info
 
-    def parse_resume_enhanced(self, file_path: str) -> Optional[Dict[str, Any]]:
+    def parse_resume_enhanced(self, source, mode: str = PARSE_MODE_FULL,
+                              fields: Optional[List[str]] = None, name: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """Enhanced resume parsing with additional information extraction"""
-        # Get basic parsed data
-        parsed_data = self.parse_resume(file_path)
+        # The additional information is extracted in the same (limited) parse, from the same text
+        parsed_data = self.parse_resume(source, mode, fields, name, additional_info=True)
         
         if not parsed_data:
             return None
         
-        # Extract text again for additional processing
-        file_extension = os.path.splitext(file_path)[1].lower()
-        
-        if file_extension == '.pdf':
-            text = self.extract_text_from_pdf(file_path)
-        elif file_extension == '.docx':
-            text = self.extract_text_from_docx(file_path)
-        elif file_extension == '.txt':
-            text = self.extract_text_from_txt(file_path)
-        else:
-            return parsed_data
-        
-        # Get additional information
-        additional_info = self.extract_additional_info(text)
-        parsed_data.update(additional_info)
-        
         # Validate and clean data
         validated_data = self.validate_extracted_data(parsed_data)
         
         return validated_data
 
     def batch_process_with_progress(self, file_paths: List[str], 
-                                  progress_callback: Optional[callable] = None) -> List[Dict[str, Any]]:
+                                  progress_callback: Optional[callable] = None,
+                                  mode: str = PARSE_MODE_FULL,
+                                  fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
         """Process multiple files with progress tracking"""
         parsed_resumes = []
         total_files = len(file_paths)
         
         for i, file_path in enumerate(file_paths):
             try:
-                parsed_data = self.parse_resume_enhanced(file_path)
+                parsed_data = self.parse_resume_enhanced(file_path, mode, fields)
                 if parsed_data:
                     parsed_resumes.append(parsed_data)
                 
@@ -987,24 +982,46 @@ if __name__ == "__main__":
     parser_cli = argparse.ArgumentParser(description='Resume Parser - Enhanced Version')
     parser_cli.add_argument('--file', '-f', help='Single file to parse')
     parser_cli.add_argument('--folder', '-d', help='Folder containing resume files')
-    parser_cli.add_argument('--output', '-o', help='Output JSON file', default='parsed_resumes.json')
+    parser_cli.add_argument('--output', '-o', help='Output JSON file (.ndjson for line-delimited, .gz to compress)',
+                            default='parsed_resumes.json')
+    parser_cli.add_argument('--gzip', '-z', action='store_true', help='Gzip-compress the JSON output')
     parser_cli.add_argument('--excel', '-x', help='Output Excel file', default=None)
     parser_cli.add_argument('--stats', '-s', action='store_true', help='Show detailed statistics')
     parser_cli.add_argument('--validate', '-v', action='store_true', help='Validate extracted data')
+    parser_cli.add_argument('--mode', '-m', choices=PARSE_MODES, default=PARSE_MODE_FULL,
+                            help='Parsing tier: full (all fields, spaCy) or quick (regex-only triage)')
+    parser_cli.add_argument('--fields', nargs='+', choices=PARSEABLE_FIELDS, default=None,
+                            help='Only extract these fields (others are skipped and left empty)')
+    parser_cli.add_argument('--timeout', type=float, default=None,
+                            help='Per-file wall-clock limit in seconds (file is skipped as timeout)')
+    parser_cli.add_argument('--memory-limit', type=int, default=None,
+                            help='Per-file memory allowance in MB (file is skipped as oversize)')
+    parser_cli.add_argument('--profile-rate', type=float, default=0.0,
+                            help='Fraction of files to profile with cProfile/tracemalloc (0-1)')
+    parser_cli.add_argument('--profile-dir', default='diagnostics', help='Directory for profile dumps')
     
     args = parser_cli.parse_args()
     
     # Create parser instance
-    resume_parser = ResumeParser()
+    profiler = None
+    if args.profile_rate > 0:
+        from profiling import ParseProfiler
+        profiler = ParseProfiler(args.profile_dir, args.profile_rate)
+    limits = ParseLimits(args.timeout, args.memory_limit) if (args.timeout or args.memory_limit) else None
+    resume_parser = ResumeParser(profiler=profiler, limits=limits)
     
     if args.file:
         # Parse single file
         print(f"Parsing single file: {args.file}")
-        result = resume_parser.parse_resume_enhanced(args.file)
+        try:
+            result = resume_parser.parse_resume_enhanced(args.file, args.mode, args.fields)
+        except ParseLimitExceeded:
+            # Already logged with its timeout/oversize status
+            result = None
         if result:
             print(json.dumps(result, indent=2, ensure_ascii=False))
             if args.output:
-                resume_parser.save_to_json([result], args.output)
+                resume_parser.save_to_json([result], args.output, args.gzip or None)
             if args.excel:
                 resume_parser.save_to_excel([result], args.excel)
         else:
@@ -1013,11 +1030,11 @@ if __name__ == "__main__":
     elif args.folder:
         # Parse folder
         print(f"Parsing folder: {args.folder}")
-        results = resume_parser.parse_multiple_resumes(args.folder)
+        results = resume_parser.parse_multiple_resumes(args.folder, args.mode, args.fields)
         if results:
             resume_parser.display_results(results)
             if args.output:
-                resume_parser.save_to_json(results, args.output)
+                resume_parser.save_to_json(results, args.output, args.gzip or None)
             if args.excel:
                 resume_parser.save_to_excel(results, args.excel)
             if args.stats:
@@ -0,0 +1,370 @@
+import re
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import List, Dict, Optional, Any, Iterable, Set, Tuple
+
+from skills_taxonomy import tokenize
+
+# Query field -> record field indexed as positional text
+TEXT_FIELDS = {
+    'skills': 'skills', 'skill': 'skills',
+    'education': 'education', 'edu': 'education',
+    'location': 'location', 'loc': 'location',
+    'certifications': 'certifications', 'certification': 'certifications', 'cert': 'certifications',
+    'languages': 'languages', 'language': 'languages', 'lang': 'languages',
+    'name': 'name',
+    'text': None  # the full extracted text, same as an unqualified term
+}
+# Query field -> numeric record field supporting comparisons
+NUMERIC_FIELDS = {
+    'total_experience': 'total_experience', 'experience': 'total_experience',
+    'exp': 'total_experience', 'years': 'total_experience'
+}
+INDEXED_TEXT_FIELDS = sorted({field for field in TEXT_FIELDS.values() if field})
+INDEXED_NUMERIC_FIELDS = sorted(set(NUMERIC_FIELDS.values()))
+
+_TOKEN_PATTERN = re.compile(r'''
+    \s*(?:
+        (?P<lparen>\() | (?P<rparen>\)) | (?P<not>-)(?=[^\s-]) |
+        (?P<field>[A-Za-z_]+)\s*(?P<op>>=|<=|!=|[:><=])\s* |
+        "(?P<phrase>[^"]*)" |
+        (?P<word>[^\s()"]+)
+    )''', re.VERBOSE)
+KEYWORDS = {'and': 'AND', 'or': 'OR', 'not': 'NOT', '&&': 'AND', '||': 'OR'}
+
+
+class QuerySyntaxError(ValueError):
+    """The query does not follow the search grammar"""
+
+
+def _lex(query: str) -> List[Tuple[str, Any]]:
+    tokens = []
+    position = 0
+    query = query.rstrip()
+    while position < len(query):
+        match = _TOKEN_PATTERN.match(query, position)
+        if not match or match.end() == position:
+            raise QuerySyntaxError(f"Unexpected character at position {position}: {query[position]!r}")
+        position = match.end()
+        kind = match.lastgroup
+        if kind == 'op':
+            tokens.append(('field', (match.group('field').lower(), match.group('op'))))
+        elif kind == 'word' and match.group('word').lower() in KEYWORDS:
+            tokens.append((KEYWORDS[match.group('word').lower()], None))
+        elif kind == 'not':
+            tokens.append(('NOT', None))
+        else:
+            tokens.append((kind, match.group(kind)))
+    return tokens
+
+
+class _QueryParser:
+    """Recursive descent over: or := and (OR and)*, and := not ([AND] not)*,
+    not := NOT not | atom, atom := ( or ) | field op value | "phrase" | word"""
+
+    def __init__(self, tokens: List[Tuple[str, Any]]):
+        self.tokens = tokens
+        self.position = 0
+
+    def peek(self) -> Optional[str]:
+        return self.tokens[self.position][0] if self.position < len(self.tokens) else None
+
+    def take(self) -> Tuple[str, Any]:
+        token = self.tokens[self.position]
+        self.position += 1
+        return token
+
+    def parse(self):
+        if not self.tokens:
+            raise QuerySyntaxError("Query is empty")
+        node = self.parse_or()
+        if self.peek() is not None:
+            raise QuerySyntaxError(f"Unexpected {self.peek()!r} in query")
+        return node
+
+    def parse_or(self):
+        children = [self.parse_and()]
+        while self.peek() == 'OR':
+            self.take()
+            children.append(self.parse_and())
+        return children[0] if len(children) == 1 else ('or', children)
+
+    def parse_and(self):
+        children = [self.parse_not()]
+        while self.peek() not in (None, 'OR', 'rparen'):
+            if self.peek() == 'AND':
+                self.take()
+            children.append(self.parse_not())
+        return children[0] if len(children) == 1 else ('and', children)
+
+    def parse_not(self):
+        if self.peek() == 'NOT':
+            self.take()
+            return ('not', self.parse_not())
+        return self.parse_atom()
+
+    def parse_atom(self):
+        kind = self.peek()
+        if kind is None:
+            raise QuerySyntaxError("Query ends unexpectedly")
+        kind, value = self.take()
+        if kind == 'lparen':
+            node = self.parse_or()
+            if self.peek() != 'rparen':
+                raise QuerySyntaxError("Missing closing parenthesis")
+            self.take()
+            return node
+        if kind in ('word', 'phrase'):
+            return self.text_clause(None, value)
+        if kind == 'field':
+            return self.field_clause(*value)
+        raise QuerySyntaxError(f"Unexpected {kind!r} in query")
+
+    def field_clause(self, name: str, op: str):
+        if self.peek() not in ('word', 'phrase'):
+            raise QuerySyntaxError(f"Missing value after {name}{op}")
+        _, value = self.take()
+        if name in NUMERIC_FIELDS:
+            try:
+                number = float(value)
+            except ValueError:
+                raise QuerySyntaxError(f"{name} needs a number, got {value!r}")
+            return ('range', NUMERIC_FIELDS[name], '=' if op == ':' else op, number)
+        if name not in TEXT_FIELDS:
+            known = ', '.join(sorted(set(TEXT_FIELDS) | set(NUMERIC_FIELDS)))
+            raise QuerySyntaxError(f"Unknown field {name!r}. Expected one of {known}")
+        if op != ':':
+            raise QuerySyntaxError(f"{name} only supports ':'")
+        return self.text_clause(TEXT_FIELDS[name], value)
+
+    @staticmethod
+    def text_clause(field: Optional[str], value: str):
+        tokens = tokenize(value)
+        if not tokens:
+            raise QuerySyntaxError(f"Nothing searchable in {value!r}")
+        return ('phrase', field, tokens)
+
+
+def parse_query(query: str):
+    """Parse a query into a tree of ('and'|'or', children), ('not', child),
+    ('phrase', field, tokens) and ('range', field, op, number) nodes.
+
+    Unqualified words and "quoted phrases" search the full resume text;
+    adjacent clauses are ANDed and NOT binds tighter than AND, which binds
+    tighter than OR.
+    """
+    return _QueryParser(_lex(query)).parse()
+
+
+class _Postings:
+    """Documents containing a term and the term's positions in each, as flat arrays"""
+
+    __slots__ = ('docs', 'starts', 'positions')
+
+    def __init__(self):
+        self.docs = array('I')
+        self.starts = array('I')
+        self.positions = array('I')
+
+    def positions_of(self, doc_id: int) -> array:
+        index = bisect_left(self.docs, doc_id)
+        end = self.starts[index + 1] if index + 1 < len(self.starts) else len(self.positions)
+        return self.positions[self.starts[index]:end]
+
+
+class SearchIndex:
+    """Positional inverted index over resume text and parsed fields.
+
+    Documents are indexed once at ingest; a query touches only the postings
+    of its terms. Field terms live in the same index under "field:token".
+    Re-adding a key tombstones its previous document, and rebuild() drops
+    the tombstones.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, _Postings] = {}
+        # doc id -> key, None once superseded or removed
+        self._keys: List[Optional[str]] = []
+        self._doc_ids: Dict[str, int] = {}
+        self._live: Set[int] = set()
+        # numeric field -> (values, doc ids in the same order), sorted by value
+        # on the first range query after an add rather than on every insert
+        self._numeric: Dict[str, Tuple[array, array]] = {
+            field: (array('d'), array('I')) for field in INDEXED_NUMERIC_FIELDS
+        }
+        self._unsorted: Set[str] = set()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]]) -> 'SearchIndex':
+        index = cls()
+        index.rebuild(records)
+        return index
+
+    def _index_tokens(self, prefix: str, doc_id: int, values: Iterable[str]):
+        occurrences: Dict[str, List[int]] = {}
+        position = 0
+        for value in values:
+            for token in tokenize(value):
+                occurrences.setdefault(prefix + token, []).append(position)
+                position += 1
+            # Skip a position so phrases never match across two list items
+            position += 1
+        all_postings = self._postings
+        for term, positions in occurrences.items():
+            postings = all_postings.get(term)
+            if postings is None:
+                postings = all_postings[term] = _Postings()
+            # Doc ids only grow, so docs stays sorted for bisect
+            postings.docs.append(doc_id)
+            postings.starts.append(len(postings.positions))
+            postings.positions.extend(positions)
+
+    def add(self, key: str, record: Dict[str, Any]):
+        """Index one parsed resume, replacing any earlier version with the same key"""
+        with self._lock:
+            self._remove(key)
+            doc_id = len(self._keys)
+            self._keys.append(key)
+            self._doc_ids[key] = doc_id
+            self._live.add(doc_id)
+
+            if record.get('text'):
+                self._index_tokens('', doc_id, [record['text']])
+            for field in INDEXED_TEXT_FIELDS:
+                value = record.get(field)
+                if value:
+                    self._index_tokens(field + ':', doc_id, [value] if isinstance(value, str) else value)
+            for field in INDEXED_NUMERIC_FIELDS:
+                value = record.get(field)
+                if isinstance(value, (int, float)):
+                    values, doc_ids = self._numeric[field]
+                    values.append(value)
+                    doc_ids.append(doc_id)
+                    self._unsorted.add(field)
+
+    def _remove(self, key: str) -> bool:
+        doc_id = self._doc_ids.pop(key, None)
+        if doc_id is None:
+            return False
+        self._keys[doc_id] = None
+        self._live.discard(doc_id)
+        return True
+
+    def remove(self, key: str) -> bool:
+        with self._lock:
+            return self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._postings.clear()
+            self._keys.clear()
+            self._doc_ids.clear()
+            self._live.clear()
+            self._numeric = {field: (array('d'), array('I')) for field in INDEXED_NUMERIC_FIELDS}
+            self._unsorted.clear()
+
+    def rebuild(self, records: Iterable[Dict[str, Any]]):
+        """Reset the index from stored records, keyed like the results log"""
+        self.clear()
+        for position, record in enumerate(records):
+            self.add(record.get('file_hash') or str(position), record)
+
+    def __len__(self):
+        return len(self._live)
+
+    def _match_phrase(self, field: Optional[str], tokens: List[str]) -> Set[int]:
+        prefix = field + ':' if field else ''
+        postings = [self._postings.get(prefix + token) for token in tokens]
+        if any(entry is None for entry in postings):
+            return set()
+        # Intersect from the rarest term
+        by_size = sorted(postings, key=lambda entry: len(entry.docs))
+        docs = set(by_size[0].docs)
+        for entry in by_size[1:]:
+            docs.intersection_update(entry.docs)
+            if not docs:
+                return docs
+        if len(tokens) == 1:
+            return docs
+
+        matched = set()
+        for doc_id in docs:
+            starts = set(postings[0].positions_of(doc_id))
+            for offset, entry in enumerate(postings[1:], 1):
+                starts.intersection_update(position - offset for position in entry.positions_of(doc_id))
+                if not starts:
+                    break
+            if starts:
+                matched.add(doc_id)
+        return matched
+
+    def _sorted_numeric(self, field: str) -> Tuple[array, array]:
+        values, doc_ids = self._numeric[field]
+        if field in self._unsorted:
+            # Timsort only has to place the values appended since the last sort
+            order = sorted(range(len(values)), key=values.__getitem__)
+            values = array('d', (values[i] for i in order))
+            doc_ids = array('I', (doc_ids[i] for i in order))
+            self._numeric[field] = (values, doc_ids)
+            self._unsorted.discard(field)
+        return values, doc_ids
+
+    def _match_range(self, field: str, op: str, number: float) -> Set[int]:
+        values, doc_ids = self._sorted_numeric(field)
+        if op == '!=':
+            equal = set(doc_ids[bisect_left(values, number):bisect_right(values, number)])
+            return set(doc_ids) - equal
+        low, high = 0, len(values)
+        if op in ('>', '>='):
+            low = (bisect_right if op == '>' else bisect_left)(values, number)
+        elif op in ('<', '<='):
+            high = (bisect_left if op == '<' else bisect_right)(values, number)
+        else:
+            low, high = bisect_left(values, number), bisect_right(values, number)
+        return set(doc_ids[low:high])
+
+    def _evaluate(self, node) -> Set[int]:
+        kind = node[0]
+        if kind == 'phrase':
+            return self._match_phrase(node[1], node[2])
+        if kind == 'range':
+            return self._match_range(node[1], node[2], node[3])
+        if kind == 'not':
+            return self._live - self._evaluate(node[1])
+        if kind == 'and':
+            # Positive clauses first so NOT only subtracts from a narrowed set
+            children = sorted(node[1], key=lambda child: child[0] == 'not')
+            result = self._evaluate(children[0])
+            for child in children[1:]:
+                if not result:
+                    break
+                if child[0] == 'not':
+                    result -= self._evaluate(child[1])
+                else:
+                    result &= self._evaluate(child)
+            return result
+        result = set()
+        for child in node[1]:
+            result |= self._evaluate(child)
+        return result
+
+    def search(self, query: str) -> List[str]:
+        """Keys of resumes matching query, most recently indexed first.
+
+        Raises QuerySyntaxError for malformed queries.
+        """
+        tree = parse_query(query)
+        with self._lock:
+            matched = self._evaluate(tree) & self._live
+            return [self._keys[doc_id] for doc_id in sorted(matched, reverse=True)]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'documents': len(self._live),
+                'tombstones': len(self._keys) - len(self._live),
+                'terms': len(self._postings),
+                'positions': sum(len(entry.positions) for entry in self._postings.values())
+            }
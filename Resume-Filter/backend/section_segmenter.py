@@ -0,0 +1,138 @@
+import re
+from typing import List, Dict, Optional, Tuple
+
+# Canonical section name -> header variants (lowercase, without trailing colon)
+DEFAULT_HEADERS = {
+    'skills': [
+        'skills', 'technical skills', 'key skills', 'core skills', 'skill set', 'skillset',
+        'core competencies', 'competencies', 'expertise', 'areas of expertise', 'technical expertise',
+        'technologies', 'tools and technologies', 'tools & technologies', 'programming languages',
+        'tools', 'frameworks', 'technical proficiency'
+    ],
+    'education': [
+        'education', 'educational qualification', 'educational qualifications', 'academic background',
+        'academic qualification', 'academic qualifications', 'academic record', 'academics',
+        'qualification', 'qualifications', 'education and training', 'educational background'
+    ],
+    'certifications': [
+        'certifications', 'certification', 'certificates', 'licenses and certifications',
+        'licenses & certifications', 'courses and certifications', 'courses'
+    ],
+    'languages': ['languages', 'language', 'languages known', 'language proficiency'],
+    'experience': [
+        'experience', 'work experience', 'professional experience', 'employment history',
+        'work history', 'employment', 'internships', 'internship', 'career history'
+    ],
+    'projects': ['projects', 'academic projects', 'personal projects', 'key projects'],
+    'summary': [
+        'summary', 'profile', 'professional summary', 'profile summary', 'objective',
+        'career objective', 'about me', 'about'
+    ],
+    'contact': ['contact', 'contact information', 'contact details', 'personal details', 'personal information'],
+    'achievements': ['achievements', 'awards', 'honors', 'honours', 'accomplishments', 'awards and achievements'],
+    'interests': ['hobbies', 'interests', 'extracurricular activities', 'extra-curricular activities'],
+    'references': ['references', 'declaration']
+}
+
+MAX_HEADER_LENGTH = 40
+HEADER_SEPARATOR = re.compile(r'\s*(?::|\s[-–—]\s)\s*')
+BULLET_CHARS = '•▪*-#|>'
+WHITESPACE = re.compile(r'\s+')
+# A short label line such as "Declaration:" that ends the previous section
+LABEL_LINE = re.compile(r'^[A-Za-z][A-Za-z &/]{0,38}:$')
+
+
+class Section:
+    """One labelled block of a resume"""
+
+    __slots__ = ('name', 'header', 'lines')
+
+    def __init__(self, name: str, header: str, lines: List[str]):
+        self.name = name
+        self.header = header
+        self.lines = lines
+
+    @property
+    def text(self) -> str:
+        return '\n'.join(self.lines)
+
+    def __repr__(self):
+        return f"Section(name={self.name!r}, header={self.header!r}, lines={len(self.lines)})"
+
+
+class ResumeSections:
+    """Sections of one document, queryable by canonical name"""
+
+    def __init__(self, sections: List[Section]):
+        self.sections = sections
+        self._by_name: Dict[str, List[Section]] = {}
+        for section in sections:
+            self._by_name.setdefault(section.name, []).append(section)
+
+    def get(self, name: str) -> str:
+        """Text of every section with this name, joined by newlines"""
+        return '\n'.join(section.text for section in self._by_name.get(name, ()))
+
+    def lines(self, name: str) -> List[str]:
+        """Non-empty lines of every section with this name"""
+        return [line for section in self._by_name.get(name, ()) for line in section.lines if line.strip()]
+
+    def has(self, name: str) -> bool:
+        return name in self._by_name
+
+    def names(self) -> List[str]:
+        return list(self._by_name)
+
+    def __iter__(self):
+        return iter(self.sections)
+
+
+class SectionSegmenter:
+    """Split resume text into labelled sections in a single linear pass"""
+
+    def __init__(self, headers: Optional[Dict[str, List[str]]] = None):
+        self.headers = headers or DEFAULT_HEADERS
+        self._lookup: Dict[str, str] = {}
+        for name, variants in self.headers.items():
+            for variant in variants:
+                self._lookup[self._normalize(variant)] = name
+
+    @staticmethod
+    def _normalize(label: str) -> str:
+        return WHITESPACE.sub(' ', label.strip().strip(BULLET_CHARS + '.').strip()).lower()
+
+    def match_header(self, line: str) -> Optional[Tuple[str, str, str]]:
+        """Return (section name, header, inline remainder) if the line opens a section"""
+        stripped = line.strip().lstrip(BULLET_CHARS).strip()
+        if not stripped:
+            return None
+
+        parts = HEADER_SEPARATOR.split(stripped, 1)
+        head = parts[0]
+        remainder = parts[1] if len(parts) > 1 else ''
+        if len(head) > MAX_HEADER_LENGTH:
+            return None
+
+        name = self._lookup.get(self._normalize(head))
+        if name is not None:
+            return name, head, remainder
+        if LABEL_LINE.match(stripped):
+            return 'other', head, ''
+        return None
+
+    def segment(self, text: str) -> ResumeSections:
+        """Segment text; lines before the first header belong to 'header'"""
+        sections = []
+        current = Section('header', '', [])
+        for line in text.split('\n'):
+            match = self.match_header(line)
+            if match is None:
+                current.lines.append(line)
+                continue
+            if current.lines or current.header:
+                sections.append(current)
+            name, header, remainder = match
+            current = Section(name, header, [remainder] if remainder else [])
+        if current.lines or current.header:
+            sections.append(current)
+        return ResumeSections(sections)
@@ -0,0 +1,280 @@
+import argparse
+import errno
+import gc
+import os
+import random
+import shutil
+import signal
+import socket
+import sys
+import tempfile
+import time
+import logging
+from typing import Dict, Optional
+
+import metrics
+
+logger = logging.getLogger('serve')
+
+DEFAULT_HOST = os.environ.get('SERVER_HOST', '0.0.0.0')
+DEFAULT_PORT = int(os.environ.get('SERVER_PORT', os.environ.get('PORT', '5000')))
+DEFAULT_WORKERS = int(os.environ.get('WEB_CONCURRENCY', '0')) or os.cpu_count() or 1
+# Workers exit after this many requests (plus jitter) and are replaced; 0 disables recycling
+DEFAULT_MAX_REQUESTS = int(os.environ.get('SERVER_MAX_REQUESTS', '1000'))
+DEFAULT_MAX_REQUESTS_JITTER = int(os.environ.get('SERVER_MAX_REQUESTS_JITTER', '100'))
+DEFAULT_GRACEFUL_TIMEOUT = float(os.environ.get('SERVER_GRACEFUL_TIMEOUT', '30'))
+DEFAULT_BACKLOG = 128
+# Workers publish metric snapshots here so /metrics sums the whole pool; a temporary
+# directory is used when unset
+DEFAULT_METRICS_DIR = os.environ.get('METRICS_MULTIPROC_DIR')
+# How often an idle worker wakes up to check for shutdown, and the master for exited workers
+POLL_INTERVAL = 1.0
+MASTER_POLL_INTERVAL = 0.2
+# Workers dying faster than this are not respawned in a tight loop
+MIN_WORKER_LIFETIME = 1.0
+
+
+class PreforkServer:
+    """Master process owning the listening socket and a pool of forked WSGI workers.
+
+    The application and its models are loaded once in the master before any
+    worker is forked, so workers share that memory copy-on-write instead of
+    each loading spaCy. SIGTERM/SIGINT stop the pool gracefully, SIGHUP
+    replaces every worker, SIGTTIN/SIGTTOU add or remove one. Metrics
+    from every worker are summed on each /metrics scrape.
+    """
+
+    def __init__(self, app, listener: socket.socket, workers: int = DEFAULT_WORKERS,
+                 max_requests: int = DEFAULT_MAX_REQUESTS, max_requests_jitter: int = DEFAULT_MAX_REQUESTS_JITTER,
+                 graceful_timeout: float = DEFAULT_GRACEFUL_TIMEOUT, metrics_dir: Optional[str] = DEFAULT_METRICS_DIR):
+        self.app = app
+        self.listener = listener
+        self.workers = max(1, workers)
+        self.max_requests = max_requests
+        self.max_requests_jitter = max_requests_jitter
+        self.graceful_timeout = graceful_timeout
+        # pid -> start time
+        self._children: Dict[int, float] = {}
+        self._stopping = False
+        self._requests = 0
+        self._temporary_metrics_dir = metrics_dir is None
+        self.shared_metrics = metrics.enable_shared_metrics(
+            metrics_dir or tempfile.mkdtemp(prefix='resume-metrics-')
+        )
+
+    # Master
+
+    def run(self):
+        host, port = self.listener.getsockname()[:2]
+        logger.info(f"Master {os.getpid()} listening on http://{host}:{port} with {self.workers} workers")
+        signal.signal(signal.SIGTERM, self._handle_stop)
+        signal.signal(signal.SIGINT, self._handle_stop)
+        signal.signal(signal.SIGHUP, self._handle_reload)
+        signal.signal(signal.SIGTTIN, self._handle_scale)
+        signal.signal(signal.SIGTTOU, self._handle_scale)
+        self.shared_metrics.start()
+
+        try:
+            while not self._stopping:
+                self._spawn_missing()
+                # Poll rather than block in waitpid, which resumes after a signal (PEP 475)
+                while self._reap(block=False):
+                    pass
+                time.sleep(MASTER_POLL_INTERVAL)
+        finally:
+            self._shutdown()
+
+    def _spawn_missing(self):
+        while len(self._children) < self.workers and not self._stopping:
+            pid = os.fork()
+            if pid == 0:
+                status = 0
+                try:
+                    self._run_worker()
+                except BaseException:
+                    logger.exception(f"Worker {os.getpid()} crashed")
+                    status = 1
+                finally:
+                    # Never return into the master's stack
+                    os._exit(status)
+            self._children[pid] = time.monotonic()
+            logger.info(f"Booted worker {pid}")
+
+    def _reap(self, block: bool) -> bool:
+        """Collect one exited worker; False if none has exited"""
+        try:
+            pid, status = os.waitpid(-1, 0 if block else os.WNOHANG)
+        except ChildProcessError:
+            return False
+        if not pid:
+            return False
+        started = self._children.pop(pid, None)
+        self.shared_metrics.archive(pid)
+        code = os.waitstatus_to_exitcode(status)
+        if code:
+            logger.warning(f"Worker {pid} exited with status {code}")
+        else:
+            logger.info(f"Worker {pid} exited")
+        if started is not None and time.monotonic() - started < MIN_WORKER_LIFETIME and code:
+            time.sleep(MIN_WORKER_LIFETIME)
+        return True
+
+    def _signal_children(self, signum: int):
+        for pid in list(self._children):
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                self._children.pop(pid, None)
+
+    def _handle_stop(self, signum, frame):
+        self._stopping = True
+
+    def _handle_reload(self, signum, frame):
+        # Workers finish their current request and exit; the loop boots replacements
+        logger.info("Replacing all workers")
+        self._signal_children(signal.SIGTERM)
+
+    def _handle_scale(self, signum, frame):
+        if signum == signal.SIGTTIN:
+            self.workers += 1
+        elif self.workers > 1:
+            self.workers -= 1
+            pid = max(self._children, key=self._children.get, default=None)
+            if pid is not None:
+                os.kill(pid, signal.SIGTERM)
+        logger.info(f"Worker count is now {self.workers}")
+
+    def _shutdown(self):
+        logger.info("Stopping workers")
+        self._signal_children(signal.SIGTERM)
+        deadline = time.monotonic() + self.graceful_timeout
+        while self._children and time.monotonic() < deadline:
+            self._reap(block=False)
+            time.sleep(0.1)
+        if self._children:
+            logger.warning(f"Killing {len(self._children)} workers after {self.graceful_timeout}s")
+            self._signal_children(signal.SIGKILL)
+            while self._children:
+                self._reap(block=True)
+        self.listener.close()
+        if self._temporary_metrics_dir:
+            shutil.rmtree(self.shared_metrics.directory, ignore_errors=True)
+
+    # Worker
+
+    def _counting_app(self, environ, start_response):
+        self._requests += 1
+        return self.app(environ, start_response)
+
+    def _run_worker(self):
+        from werkzeug.serving import make_server
+
+        self._children.clear()
+        self._stopping = False
+        signal.signal(signal.SIGTERM, self._handle_stop)
+        signal.signal(signal.SIGINT, self._handle_stop)
+        for signum in (signal.SIGHUP, signal.SIGTTIN, signal.SIGTTOU):
+            signal.signal(signum, signal.SIG_DFL)
+        # Forked workers inherit the master's RNG state; jitter must differ per worker
+        random.seed()
+        # The master's values are in the archive already; count only this worker's own
+        metrics.REGISTRY.reset()
+        published = 0
+
+        limit = None
+        if self.max_requests > 0:
+            limit = self.max_requests + random.randint(0, max(0, self.max_requests_jitter))
+
+        host, port = self.listener.getsockname()[:2]
+        server = make_server(host, port, self._counting_app, fd=self.listener.fileno())
+        server.timeout = POLL_INTERVAL
+        # Every worker wakes for each connection; the losers of the accept() race time out
+        # instead of blocking past a shutdown request
+        server.socket.settimeout(POLL_INTERVAL)
+        try:
+            while not self._stopping:
+                try:
+                    server.handle_request()
+                except OSError as e:
+                    if e.errno != errno.EINTR:
+                        raise
+                if self._requests != published:
+                    self.shared_metrics.write()
+                    published = self._requests
+                if limit is not None and self._requests >= limit:
+                    logger.info(f"Worker {os.getpid()} recycling after {self._requests} requests")
+                    break
+        finally:
+            server.socket.close()
+            self.shared_metrics.write()
+
+
+def create_listener(host: str, port: int, backlog: int = DEFAULT_BACKLOG) -> socket.socket:
+    family = socket.AF_INET6 if ':' in host else socket.AF_INET
+    listener = socket.create_server((host, port), family=family, backlog=backlog)
+    listener.set_inheritable(True)
+    return listener
+
+
+def load_app(preload: bool = True):
+    """Import the Flask app and load every model in this (master) process"""
+    # The app's background preload thread would race the fork; load synchronously instead
+    os.environ['PRELOAD_MODELS'] = '0'
+    from app import app
+    if preload:
+        from resume_parser import preload_models
+
+        start = time.perf_counter()
+        status = preload_models()
+        logger.info(f"Preloaded models in {time.perf_counter() - start:.1f}s: {status}")
+    # Move everything loaded so far out of the collector's generations, so
+    # collections in workers do not touch (and copy) those shared pages
+    gc.collect()
+    gc.freeze()
+    return app
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Serve the resume parser API with pre-forked workers')
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help='worker processes (env WEB_CONCURRENCY, default: CPU count)')
+    parser.add_argument('--max-requests', type=int, default=DEFAULT_MAX_REQUESTS,
+                        help='recycle a worker after this many requests, 0 to disable')
+    parser.add_argument('--max-requests-jitter', type=int, default=DEFAULT_MAX_REQUESTS_JITTER,
+                        help='random extra requests per worker so they do not all recycle at once')
+    parser.add_argument('--graceful-timeout', type=float, default=DEFAULT_GRACEFUL_TIMEOUT,
+                        help='seconds workers get to finish in-flight requests on shutdown')
+    parser.add_argument('--no-preload', action='store_true',
+                        help='skip loading models in the master (each worker loads on first use)')
+    parser.add_argument('--metrics-dir', default=DEFAULT_METRICS_DIR,
+                        help='directory for per-worker metric snapshots (env METRICS_MULTIPROC_DIR, '
+                             'default: a temporary directory)')
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> Optional[int]:
+    logging.basicConfig(level=logging.INFO, format='[%(asctime)s] [%(process)d] %(levelname)s %(message)s')
+    args = parse_args(argv)
+
+    if not hasattr(os, 'fork'):
+        logger.error("Pre-fork serving needs os.fork; use 'python app.py' on this platform")
+        return 1
+
+    # Bind before loading models so a taken port fails fast
+    listener = create_listener(args.host, args.port)
+    app = load_app(preload=not args.no_preload)
+    PreforkServer(
+        app, listener,
+        workers=args.workers,
+        max_requests=args.max_requests,
+        max_requests_jitter=args.max_requests_jitter,
+        graceful_timeout=args.graceful_timeout,
+        metrics_dir=args.metrics_dir
+    ).run()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
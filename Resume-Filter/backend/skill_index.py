@@ -0,0 +1,143 @@
+import heapq
+import threading
+from array import array
+from typing import List, Dict, Optional, Any, Iterable, Tuple
+
+from candidate_record import SkillVocabulary
+
+
+class SkillIndex:
+    """Skill frequency and pairwise co-occurrence counts over the talent pool.
+
+    Counts are updated per resume as it is ingested, so queries never rescan
+    the pool: top() costs O(k) once the ranking is cached and cooccurring()
+    is bounded by the number of distinct skills seen with the queried one.
+    """
+
+    def __init__(self):
+        # Skills are counted case-insensitively under their lowercase form
+        self.vocab = SkillVocabulary()
+        # resume key -> skill ids, so re-ingesting a resume replaces its counts
+        self._documents: Dict[str, array] = {}
+        self._frequency = array('I')
+        # Sparse symmetric adjacency: skill id -> {other skill id: resumes with both}
+        self._cooccurrence: Dict[int, Dict[int, int]] = {}
+        self._ranking: Optional[List[int]] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]], by_position: bool = False) -> 'SkillIndex':
+        """Index records by file hash, or by_position to count every row, duplicates included"""
+        index = cls()
+        if by_position:
+            for position, record in enumerate(records):
+                index.add(str(position), record.get('skills'))
+        else:
+            index.rebuild(records)
+        return index
+
+    def _encode(self, skills: Optional[Iterable[str]]) -> array:
+        ids = sorted({self.vocab.intern(skill.strip().lower()) for skill in skills or () if skill and skill.strip()})
+        if len(self._frequency) < len(self.vocab):
+            self._frequency.extend([0] * (len(self.vocab) - len(self._frequency)))
+        return array('I', ids)
+
+    def _apply(self, skill_ids: array, delta: int):
+        frequency = self._frequency
+        cooccurrence = self._cooccurrence
+        for position, skill_id in enumerate(skill_ids):
+            frequency[skill_id] += delta
+            row = cooccurrence.setdefault(skill_id, {})
+            for other_id in skill_ids[position + 1:]:
+                count = row.get(other_id, 0) + delta
+                other_row = cooccurrence.setdefault(other_id, {})
+                if count:
+                    row[other_id] = other_row[skill_id] = count
+                else:
+                    del row[other_id], other_row[skill_id]
+        self._ranking = None
+
+    def add(self, key: str, skills: Optional[Iterable[str]]):
+        """Count one resume's skills, replacing any earlier version with the same key"""
+        with self._lock:
+            skill_ids = self._encode(skills)
+            previous = self._documents.get(key)
+            if previous is not None:
+                if previous == skill_ids:
+                    return
+                self._apply(previous, -1)
+            self._documents[key] = skill_ids
+            self._apply(skill_ids, 1)
+
+    def remove(self, key: str) -> bool:
+        with self._lock:
+            previous = self._documents.pop(key, None)
+            if previous is None:
+                return False
+            self._apply(previous, -1)
+            return True
+
+    def clear(self):
+        with self._lock:
+            self.vocab = SkillVocabulary()
+            self._documents.clear()
+            self._frequency = array('I')
+            self._cooccurrence.clear()
+            self._ranking = None
+
+    def rebuild(self, records: Iterable[Dict[str, Any]]):
+        """Reset the index from stored records, keyed like the results log"""
+        self.clear()
+        for position, record in enumerate(records):
+            self.add(record.get('file_hash') or str(position), record.get('skills'))
+
+    @property
+    def document_count(self) -> int:
+        return len(self._documents)
+
+    def frequency(self, skill: str) -> int:
+        skill_id = self.vocab.lookup(skill.strip().lower())
+        return self._frequency[skill_id] if skill_id is not None else 0
+
+    def _entry(self, skill_id: int, count: int, total: int) -> Dict[str, Any]:
+        return {
+            'skill': self.vocab.term(skill_id).title(),
+            'count': count,
+            'percentage': round(count / total * 100, 1) if total else 0.0
+        }
+
+    def top(self, k: int = 20) -> List[Dict[str, Any]]:
+        """Most common skills with their resume counts"""
+        with self._lock:
+            if self._ranking is None:
+                frequency = self._frequency
+                self._ranking = sorted(
+                    (skill_id for skill_id in range(len(frequency)) if frequency[skill_id]),
+                    key=lambda skill_id: (-frequency[skill_id], self.vocab.term(skill_id))
+                )
+            total = len(self._documents)
+            return [self._entry(skill_id, self._frequency[skill_id], total) for skill_id in self._ranking[:k]]
+
+    def cooccurring(self, skill: str, k: int = 20) -> Optional[List[Dict[str, Any]]]:
+        """Skills most often listed alongside skill; None if the skill is unknown.
+
+        percentage is the share of resumes with skill that also list the other one.
+        """
+        with self._lock:
+            skill_id = self.vocab.lookup(skill.strip().lower())
+            if skill_id is None or not self._frequency[skill_id]:
+                return None
+            row: Dict[int, int] = self._cooccurrence.get(skill_id, {})
+            best: List[Tuple[int, int]] = heapq.nlargest(
+                k, row.items(), key=lambda item: (item[1], -item[0])
+            )
+            total = self._frequency[skill_id]
+            return [self._entry(other_id, count, total) for other_id, count in best]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'resumes': len(self._documents),
+                'distinct_skills': sum(1 for count in self._frequency if count),
+                'skill_pairs': sum(len(row) for row in self._cooccurrence.values()) // 2
+            }
@@ -0,0 +1,251 @@
+import hashlib
+import json
+import os
+import pickle
+import re
+import threading
+import time
+import logging
+from typing import List, Dict, Optional, Any, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_TAXONOMY_PATH = os.environ.get('RESUME_SKILLS_TAXONOMY', os.path.join(BACKEND_DIR, 'skills_taxonomy.json'))
+DEFAULT_CACHE_DIR = os.environ.get('RESUME_SKILLS_CACHE', os.path.join(BACKEND_DIR, 'cache'))
+# How often get_skill_matcher() looks at the taxonomy file's modification time
+CHECK_INTERVAL_SECONDS = float(os.environ.get('RESUME_SKILLS_CHECK_SECONDS', '2'))
+
+# Bump when tokenisation or the compiled layout changes so stale caches are ignored
+MATCHER_FORMAT = 1
+
+# "c++", "c#" keep their suffix; "asp.net" -> ("asp", "net"), "ci/cd" -> ("ci", "cd")
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+[+#]*')
+# Trie key marking the end of a term; tokens never contain it
+TERM_END = '\0'
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class SkillMatcher:
+    """Compiled token trie matching every taxonomy term and alias in one pass"""
+
+    def __init__(self, version: str, taxonomy_hash: str, categories: Dict[str, List[str]],
+                 trie: Dict[str, Any], term_count: int):
+        self.version = version
+        self.taxonomy_hash = taxonomy_hash
+        # category -> canonical skill names, in taxonomy order
+        self.categories = categories
+        self.trie = trie
+        self.term_count = term_count
+        self._category_of = {skill: category for category, skills in categories.items() for skill in skills}
+
+    @classmethod
+    def compile(cls, taxonomy: Dict[str, Any], taxonomy_hash: str) -> 'SkillMatcher':
+        """Build the matcher from a parsed taxonomy document"""
+        categories = taxonomy.get('categories')
+        if not isinstance(categories, dict):
+            raise ValueError("Skills taxonomy must have a 'categories' object")
+
+        trie: Dict[str, Any] = {}
+        canonical: Dict[str, List[str]] = {}
+        seen = set()
+        term_count = 0
+
+        for category, skills in categories.items():
+            if isinstance(skills, list):
+                skills = {skill: [] for skill in skills}
+            canonical[category] = []
+            for skill, aliases in skills.items():
+                skill = skill.strip().lower()
+                if skill in seen:
+                    # A skill keeps the first category it is listed under
+                    continue
+                seen.add(skill)
+                canonical[category].append(skill)
+                for term in [skill] + list(aliases or []):
+                    tokens = tokenize(term)
+                    if not tokens:
+                        continue
+                    node = trie
+                    for token in tokens:
+                        node = node.setdefault(token, {})
+                    node.setdefault(TERM_END, skill)
+                    term_count += 1
+
+        return cls(str(taxonomy.get('version', 'unversioned')), taxonomy_hash, canonical, trie, term_count)
+
+    @property
+    def skills(self) -> List[str]:
+        return list(self._category_of)
+
+    def category_of(self, skill: str) -> Optional[str]:
+        return self._category_of.get(skill.lower())
+
+    def match_tokens(self, tokens: List[str]) -> Set[str]:
+        """Canonical skills found by leftmost-longest matching over the tokens.
+
+        Longest wins so "node js" yields nodejs rather than also javascript via "js".
+        """
+        found = set()
+        trie = self.trie
+        count = len(tokens)
+        start = 0
+        while start < count:
+            node = trie.get(tokens[start])
+            position = start + 1
+            match_skill, match_end = None, start + 1
+            while node is not None:
+                skill = node.get(TERM_END)
+                if skill is not None:
+                    match_skill, match_end = skill, position
+                if position >= count:
+                    break
+                node = node.get(tokens[position])
+                position += 1
+            if match_skill is not None:
+                found.add(match_skill)
+            start = match_end
+        return found
+
+    def match(self, text: str) -> Set[str]:
+        return self.match_tokens(tokenize(text))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'version': self.version,
+            'taxonomy_hash': self.taxonomy_hash,
+            'categories': len(self.categories),
+            'skills': len(self._category_of),
+            'terms': self.term_count
+        }
+
+
+def taxonomy_digest(raw: bytes) -> str:
+    """Cache key for a taxonomy file's contents and the matcher format"""
+    digest = hashlib.sha256(f'skill-matcher-v{MATCHER_FORMAT}\n'.encode('utf-8'))
+    digest.update(raw)
+    return digest.hexdigest()
+
+
+def _cache_path(cache_dir: str, taxonomy_hash: str) -> str:
+    return os.path.join(cache_dir, f'skills_matcher_{taxonomy_hash[:16]}.pickle')
+
+
+def _read_cache(path: str, taxonomy_hash: str) -> Optional[SkillMatcher]:
+    try:
+        with open(path, 'rb') as f:
+            matcher = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable skills matcher cache {path}: {str(e)}")
+        return None
+    if not isinstance(matcher, SkillMatcher) or matcher.taxonomy_hash != taxonomy_hash:
+        return None
+    return matcher
+
+
+def _write_cache(path: str, matcher: SkillMatcher):
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f'{path}.{os.getpid()}.tmp'
+        with open(temp_path, 'wb') as f:
+            pickle.dump(matcher, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+    except OSError as e:
+        logger.warning(f"Could not write skills matcher cache {path}: {str(e)}")
+
+
+def load_skill_matcher(path: str = DEFAULT_TAXONOMY_PATH,
+                       cache_dir: Optional[str] = DEFAULT_CACHE_DIR) -> SkillMatcher:
+    """Load the matcher for a taxonomy file, compiling it only on a cache miss"""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    taxonomy_hash = taxonomy_digest(raw)
+
+    cache_path = _cache_path(cache_dir, taxonomy_hash) if cache_dir else None
+    if cache_path:
+        matcher = _read_cache(cache_path, taxonomy_hash)
+        if matcher is not None:
+            return matcher
+
+    try:
+        taxonomy = json.loads(raw.decode('utf-8'))
+    except ValueError as e:
+        raise ValueError(f"Invalid skills taxonomy {path}: {str(e)}")
+    matcher = SkillMatcher.compile(taxonomy, taxonomy_hash)
+    logger.info(f"✅ Compiled skills taxonomy {matcher.version} ({matcher.term_count} terms)")
+
+    if cache_path:
+        _write_cache(cache_path, matcher)
+    return matcher
+
+
+# The active matcher is shared by every ResumeParser in the process
+_matcher_lock = threading.Lock()
+_matcher_state: Dict[str, Any] = {'matcher': None, 'path': DEFAULT_TAXONOMY_PATH, 'mtime': None, 'checked': 0.0}
+
+
+def _after_fork():
+    # A reload in another thread may hold the lock while a parse worker forks
+    global _matcher_lock
+    _matcher_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_after_fork)
+
+
+def _taxonomy_mtime(path: str) -> Optional[float]:
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return None
+
+
+def get_skill_matcher() -> SkillMatcher:
+    """Return the active matcher, loading it on first use.
+
+    The taxonomy file's mtime is re-checked every CHECK_INTERVAL_SECONDS, so an
+    edit (or a /skills/reload handled by another server worker) reaches every
+    process without a restart.
+    """
+    matcher = _matcher_state['matcher']
+    now = time.monotonic()
+    if matcher is not None and now - _matcher_state['checked'] < CHECK_INTERVAL_SECONDS:
+        return matcher
+    _matcher_state['checked'] = now
+    if matcher is not None and _taxonomy_mtime(_matcher_state['path']) == _matcher_state['mtime']:
+        return matcher
+    try:
+        return reload_skill_matcher()[0]
+    except Exception as e:
+        if matcher is None:
+            raise
+        logger.error(f"Keeping skills taxonomy {matcher.version}: {str(e)}")
+        return matcher
+
+
+def reload_skill_matcher(path: Optional[str] = None, force: bool = False) -> Tuple[SkillMatcher, bool]:
+    """Swap in a new taxonomy without a restart; returns (matcher, changed).
+
+    Without force the file is only re-read when its modification time changed.
+    In-flight parses keep the matcher they started with.
+    """
+    with _matcher_lock:
+        path = path or _matcher_state['path']
+        mtime = _taxonomy_mtime(path)
+        current = _matcher_state['matcher']
+        if (current is not None and not force and path == _matcher_state['path']
+                and mtime == _matcher_state['mtime']):
+            return current, False
+
+        matcher = load_skill_matcher(path)
+        changed = current is None or matcher.taxonomy_hash != current.taxonomy_hash
+        _matcher_state.update(matcher=matcher, path=path, mtime=mtime)
+        if changed:
+            logger.info(f"✅ Skills taxonomy {matcher.version} is now active")
+        return matcher, changed
@@ -0,0 +1,169 @@
+import argparse
+import os
+import socketserver
+import sys
+import threading
+import time
+import logging
+from email import message_from_bytes
+from email.message import Message
+from typing import List, Dict, Optional, Any, Iterable
+
+logger = logging.getLogger('smtp_sink')
+
+MAX_LINE = 8192
+
+
+class _SmtpHandler(socketserver.StreamRequestHandler):
+    """One SMTP session: enough of RFC 5321 for smtplib clients"""
+
+    def _reply(self, line: str):
+        self.wfile.write(f'{line}\r\n'.encode('ascii'))
+
+    def _read_line(self) -> Optional[str]:
+        line = self.rfile.readline(MAX_LINE)
+        if not line:
+            return None
+        return line.decode('utf-8', 'replace').rstrip('\r\n')
+
+    def _read_data(self) -> bytes:
+        lines = []
+        while True:
+            line = self.rfile.readline(MAX_LINE)
+            if not line or line in (b'.\r\n', b'.\n'):
+                break
+            # Undo dot-stuffing
+            lines.append(line[1:] if line.startswith(b'.') else line)
+        return b''.join(lines)
+
+    def handle(self):
+        sink: SmtpSink = self.server.sink
+        sink.connections += 1
+        sender, recipients = None, []
+        self._reply(f'220 {sink.hostname} ESMTP sink')
+        while True:
+            line = self._read_line()
+            if line is None:
+                return
+            verb, _, argument = line.partition(' ')
+            verb = verb.upper()
+            if verb in ('EHLO', 'HELO'):
+                if verb == 'EHLO':
+                    self.wfile.write(f'250-{sink.hostname}\r\n250-8BITMIME\r\n250 SMTPUTF8\r\n'.encode('ascii'))
+                else:
+                    self._reply(f'250 {sink.hostname}')
+            elif verb == 'MAIL':
+                sender, recipients = argument.partition(':')[2].strip().strip('<>').split(' ')[0], []
+                self._reply('250 OK')
+            elif verb == 'RCPT':
+                address = argument.partition(':')[2].strip().strip('<>')
+                if address.lower() in sink.reject:
+                    self._reply('550 No such user')
+                elif address.lower() in sink.defer:
+                    self._reply('451 Try again later')
+                else:
+                    recipients.append(address)
+                    self._reply('250 OK')
+            elif verb == 'DATA':
+                if not recipients:
+                    self._reply('503 No valid recipients')
+                    continue
+                self._reply('354 End data with <CR><LF>.<CR><LF>')
+                sink.store(sender, recipients, self._read_data())
+                sender, recipients = None, []
+                self._reply('250 OK queued')
+            elif verb == 'RSET':
+                sender, recipients = None, []
+                self._reply('250 OK')
+            elif verb == 'NOOP':
+                self._reply('250 OK')
+            elif verb == 'QUIT':
+                self._reply('221 Bye')
+                return
+            else:
+                self._reply('502 Command not implemented')
+
+
+class _ThreadingServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class SmtpSink:
+    """Stand-in SMTP server that accepts mail and keeps it instead of delivering.
+
+    Messages are kept in memory and, with a directory, also written there as
+    .eml files. Addresses in reject get a permanent 550 and those in defer a
+    temporary 451, for exercising the mailer's failure handling.
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 1025, directory: Optional[str] = None,
+                 reject: Iterable[str] = (), defer: Iterable[str] = ()):
+        self.hostname = 'localhost'
+        self.directory = directory
+        self.reject = {address.lower() for address in reject}
+        self.defer = {address.lower() for address in defer}
+        self.messages: List[Dict[str, Any]] = []
+        self.connections = 0
+        self._lock = threading.Lock()
+        self._server = _ThreadingServer((host, port), _SmtpHandler)
+        self._server.sink = self
+        self._thread = None
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def store(self, sender: str, recipients: List[str], data: bytes):
+        message: Message = message_from_bytes(data)
+        with self._lock:
+            self.messages.append({'from': sender, 'to': recipients, 'message': message})
+            count = len(self.messages)
+        if self.directory:
+            with open(os.path.join(self.directory, f'{int(time.time() * 1000)}-{count}.eml'), 'wb') as f:
+                f.write(data)
+        logger.info(f"Accepted message {count} from {sender} to {', '.join(recipients)}: {message['Subject']}")
+
+    def start(self) -> 'SmtpSink':
+        """Serve on a background thread"""
+        self._thread = threading.Thread(target=self._server.serve_forever, name='smtp-sink', daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main(argv=None) -> int:
+    logging.basicConfig(level=logging.INFO, format='[%(asctime)s] %(message)s')
+    parser = argparse.ArgumentParser(description='Local SMTP server that stores mail instead of delivering it')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=1025)
+    parser.add_argument('--directory', help='also write each message here as an .eml file')
+    parser.add_argument('--reject', action='append', default=[], help='answer 550 for this address')
+    parser.add_argument('--defer', action='append', default=[], help='answer 451 for this address')
+    args = parser.parse_args(argv)
+
+    sink = SmtpSink(args.host, args.port, args.directory, args.reject, args.defer)
+    logger.info(f"SMTP sink listening on {args.host}:{sink.port}")
+    try:
+        sink.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,101 @@
+import io
+
+import pytest
+
+RESUME = b"""Arun Kumar
+arun.kumar@example.com | +91 98400 12345
+Chennai, Tamil Nadu
+
+Skills
+Python, Docker
+"""
+
+
+def upload(client, name, batch_id=None):
+    data = {'files': (io.BytesIO(RESUME), name)}
+    if batch_id:
+        data['batch_id'] = batch_id
+    return client.post('/upload', data=data, content_type='multipart/form-data')
+
+
+@pytest.fixture
+def batches(client):
+    first = upload(client, 'first.txt').get_json()['batch_id']
+    second = upload(client, 'second.txt').get_json()['batch_id']
+    yield first, second
+    for batch_id in (first, second):
+        client.post('/clear', json={'batch_id': batch_id})
+
+
+def batch_status(client, batch_id):
+    return client.get(f'/batches/{batch_id}')
+
+
+def test_uploads_go_to_separate_batches(client, batches):
+    first, second = batches
+    assert first != second
+    assert upload(client, 'extra.txt', batch_id=first).get_json()['batch_id'] == first
+
+    first_files = batch_status(client, first).get_json()['batch']['files']
+    second_files = batch_status(client, second).get_json()['batch']['files']
+    assert [name.endswith(('first.txt', 'extra.txt')) for name in first_files] == [True, True]
+    assert len(second_files) == 1 and second_files[0].endswith('second.txt')
+
+
+def test_processing_one_batch_leaves_the_other_alone(client, app_module, batches):
+    first, second = batches
+    response = client.post('/process', json={'batch_id': first}).get_json()
+    assert response['success'], response
+    assert response['batch_id'] == first
+    assert [record['file_name'].endswith('first.txt') for record in response['data']] == [True]
+
+    assert batch_status(client, first).get_json()['batch']['processed'] is True
+    assert batch_status(client, second).get_json()['batch']['processed'] is False
+
+    # Only one request may process a batch at a time
+    with app_module.workspaces.get(first).processing():
+        busy = client.post('/process', json={'batch_id': first})
+        assert busy.status_code == 409
+        assert client.post('/clear', json={'batch_id': first}).status_code == 409
+        assert client.post('/process', json={'batch_id': second}).get_json()['success']
+
+
+def test_clear_with_batch_id_removes_only_that_batch(client, app_module, batches):
+    first, second = batches
+    client.post('/process', json={'batch_id': first})
+    stored = len(app_module.results_log)
+
+    response = client.post('/clear', json={'batch_id': first})
+    assert response.get_json()['success']
+    assert batch_status(client, first).status_code == 404
+    assert batch_status(client, second).status_code == 200
+    assert len(app_module.results_log) == stored
+
+
+def test_clear_without_batch_id_keeps_batches_and_results(client, app_module, batches):
+    first, second = batches
+    client.post('/process', json={'batch_id': first})
+    stored = len(app_module.results_log)
+
+    assert client.post('/clear').get_json()['message'] == 'Upload folder cleared'
+    assert batch_status(client, first).status_code == 200
+    assert batch_status(client, second).status_code == 200
+    assert len(app_module.results_log) == stored > 0
+
+
+def test_clear_all_wipes_batches_and_results(client, app_module, batches):
+    first, second = batches
+    client.post('/process', json={'batch_id': first})
+
+    assert client.post('/clear', json={'all': True}).get_json()['success']
+    assert client.get('/batches').get_json()['batches'] == []
+    assert len(app_module.results_log) == 0
+    assert client.get('/search', query_string={'q': 'skills:python'}).get_json()['total'] == 0
+
+
+def test_unknown_batch_is_404(client):
+    assert upload(client, 'x.txt', batch_id='missing').status_code == 404
+    assert client.post('/process', json={'batch_id': 'missing'}).status_code == 404
+    assert client.post('/clear', json={'batch_id': 'missing'}).status_code == 404
+    assert client.get('/download/x.json', query_string={'batch_id': 'missing'}).status_code == 404
+    assert batch_status(client, 'missing').status_code == 404
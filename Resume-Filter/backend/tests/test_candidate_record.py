@@ -0,0 +1,58 @@
+import json
+
+from candidate_record import CandidateBatch, CandidateRecord, SkillVocabulary
+
+PARSED = {
+    'file_name': 'arun.pdf',
+    'file_path': '/uploads/arun.pdf',
+    'file_hash': 'ab' * 32,
+    'name': 'Arun Kumar',
+    'email': 'arun@example.com',
+    'phone_number': '+919876543210',
+    'skills': ['Python', 'Docker', 'Rust'],
+    'education': ['B.Tech Computer Science'],
+    'location': 'Chennai, Tamil Nadu',
+    'total_experience': 4.5,
+    'text': 'Arun Kumar\nChennai',
+    'parse_mode': 'full',
+    'processed_at': '2026-10-19T10:00:00',
+    'processing_time': 0.12,
+    'certifications': ['Aws Certified Developer'],
+    'languages': ['Tamil', 'English']
+}
+
+
+def test_vocabulary_from_keywords_uses_title_case():
+    vocab = SkillVocabulary.from_keywords({'languages': ['python', 'go'], 'devops': ['docker']})
+    assert [vocab.term(i) for i in range(len(vocab))] == ['Python', 'Go', 'Docker']
+    assert 'Docker' in vocab and 'docker' not in vocab
+
+
+def test_round_trip_is_lossless_through_json():
+    vocab = SkillVocabulary.from_keywords({'languages': ['python'], 'devops': ['docker']})
+    record = CandidateRecord.from_dict(PARSED, vocab)
+    assert record.skill_ids.tolist() == [0, 1, 2]
+    assert record.to_dict() == PARSED
+
+    restored = CandidateRecord.from_dict(json.loads(json.dumps(record.to_dict())), vocab)
+    assert restored.to_dict() == PARSED
+    # Skills outside the taxonomy join the shared vocabulary once
+    assert len(vocab) == 3
+
+
+def test_missing_fields_stay_missing():
+    vocab = SkillVocabulary()
+    partial = {'file_hash': 'cd' * 32, 'email': 'a@b.com', 'skills': None, 'education': []}
+    record = CandidateRecord.from_dict(partial, vocab)
+    assert record.to_dict() == partial
+    assert record.get('name') is None and record.get('name', 'x') == 'x'
+    assert record['email'] == 'a@b.com'
+
+
+def test_batch_filters_by_skill_id():
+    batch = CandidateBatch.from_dicts([PARSED, dict(PARSED, file_hash='cd' * 32, skills=['Go'])])
+    assert [record.get('file_hash') for record in batch.with_skill('Go')] == ['cd' * 32]
+    assert batch.with_skill('Haskell') == []
+    assert batch.to_dicts()[0] == PARSED
+    assert batch[0].skills is not batch[1].skills
+    assert batch[0].vocab is batch[1].vocab
@@ -0,0 +1,65 @@
+from datetime import datetime
+
+from employment_timeline import build_timeline, find_intervals, stated_years
+
+NOW = datetime(2026, 10, 19)
+
+
+def timeline(text):
+    return build_timeline(text, now=NOW)
+
+
+def test_named_end_month_is_inclusive():
+    assert timeline('Engineer, Acme  Jan 2019 - Dec 2019').total_months == 12
+    assert timeline('Intern, Acme  Jun 2020 - Jun 2020').total_months == 1
+
+
+def test_adjacent_roles_merge_into_one_period():
+    result = timeline(
+        'Engineer, Acme  Jan 2019 - Dec 2019\n'
+        'Senior Engineer, Acme  Jan 2020 - Dec 2021\n'
+    )
+    assert result.merged == [(2019 * 12, 2022 * 12)]
+    assert result.total_years == 3.0
+    assert result.to_dict()['periods'] == [{'start': '2019-01', 'end': '2021-12'}]
+
+
+def test_overlapping_roles_are_counted_once():
+    result = timeline(
+        'Consultant, Beta  Mar 2018 - Aug 2020\n'
+        'Engineer, Acme  Jan 2019 - Dec 2019\n'
+        'Lead, Gamma  06/2020 to 05/2021\n'
+    )
+    assert result.total_months == 39
+    assert len(result.merged) == 1
+
+
+def test_gap_between_roles_is_not_counted():
+    result = timeline('Engineer, Acme  Jan 2015 - Dec 2015\nEngineer, Beta  Jan 2017 - Dec 2017\n')
+    assert result.total_months == 24
+    assert len(result.merged) == 2
+
+
+def test_present_runs_to_the_current_month():
+    (interval,) = find_intervals('Engineer, Acme  Jan 2026 - Present', now=NOW)
+    assert interval.is_current and interval.months == 9
+    assert interval.to_dict() == {'start': '2026-01', 'end': 'present', 'months': 9, 'role': 'Engineer, Acme'}
+
+
+def test_year_only_ranges_count_whole_years_between():
+    assert timeline('Analyst, Delta  2016 – 2018').total_months == 24
+
+
+def test_role_context_comes_from_the_line():
+    (interval,) = find_intervals('Data Engineer | Infosys | Jul 2021 - Dec 2022', now=NOW)
+    assert interval.context == 'Data Engineer | Infosys'
+    assert interval.months == 18
+
+
+def test_future_and_reversed_ranges_are_ignored():
+    assert find_intervals('Engineer  Jan 2027 - Dec 2028\nEngineer  Dec 2020 - Jan 2019', now=NOW) == []
+
+
+def test_stated_years():
+    assert stated_years('Over 7 years of experience in backend systems, 3 years in Go') == 7.0
+    assert stated_years('Aged 30 years') is None
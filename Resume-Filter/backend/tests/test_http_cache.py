@@ -0,0 +1,116 @@
+import gzip
+import json
+import os
+
+import pytest
+
+import http_cache
+
+
+@pytest.fixture
+def export(app_module):
+    """A results-folder JSON export large enough to be compressed"""
+    records = [{'name': f'Candidate {i}', 'skills': ['Python', 'SQL']} for i in range(200)]
+    body = json.dumps(records).encode('utf-8')
+    path = os.path.abspath(os.path.join(app_module.app.config['RESULTS_FOLDER'], 'export_test.json'))
+    with open(path, 'wb') as f:
+        f.write(body)
+    yield path, body
+    for leftover in (path, path + http_cache.GZIP_SUFFIX):
+        if os.path.exists(leftover):
+            os.remove(leftover)
+
+
+def test_download_etag_and_304(client, export):
+    _, body = export
+    response = client.get('/download/export_test.json')
+    assert response.status_code == 200
+    assert response.data == body
+    assert 'no-cache' in response.headers['Cache-Control']
+    assert 'Content-Encoding' not in response.headers
+    etag = response.headers['ETag']
+
+    cached = client.get('/download/export_test.json', headers={'If-None-Match': etag})
+    assert cached.status_code == 304
+    assert cached.data == b''
+
+
+def test_download_range(client, export):
+    _, body = export
+    etag = client.get('/download/export_test.json').headers['ETag']
+
+    partial = client.get('/download/export_test.json', headers={'Range': 'bytes=10-19'})
+    assert partial.status_code == 206
+    assert partial.data == body[10:20]
+    assert partial.headers['Content-Range'] == f'bytes 10-19/{len(body)}'
+
+    # A stale If-Range gets the whole file back
+    resumed = client.get('/download/export_test.json', headers={'Range': 'bytes=10-19', 'If-Range': etag})
+    assert resumed.status_code == 206
+    stale = client.get('/download/export_test.json', headers={'Range': 'bytes=10-19', 'If-Range': '"old"'})
+    assert stale.status_code == 200 and stale.data == body
+
+
+def test_download_serves_a_gzip_copy(client, export):
+    path, body = export
+    plain_etag = client.get('/download/export_test.json').headers['ETag']
+
+    response = client.get('/download/export_test.json', headers={'Accept-Encoding': 'gzip'})
+    assert response.status_code == 200
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert gzip.decompress(response.data) == body
+    assert os.path.exists(path + http_cache.GZIP_SUFFIX)
+    gzip_etag = response.headers['ETag']
+    assert gzip_etag != plain_etag
+
+    cached = client.get('/download/export_test.json',
+                        headers={'Accept-Encoding': 'gzip', 'If-None-Match': gzip_etag})
+    assert cached.status_code == 304
+
+    # A rewritten export gets a new ETag and a fresh gzip copy
+    with open(path, 'ab') as f:
+        f.write(b' ')
+    # Newer than the existing .gz even on coarse-mtime filesystems
+    os.utime(path, (os.path.getatime(path) + 10, os.path.getmtime(path) + 10))
+    changed = client.get('/download/export_test.json',
+                         headers={'Accept-Encoding': 'gzip', 'If-None-Match': gzip_etag})
+    assert changed.status_code == 200
+    assert gzip.decompress(changed.data) == body + b' '
+
+
+def test_small_and_missing_downloads(client, app_module):
+    path = os.path.abspath(os.path.join(app_module.app.config['RESULTS_FOLDER'], 'small_test.json'))
+    with open(path, 'wb') as f:
+        f.write(b'[]')
+    try:
+        response = client.get('/download/small_test.json', headers={'Accept-Encoding': 'gzip'})
+        assert response.data == b'[]'
+        assert 'Content-Encoding' not in response.headers
+    finally:
+        os.remove(path)
+    assert client.get('/download/nothing_here.json').status_code == 404
+
+
+def test_json_responses_are_conditional_and_compressed(client, app_module, monkeypatch):
+    monkeypatch.setitem(app_module.app.config, 'COMPRESS_MIN_BYTES', 0)
+    response = client.get('/results', headers={'Accept-Encoding': 'gzip'})
+    assert response.status_code == 200
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert json.loads(gzip.decompress(response.data))['success'] is True
+    etag = response.headers['ETag']
+
+    cached = client.get('/results', headers={'Accept-Encoding': 'gzip', 'If-None-Match': etag})
+    assert cached.status_code == 304
+
+    plain = client.get('/results')
+    assert 'Content-Encoding' not in plain.headers
+    assert plain.headers['ETag'] != etag
+    partial = client.get('/results', headers={'Range': 'bytes=0-0'})
+    assert partial.status_code == 206 and partial.data == b'{'
+
+
+def test_compression_is_deterministic():
+    body = b'{"name": "Arun"}' * 100
+    assert http_cache.compress(body, 'gzip') == http_cache.compress(body, 'gzip')
+    assert gzip.decompress(http_cache.compress(body, 'gzip')) == body
@@ -0,0 +1,40 @@
+import pytest
+
+from location_resolver import get_location_resolver
+
+
+@pytest.fixture(scope='module')
+def resolver():
+    return get_location_resolver()
+
+
+@pytest.mark.parametrize('text, expected', [
+    # Places in the name line neither win nor qualify the cities below them
+    ('Sam Delhi\nsam@x.com\nMumbai', 'Mumbai, Maharashtra'),
+    ('Washington Sundar\nwsundar@example.com\nCoimbatore', 'Coimbatore, Tamil Nadu'),
+    ('Victoria Adams\nMumbai, India', 'Mumbai, Maharashtra'),
+    ('Sam Delhi\nsam@x.com\nMumbai, Maharashtra', 'Mumbai, Maharashtra'),
+])
+def test_name_line_does_not_decide_the_location(resolver, text, expected):
+    assert resolver.resolve(text) == expected
+
+
+def test_labelled_line_wins(resolver):
+    text = 'Sam Delhi\nSoftware Engineer, Infosys, Bangalore\nAddress: Chennai'
+    assert resolver.resolve(text) == 'Chennai, Tamil Nadu'
+
+
+def test_label_on_its_own_line_reaches_the_next_lines(resolver):
+    text = 'Priya Raman\nAddress:\n12 Lake Road\nKochi\nB.Tech, Anna University, Chennai'
+    assert resolver.resolve(text) == 'Kochi, Kerala'
+
+
+def test_qualified_city_beats_an_earlier_bare_one(resolver):
+    text = 'Priya Raman\nB.Tech, Anna University, Chennai\nPune, MH'
+    assert resolver.resolve(text) == 'Pune, Maharashtra'
+
+
+def test_name_line_counts_when_it_is_the_whole_document(resolver):
+    assert resolver.resolve('Victoria') is not None
+    assert resolver.resolve('Sam Delhi\nsam@x.com') is None
+    assert resolver.resolve('no places here') is None
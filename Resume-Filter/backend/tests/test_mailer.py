@@ -0,0 +1,101 @@
+import pytest
+
+import mailer
+from mailer import (Mailer, SmtpSettings, BroadcastJob, TemplateError, compile_template, build_recipients,
+                    STATUS_SENT, STATUS_FAILED, STATUS_SKIPPED)
+from smtp_sink import SmtpSink
+
+
+@pytest.fixture
+def sink():
+    with SmtpSink(port=0, reject=['gone@example.com'], defer=['busy@example.com']) as sink:
+        yield sink
+
+
+@pytest.fixture
+def smtp_mailer(sink, tmp_path, monkeypatch):
+    monkeypatch.setattr(mailer, 'RETRY_BACKOFF_SECONDS', 0)
+    settings = SmtpSettings(host='127.0.0.1', port=sink.port, sender='hr@example.com', timeout=5,
+                            concurrency=2, rate_per_second=0, messages_per_connection=2)
+    smtp_mailer = Mailer(settings, str(tmp_path / 'jobs'))
+    yield smtp_mailer
+    smtp_mailer.close()
+
+
+def statuses(job):
+    return {entry['email']: entry['status'] for entry in job.recipients}
+
+
+def test_templates_fill_placeholders_and_reject_unknown_ones():
+    template = compile_template('Hello {{ first_name }}', 'Hi [Name], we liked your {{skills}}. [Note]')
+    subject, body = template.render({'name': 'Divya Nair', 'skills': ['Python', 'Go']})
+    assert subject == 'Hello Divya'
+    assert body == 'Hi Divya Nair, we liked your Python, Go. [Note]'
+    with pytest.raises(TemplateError):
+        compile_template('Hi {{ salary }}', '')
+
+
+def test_broadcast_is_delivered_to_the_sink(sink, smtp_mailer):
+    candidates = [{'email': f'c{i}@example.com', 'name': f'Candidate {i}', 'skills': ['Python']} for i in range(5)]
+    job = smtp_mailer.submit(BroadcastJob(compile_template('Role for {{name}}', 'Hi [Name]'), candidates))
+
+    assert job.status == 'completed'
+    assert job.counts()[STATUS_SENT] == 5
+    assert sorted(message['to'][0] for message in sink.messages) == sorted(c['email'] for c in candidates)
+    message = next(m['message'] for m in sink.messages if m['to'] == ['c3@example.com'])
+    assert message['Subject'] == 'Role for Candidate 3'
+    assert message['From'] == 'hr@example.com'
+    assert message.get_payload().strip() == 'Hi Candidate 3'
+    # Connections are pooled and reused rather than opened per message
+    assert sink.connections < 5
+    assert smtp_mailer.get_job(job.id)['counts'][STATUS_SENT] == 5
+
+
+def test_refused_invalid_and_duplicate_recipients(sink, smtp_mailer):
+    candidates = [
+        {'email': 'ok@example.com'},
+        {'email': 'gone@example.com'},
+        {'email': 'busy@example.com'},
+        {'email': 'not-an-address'},
+        {'email': 'OK@example.com'},
+    ]
+    job = smtp_mailer.submit(BroadcastJob(compile_template('Hi', 'Body'), candidates))
+    assert statuses(job) == {
+        'ok@example.com': STATUS_SENT,
+        'gone@example.com': STATUS_FAILED,
+        'busy@example.com': STATUS_FAILED,
+        'not-an-address': STATUS_SKIPPED,
+        'OK@example.com': STATUS_SKIPPED,
+    }
+    entries = {entry['email']: entry for entry in job.recipients}
+    # 5xx is final, 4xx is retried
+    assert entries['gone@example.com']['attempts'] == 1 and entries['gone@example.com']['error'].startswith('550')
+    assert entries['busy@example.com']['attempts'] == mailer.MAX_ATTEMPTS
+    assert [message['to'] for message in sink.messages] == [['ok@example.com']]
+
+
+def test_one_unbuildable_message_does_not_abort_the_job(sink, smtp_mailer):
+    candidates = [{'email': 'bad@example.com', 'skills': [1, 2]}, {'email': 'good@example.com', 'skills': ['Go']}]
+    job = smtp_mailer.submit(BroadcastJob(compile_template('Hi', 'You know {{skills}}'), candidates))
+    assert job.status == 'completed'
+    assert statuses(job) == {'bad@example.com': STATUS_FAILED, 'good@example.com': STATUS_SENT}
+    assert job.recipients[0]['error'].startswith('Could not build message')
+
+
+def test_multiline_fields_stay_out_of_headers(sink, smtp_mailer):
+    candidate = {'email': 'k@example.com', 'name': 'Karthikeyan A\nChennai'}
+    job = smtp_mailer.submit(BroadcastJob(compile_template('Offer for {{name}}', 'Dear {{name}}'), [candidate]))
+    assert statuses(job) == {'k@example.com': STATUS_SENT}
+    message = sink.messages[0]['message']
+    assert message['Subject'] == 'Offer for Karthikeyan A Chennai'
+    assert message['To'] == 'Karthikeyan A Chennai <k@example.com>'
+
+
+def test_build_recipients_resolves_results_log_keys():
+    records = {'h1': {'email': 'stored@example.com', 'name': 'Stored'}}
+    assert build_recipients(['a@example.com', {'key': 'h1', 'name': 'Override'}, {'email': 'b@example.com'}],
+                            records.get) == [
+        {'email': 'a@example.com'},
+        {'email': 'stored@example.com', 'name': 'Override'},
+        {'email': 'b@example.com'},
+    ]
@@ -0,0 +1,80 @@
+import os
+import threading
+import time
+
+import pytest
+
+import metrics
+from parse_worker import ParseLimits, ParseTimeout, ParseOversize, run_with_limits
+from resume_parser import ResumeParser
+
+pytestmark = pytest.mark.skipif(not hasattr(os, 'fork'), reason='parse workers need fork')
+
+RESUME = b"""Priya Raman
+priya@example.com
+Certified in AWS Solutions Architecture
+Languages: Tamil, English
+Experience
+Engineer, Acme  Jan 2019 - Dec 2021
+"""
+
+
+def child_pid():
+    return os.getpid()
+
+
+def sleep_forever():
+    threading.Event().wait()
+
+
+def allocate(megabytes):
+    return len(bytearray(megabytes * 1024 * 1024))
+
+
+def test_result_comes_back_from_a_child():
+    assert run_with_limits(child_pid, (), 'x.txt', ParseLimits(timeout_seconds=10), 1) != os.getpid()
+
+
+def test_limits_stop_the_worker():
+    with pytest.raises(ParseTimeout):
+        run_with_limits(sleep_forever, (), 'slow.pdf', ParseLimits(timeout_seconds=0.5), 1)
+    with pytest.raises(ParseOversize):
+        run_with_limits(allocate, (512,), 'big.pdf', ParseLimits(timeout_seconds=10, memory_limit_mb=64), 1)
+    with pytest.raises(ParseOversize):
+        run_with_limits(child_pid, (), 'huge.pdf', ParseLimits(max_file_mb=1), 2 * 1024 * 1024)
+
+
+def test_metric_lock_held_by_another_thread_at_fork():
+    # A request thread is counting a parse when this one forks a worker; it lets go
+    # a little later, but the child's copy of the lock would stay held forever
+    held = threading.Event()
+
+    def hold_lock():
+        with metrics.FILES_PARSED._lock:
+            held.set()
+            time.sleep(1)
+
+    thread = threading.Thread(target=hold_lock)
+    thread.start()
+    held.wait()
+    try:
+        assert run_with_limits(child_pid, (), 'x.txt', ParseLimits(timeout_seconds=5), 1) != os.getpid()
+    finally:
+        thread.join()
+
+
+class PidRecordingParser(ResumeParser):
+    def extract_additional_info(self, text):
+        info = super().extract_additional_info(text)
+        info['extracted_in'] = os.getpid()
+        return info
+
+
+def test_additional_info_is_extracted_inside_the_limited_worker():
+    parser = PidRecordingParser(limits=ParseLimits(timeout_seconds=30))
+    parsed = parser.parse_resume_enhanced(RESUME, name='priya.txt')
+    assert parsed['extracted_in'] != os.getpid()
+    assert 'Tamil' in parsed['languages']
+    assert any('Aws' in certification for certification in parsed['certifications'])
+
+    assert 'languages' not in parser.parse_resume(RESUME, name='priya.txt')
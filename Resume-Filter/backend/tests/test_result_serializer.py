@@ -0,0 +1,50 @@
+import gzip
+
+import pytest
+
+import result_serializer
+
+RECORDS = [
+    {'file_name': f'résumé_{i}.pdf', 'skills': ['Python', 'C++'], 'total_experience': 31415900000.0 + i,
+     'score': 123456789, 'name': 'Śrīnivās ' * 20}
+    for i in range(50)
+]
+
+
+@pytest.mark.parametrize('filename', ['out.ndjson', 'out.ndjson.gz', 'out.json', 'out.json.gz'])
+def test_write_and_stream_back(tmp_path, filename):
+    path = str(tmp_path / filename)
+    assert result_serializer.write_records(RECORDS, path) == len(RECORDS)
+    assert list(result_serializer.iter_records(path)) == RECORDS
+    if filename.endswith('.gz'):
+        with gzip.open(path, 'rb') as f:
+            assert f.read(1) in (b'[', b'{')
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 64])
+def test_json_array_survives_chunk_boundaries(tmp_path, monkeypatch, chunk_size):
+    # Small chunks split numbers ("3141|5900000.0") and multi-byte characters mid-element
+    monkeypatch.setattr(result_serializer, 'READ_CHUNK_SIZE', chunk_size)
+    path = str(tmp_path / 'out.json')
+    result_serializer.write_json(RECORDS[:5] + [1.5, 12, 'x'], path)
+    assert list(result_serializer.iter_json_array(path)) == RECORDS[:5] + [1.5, 12, 'x']
+
+
+def test_truncated_array_raises(tmp_path):
+    path = tmp_path / 'out.json'
+    path.write_bytes(result_serializer.dumps(RECORDS)[:-40])
+    with pytest.raises(ValueError):
+        list(result_serializer.iter_json_array(str(path)))
+
+
+def test_save_to_json_adds_gzip_suffix(tmp_path):
+    from resume_parser import ResumeParser
+
+    parser = ResumeParser()
+    path = str(tmp_path / 'parsed.ndjson')
+    assert parser.save_to_json(RECORDS, path, compress=True)
+    assert list(result_serializer.iter_records(path + result_serializer.GZIP_SUFFIX)) == RECORDS
+
+    path = str(tmp_path / 'parsed.json')
+    assert parser.save_to_json(RECORDS[:2], path)
+    assert list(result_serializer.iter_records(path)) == RECORDS[:2]
@@ -0,0 +1,94 @@
+import os
+import time
+
+from results_log import ResultsLog
+
+
+def segment_files(directory):
+    return sorted(name for name in os.listdir(directory) if name.startswith('segment_'))
+
+
+def test_latest_entry_wins_and_survives_reopen(tmp_path):
+    log = ResultsLog(str(tmp_path))
+    log.append('a', {'name': 'Old'})
+    log.append('b', {'name': 'Bee'})
+    log.append('a', {'name': 'New'})
+    assert log.get('a') == {'name': 'New'}
+    assert len(log) == 2 and log.dead_count() == 1
+    log.close()
+
+    reopened = ResultsLog(str(tmp_path))
+    assert reopened.get('a') == {'name': 'New'}
+    assert sorted(record['name'] for record in reopened.iter_records()) == ['Bee', 'New']
+
+
+def test_torn_entry_is_truncated_and_appends_continue(tmp_path):
+    log = ResultsLog(str(tmp_path))
+    log.append('a', {'name': 'Ann'})
+    log.close()
+    segment = tmp_path / segment_files(tmp_path)[0]
+    intact = segment.stat().st_size
+    with open(segment, 'ab') as f:
+        f.write(b'{"key":"b","ts":1,"rec')
+
+    recovered = ResultsLog(str(tmp_path))
+    assert segment.stat().st_size == intact
+    assert 'b' not in recovered
+    recovered.append('c', {'name': 'Cy'})
+    assert recovered.get('c') == {'name': 'Cy'}
+    assert recovered.get('a') == {'name': 'Ann'}
+
+
+def test_compaction_drops_superseded_entries(tmp_path):
+    log = ResultsLog(str(tmp_path), max_segment_bytes=200)
+    for round_number in range(5):
+        for key in 'abc':
+            log.append(key, {'round': round_number})
+    assert len(segment_files(tmp_path)) > 2
+    assert log.needs_compaction()
+
+    summary = log.compact()
+    assert summary['bytes_after'] < summary['bytes_before']
+    assert len(segment_files(tmp_path)) == 1
+    assert log.dead_count() == 0 and not log.needs_compaction()
+    assert {key: log.get(key) for key in 'abc'} == {key: {'round': 4} for key in 'abc'}
+
+    # Another process sees the compacted generation
+    assert ResultsLog(str(tmp_path)).get('b') == {'round': 4}
+
+
+def test_reparsed_records_trigger_compaction_within_two_segments(tmp_path):
+    log = ResultsLog(str(tmp_path))
+    for key in 'abcd':
+        log.append(key, {'round': 0})
+    assert not log.needs_compaction()
+    for key in 'abc':
+        log.append(key, {'round': 1})
+    assert len(segment_files(tmp_path)) == 1
+    assert log.needs_compaction()
+    log.compact()
+    assert not log.needs_compaction()
+
+
+def test_leftover_segments_after_crashed_compaction_lose_to_merged_one(tmp_path):
+    log = ResultsLog(str(tmp_path), max_segment_bytes=200)
+    for round_number in range(4):
+        log.append('a', {'round': round_number})
+    old_segments = [tmp_path / name for name in segment_files(tmp_path)]
+    saved = {path: path.read_bytes() for path in old_segments}
+    log.compact()
+    # Simulate a crash after the merged segment went live but before the old ones were removed
+    for path, data in saved.items():
+        path.write_bytes(data)
+    assert ResultsLog(str(tmp_path)).get('a') == {'round': 3}
+
+
+def test_retention_expires_records(tmp_path):
+    log = ResultsLog(str(tmp_path), retention_days=1)
+    log.append('old', {'name': 'Old'})
+    log.append('new', {'name': 'New'})
+    segment_id, offset, length, _ = log._index['old']
+    log._index['old'] = (segment_id, offset, length, time.time() - 2 * 86400)
+    assert log.expired_count() == 1 and log.needs_compaction()
+    log.compact()
+    assert 'old' not in log and log.get('new') == {'name': 'New'}
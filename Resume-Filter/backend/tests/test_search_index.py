@@ -0,0 +1,89 @@
+import io
+
+import pytest
+
+from search_index import SearchIndex, QuerySyntaxError, parse_query
+
+RECORDS = [
+    {'file_hash': 'a', 'skills': ['Python', 'Machine Learning'], 'location': 'Chennai, Tamil Nadu',
+     'total_experience': 4.0, 'languages': ['Tamil', 'English'], 'certifications': ['Aws Certified Developer'],
+     'text': 'Built machine learning pipelines in Python for retail forecasting'},
+    {'file_hash': 'b', 'skills': ['Go', 'Docker'], 'location': 'Pune, Maharashtra',
+     'total_experience': 2.5, 'languages': ['Marathi'],
+     'text': 'Go services, learning machine setups and Docker images'},
+    {'file_hash': 'c', 'skills': ['Java'], 'location': 'Chennai, Tamil Nadu', 'total_experience': 7.0,
+     'text': 'Java developer'},
+]
+
+
+@pytest.fixture
+def index():
+    return SearchIndex.from_records(RECORDS)
+
+
+def test_grammar_precedence():
+    assert parse_query('a OR b c') == ('or', [('phrase', None, ['a']), ('and', [('phrase', None, ['b']),
+                                                                                ('phrase', None, ['c'])])])
+    assert parse_query('-a b') == ('and', [('not', ('phrase', None, ['a'])), ('phrase', None, ['b'])])
+    assert parse_query('exp>=3 skills:"machine learning"') == (
+        'and', [('range', 'total_experience', '>=', 3.0), ('phrase', 'skills', ['machine', 'learning'])])
+    assert parse_query('(a || b) && NOT c')[0] == 'and'
+
+
+@pytest.mark.parametrize('query', ['', '(python', 'python)', 'colour:red', 'exp>=many', 'skills>3', 'AND', '"!!"'])
+def test_malformed_queries_raise(query):
+    with pytest.raises(QuerySyntaxError):
+        parse_query(query)
+
+
+@pytest.mark.parametrize('query, keys', [
+    ('(python OR go) AND "machine learning" AND experience>=3 AND location:chennai', ['a']),
+    ('"machine learning"', ['a']),
+    ('machine learning', ['b', 'a']),
+    ('location:chennai -java', ['a']),
+    ('exp<3 OR exp>5', ['c', 'b']),
+    ('exp:4', ['a']),
+    ('exp!=4', ['c', 'b']),
+    ('certifications:aws', ['a']),
+    ('languages:tamil', ['a']),
+    ('lang:marathi OR cert:developer', ['b', 'a']),
+    ('NOT location:chennai', ['b']),
+])
+def test_search(index, query, keys):
+    assert index.search(query) == keys
+
+
+def test_readding_a_key_replaces_it_and_ranges_follow_later_adds(index):
+    assert index.search('exp>=5') == ['c']
+    index.add('b', dict(RECORDS[1], total_experience=9.0))
+    index.add('d', {'total_experience': 6.0})
+    assert index.search('exp>=5') == ['d', 'b', 'c']
+    assert index.search('exp<3') == []
+    assert len(index) == 4 and index.stats()['tombstones'] == 1
+
+
+RESUME = b"""Meena Iyer
+meena.iyer@example.com
+Coimbatore, Tamil Nadu
+
+Skills
+Python, SQL
+
+Certifications
+AWS Certified Solutions Architect
+
+Languages: Tamil, English
+"""
+
+
+def test_uploaded_certifications_and_languages_are_searchable(client):
+    response = client.post('/upload', data={'parse': '1', 'files': (io.BytesIO(RESUME), 'meena.txt')},
+                           content_type='multipart/form-data').get_json()
+    assert response['success'], response
+    assert 'additional_info' in response['fields']
+
+    for query in ('certifications:aws', 'languages:tamil', 'cert:"solutions architect" AND skills:python'):
+        found = client.get('/search', query_string={'q': query}).get_json()
+        assert found['total'] == 1, query
+        assert found['data'][0]['email'] == 'meena.iyer@example.com'
+        assert 'text' not in found['data'][0]
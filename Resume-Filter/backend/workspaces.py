@@ -0,0 +1,199 @@
+import json
+import os
+import re
+import shutil
+import threading
+import time
+import uuid
+import logging
+from contextlib import contextmanager
+from datetime import datetime
+from typing import List, Dict, Optional, Any, Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows: a batch is then only guarded within one process
+    fcntl = None
+
+import result_serializer
+
+logger = logging.getLogger(__name__)
+
+BATCH_ID_PATTERN = re.compile(r'^[0-9a-f]{16}$')
+METADATA_FILENAME = 'batch.json'
+LOCK_FILENAME = '.lock'
+RESULTS_FILENAME = 'parsed.json'
+UPLOADS_DIRNAME = 'uploads'
+RESULTS_DIRNAME = 'results'
+
+
+class BatchNotFound(LookupError):
+    """No workspace exists for a batch id"""
+
+
+class BatchBusy(RuntimeError):
+    """Another request is already processing the batch"""
+
+
+class Batch:
+    """One upload session's workspace: its uploaded files, parsed results and exports"""
+
+    def __init__(self, batch_id: str, path: str):
+        self.id = batch_id
+        self.path = path
+        self.uploads_dir = os.path.join(path, UPLOADS_DIRNAME)
+        self.results_dir = os.path.join(path, RESULTS_DIRNAME)
+        # Threads of one process share this; flock on the lock file covers other workers
+        self._thread_lock = threading.Lock()
+
+    def touch(self):
+        """Mark the batch as in use so it is not expired"""
+        os.utime(self.path)
+
+    def files(self) -> List[str]:
+        return sorted(os.listdir(self.uploads_dir)) if os.path.isdir(self.uploads_dir) else []
+
+    @contextmanager
+    def processing(self) -> Iterator['Batch']:
+        """Exclusive use of the batch; BatchBusy if another request holds it"""
+        if not self._thread_lock.acquire(blocking=False):
+            raise BatchBusy(f"Batch {self.id} is already being processed")
+        try:
+            with open(os.path.join(self.path, LOCK_FILENAME), 'a+') as lock_file:
+                if fcntl:
+                    try:
+                        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    except BlockingIOError:
+                        raise BatchBusy(f"Batch {self.id} is already being processed")
+                try:
+                    yield self
+                finally:
+                    if fcntl:
+                        fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+        finally:
+            self._thread_lock.release()
+
+    def save_results(self, records: List[Dict[str, Any]]):
+        """Keep the latest /process output so exports need not resend it"""
+        path = os.path.join(self.path, RESULTS_FILENAME)
+        temp_path = f'{path}.{os.getpid()}.tmp'
+        result_serializer.write_records(records, temp_path)
+        os.replace(temp_path, path)
+
+    def load_results(self) -> Optional[List[Dict[str, Any]]]:
+        try:
+            return result_serializer.read_json(os.path.join(self.path, RESULTS_FILENAME))
+        except FileNotFoundError:
+            return None
+
+    def metadata(self) -> Dict[str, Any]:
+        try:
+            with open(os.path.join(self.path, METADATA_FILENAME), encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'batch_id': self.id,
+            'created_at': self.metadata().get('created_at'),
+            'last_used': datetime.fromtimestamp(os.path.getmtime(self.path)).isoformat(),
+            'files': self.files(),
+            'processed': os.path.exists(os.path.join(self.path, RESULTS_FILENAME))
+        }
+
+
+class BatchWorkspaces:
+    """Per-batch directories under one root, so concurrent upload sessions never
+    see, re-parse or delete each other's files.
+
+    Batches unused for longer than ttl_hours are removed when a new one is created.
+    """
+
+    def __init__(self, root: str, ttl_hours: Optional[float] = 24):
+        self.root = root
+        self.ttl_hours = ttl_hours
+        self._batches: Dict[str, Batch] = {}
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    def _batch(self, batch_id: str) -> Batch:
+        with self._lock:
+            batch = self._batches.get(batch_id)
+            if batch is None:
+                batch = self._batches[batch_id] = Batch(batch_id, os.path.join(self.root, batch_id))
+            return batch
+
+    def create(self) -> Batch:
+        self.expire()
+        batch_id = uuid.uuid4().hex[:16]
+        batch = self._batch(batch_id)
+        os.makedirs(batch.uploads_dir)
+        os.makedirs(batch.results_dir)
+        with open(os.path.join(batch.path, METADATA_FILENAME), 'w', encoding='utf-8') as f:
+            json.dump({'batch_id': batch_id, 'created_at': datetime.now().isoformat()}, f)
+        logger.info(f"Created batch {batch_id}")
+        return batch
+
+    def get(self, batch_id: str) -> Batch:
+        """The batch's workspace, marked as in use; BatchNotFound if it does not exist"""
+        if not batch_id or not BATCH_ID_PATTERN.match(str(batch_id)):
+            raise BatchNotFound(f"Unknown batch: {batch_id}")
+        batch = self._batch(batch_id)
+        if not os.path.isdir(batch.uploads_dir):
+            raise BatchNotFound(f"Unknown batch: {batch_id}")
+        batch.touch()
+        return batch
+
+    def list(self) -> List[Dict[str, Any]]:
+        batches = []
+        for batch_id in sorted(os.listdir(self.root)):
+            if BATCH_ID_PATTERN.match(batch_id):
+                try:
+                    batches.append(self._batch(batch_id).to_dict())
+                except FileNotFoundError:
+                    # Removed while listing
+                    continue
+        return batches
+
+    def remove(self, batch_id: str) -> bool:
+        try:
+            batch = self.get(batch_id)
+        except BatchNotFound:
+            return False
+        with batch.processing():
+            shutil.rmtree(batch.path, ignore_errors=True)
+        with self._lock:
+            self._batches.pop(batch_id, None)
+        logger.info(f"Removed batch {batch_id}")
+        return True
+
+    def clear(self) -> int:
+        """Remove every batch that is not being processed"""
+        removed = 0
+        for batch_id in os.listdir(self.root):
+            if BATCH_ID_PATTERN.match(batch_id):
+                try:
+                    removed += self.remove(batch_id)
+                except BatchBusy:
+                    continue
+        return removed
+
+    def expire(self) -> int:
+        """Remove batches idle for longer than ttl_hours"""
+        if not self.ttl_hours:
+            return 0
+        cutoff = time.time() - self.ttl_hours * 3600
+        expired = 0
+        for batch_id in os.listdir(self.root):
+            path = os.path.join(self.root, batch_id)
+            try:
+                idle = BATCH_ID_PATTERN.match(batch_id) and os.path.getmtime(path) < cutoff
+            except OSError:
+                continue
+            if idle:
+                try:
+                    expired += self.remove(batch_id)
+                except BatchBusy:
+                    continue
+        return expired
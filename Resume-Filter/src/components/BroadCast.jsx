@@ -11,12 +11,14 @@ const BroadCast = () => {
   const [message, setMessage] = useState("");
   const [selectAll, setSelectAll] = useState(false);
   const [recipients, setRecipients] = useState([]);
+  const [sending, setSending] = useState(false);
 
   useEffect(() => {
     const formattedRecipients = passedRecipients.length > 0
       ? passedRecipients.map(r => ({
           name: r.name || "No Name",
           email: r.email || "No Email",
+          candidate: r,
           selected: false
         }))
       : [
@@ -39,7 +41,7 @@ const BroadCast = () => {
     setSelectAll(updated.every(r => r.selected));
   };
 
-  const handleSend = () => {
+  const handleSend = async () => {
     const selectedRecipients = recipients.filter(r => r.selected);
     if (!message.trim()) {
       alert("Please write a message.");
@@ -50,8 +52,39 @@ const BroadCast = () => {
       return;
     }
 
-    alert(`Message sent to: ${selectedRecipients.map(r => r.name).join(", ")}`);
-    clearForm();
+    // The backend fills [Name] and {{field}} placeholders from each candidate's parsed resume
+    setSending(true);
+    try {
+      const response = await fetch("http://127.0.0.1:5000/broadcast", {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify({
+          body: message,
+          recipients: selectedRecipients.map(r => ({ ...r.candidate, name: r.name, email: r.email })),
+          background: true,
+        }),
+      });
+      let result = await response.json();
+      if (!result.success) {
+        alert(result.message);
+        return;
+      }
+      // Large broadcasts run as a background job; poll until it finishes
+      while (result.success && result.job.status === "running") {
+        await new Promise(resolve => setTimeout(resolve, 1000));
+        result = await (await fetch(`http://127.0.0.1:5000/broadcast/${result.job.job_id}`)).json();
+      }
+      const counts = result.job.counts;
+      const failed = result.job.recipients.filter(r => r.status !== "sent");
+      alert(`Message sent to ${counts.sent} of ${result.job.total} recipients.` +
+        (failed.length ? `\nNot sent: ${failed.map(r => `${r.email} (${r.error})`).join(", ")}` : ""));
+      clearForm();
+    } catch (error) {
+      console.error("Broadcast failed:", error);
+      alert("Could not reach the mail server.");
+    } finally {
+      setSending(false);
+    }
   };
 
   const handleCancel = () => {
@@ -108,7 +141,9 @@ const BroadCast = () => {
 
             <div className="d-flex justify-content-end gap-2">
               <Button variant="outline-secondary" onClick={handleCancel}>Cancel</Button>
-              <Button variant="primary" onClick={handleSend}>Send Message</Button>
+              <Button variant="primary" onClick={handleSend} disabled={sending}>
+                {sending ? "Sending..." : "Send Message"}
+              </Button>
             </div>
           </Form>
         </div>
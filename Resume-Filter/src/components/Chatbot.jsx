@@ -11,18 +11,31 @@ const Chatbot = () => {
     { sender: "bot", text: "Hi! How may I assist you today?" }
   ]);
 
-  const handleSend = () => {
+  const handleSend = async () => {
     if (input.trim() === "") return;
 
-    
-    const newMessages = [...messages, { sender: "user", text: input }];
-
-   
-    const botReply = getBotReply(input);
-    newMessages.push({ sender: "bot", text: botReply });
-
+    const question = input;
+    const newMessages = [...messages, { sender: "user", text: question }];
     setMessages(newMessages);
     setInput("");
+
+    // Aggregate questions about the candidate pool are answered by the backend
+    let botReply = getBotReply(question);
+    try {
+      const response = await fetch("http://127.0.0.1:5000/chat", {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify({ message: question }),
+      });
+      const result = await response.json();
+      if (result.success && result.understood) {
+        botReply = result.answer;
+      }
+    } catch (error) {
+      console.error("Chat request failed:", error);
+    }
+
+    setMessages([...newMessages, { sender: "bot", text: botReply }]);
   };
 
   const getBotReply = (message) => {
@@ -51,14 +51,25 @@ const Homepage = () => {
       return;
     }
 
+    // Uploads go into a batch of their own; processing is scoped to that batch
     const formData = new FormData();
-    formData.append("resume", files[0]);
+    files.forEach((file) => formData.append("files", file));
 
     try {
-      const response = await fetch("http://127.0.0.1:5000/process", {
+      const uploadResponse = await fetch("http://127.0.0.1:5000/upload", {
         method: "POST",
         body: formData,
       });
+      const upload = await uploadResponse.json();
+      if (!upload.success) {
+        throw new Error(upload.message);
+      }
+
+      const response = await fetch("http://127.0.0.1:5000/process", {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify({ batch_id: upload.batch_id }),
+      });
 
       const text = await response.text(); // for debugging
       console.log("Raw response text:", text);
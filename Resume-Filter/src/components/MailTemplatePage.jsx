@@ -15,6 +15,8 @@ function MailTemplatePage() {
   const [recipients, setRecipients] = useState([]);
   const [showAlert, setShowAlert] = useState(false);
   const [error, setError] = useState('');
+  const [sentTo, setSentTo] = useState([]);
+  const [sending, setSending] = useState(false);
 
   const emailRegex = /^[^\s@]+@[^\s@]+\.[^\s@]+$/;
 
@@ -46,14 +48,36 @@ function MailTemplatePage() {
     }
   };
 
-  const handleSend = () => {
+  const handleSend = async () => {
     if (recipients.length === 0) {
       setError('Please add at least one recipient email.');
       return;
     }
     setError('');
-    setShowAlert(true);
-    setTimeout(() => setShowAlert(false), 3000);
+    setSending(true);
+    try {
+      const response = await fetch('http://127.0.0.1:5000/broadcast', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ template: selectedTemplate, body: content, recipients }),
+      });
+      const result = await response.json();
+      if (!result.success) {
+        setError(result.message);
+        return;
+      }
+      const failed = result.job.recipients.filter((r) => r.status !== 'sent');
+      if (failed.length) {
+        setError(`Not sent: ${failed.map((r) => `${r.email} (${r.error})`).join(', ')}`);
+      }
+      setSentTo(result.job.recipients.filter((r) => r.status === 'sent').map((r) => r.email));
+      setShowAlert(true);
+      setTimeout(() => setShowAlert(false), 3000);
+    } catch (err) {
+      setError('Could not reach the mail server.');
+    } finally {
+      setSending(false);
+    }
   };
 
   const handleTemplateChange = (e) => {
@@ -129,13 +153,15 @@ function MailTemplatePage() {
             />
           </Form.Group>
 
-          <Button variant="primary" onClick={handleSend}>Send Mail</Button>
+          <Button variant="primary" onClick={handleSend} disabled={sending}>
+            {sending ? 'Sending...' : 'Send Mail'}
+          </Button>
 
           {error && <Alert variant="danger" className="mt-3">{error}</Alert>}
 
           {showAlert && (
             <Alert variant="success" className="mt-3">
-              ✅ Mail sent to: <strong>{recipients.join(', ')}</strong>
+              ✅ Mail sent to: <strong>{sentTo.join(', ')}</strong>
             </Alert>
           )}
         </Col>